@@ -0,0 +1,77 @@
+"""
+Latency of the multi-output failure-mode forest against today's binary RF.
+
+Compares, on AI4I readings:
+  binary          - models/rf_supervised.pkl as /predict runs it (predict + predict_proba)
+  five forests    - one binary RF per mode (TWF/HDF/PWF/OSF/RNF), trained here for comparison
+  multi-output    - models/rf_failure_modes.pkl, all labels from one predict_proba
+
+Train the models first:
+  python -m src.supervised_train
+  python -m src.supervised_train --modes
+
+Run from the repo root:  python scripts/benchmark_failure_modes.py
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from model_service import FAILURE_LABELS, FEATURE_COLUMNS, failure_mode_probabilities  # noqa: E402
+
+
+def timed(fn, repeats: int) -> np.ndarray:
+    out = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return np.array(out) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--single", type=int, default=200, help="single-reading calls per model")
+    parser.add_argument("--batch", type=int, default=10_000, help="rows per batch call")
+    args = parser.parse_args()
+
+    df = pd.read_csv(os.path.join("data", "ai4i2020.csv"))
+    X = df[FEATURE_COLUMNS].values
+    binary = joblib.load(os.path.join("models", "rf_supervised.pkl"))
+    multi = joblib.load(os.path.join("models", "rf_failure_modes.pkl"))
+    print("Training one forest per mode for comparison...")
+    per_mode = [
+        RandomForestClassifier(n_estimators=binary.n_estimators, random_state=42, n_jobs=binary.n_jobs)
+        .fit(X, df[label].values)
+        for label in FAILURE_LABELS[1:]
+    ]
+
+    candidates = {
+        "binary": lambda rows: (binary.predict(rows), binary.predict_proba(rows)),
+        "five forests": lambda rows: [m.predict_proba(rows) for m in per_mode],
+        "multi-output": lambda rows: failure_mode_probabilities(rows, multi),
+    }
+    rng = np.random.default_rng(0)
+    single_rows = X[rng.integers(0, len(X), args.single)]
+    batch_rows = X[rng.integers(0, len(X), args.batch)]
+
+    print(f"{'model':<14}{'outputs':>8}{'single p50 ms':>15}{'single p95 ms':>15}{f'batch {args.batch} ms':>18}")
+    for name, run in candidates.items():
+        outputs = {"binary": 1, "five forests": 5, "multi-output": len(FAILURE_LABELS)}[name]
+        run(single_rows[:1])  # warm up
+        it = iter(single_rows)
+        single = timed(lambda: run(next(it).reshape(1, -1)), args.single)
+        batch = timed(lambda: run(batch_rows), 3)
+        print(f"{name:<14}{outputs:>8}{np.percentile(single, 50):>15.2f}"
+              f"{np.percentile(single, 95):>15.2f}{batch.mean():>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+In-process inference benchmark suite.
+
+Times every scoring path without a server or network:
+  - model_service functions (predict_single, predict_supervised_single,
+    predict_failure_modes_single, predict_batch)
+  - K-Means operating-mode assignment (sklearn predict, CentroidIndex,
+    ModeLookupGrid)
+  - the full POST /predict handler of src/app.py through FastAPI's
+    TestClient, for both request shapes (?mode= and body model_type),
+    with cache-missing and cache-hitting traffic
+
+Inputs are AI4I readings sampled with a fixed seed. Results go to JSON with
+the git commit, so two runs can be diffed:
+
+  python scripts/benchmark_inference.py --output bench/before.json
+  ... change code ...
+  python scripts/benchmark_inference.py --output bench/after.json --compare bench/before.json
+
+Run from the repo root.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# Keep the benchmark from writing into the real prediction history
+os.environ.setdefault("PREDICTION_LOG_PATH", os.path.join(tempfile.mkdtemp(), "predictions.db"))
+
+import model_service  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+from operating_mode import ModeLookupGrid  # noqa: E402
+
+DATA_PATH = os.path.join("data", "ai4i2020.csv")
+
+
+def summarize(samples_ns: list[int], rows_per_call: int = 1) -> dict:
+    ms = np.array(samples_ns) / 1e6
+    total_s = ms.sum() / 1000
+    return {
+        "calls": len(ms),
+        "rows_per_call": rows_per_call,
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "rows_per_s": round(len(ms) * rows_per_call / total_s, 1) if total_s else None,
+    }
+
+
+def measure(fn, inputs: list, warmup: int = 5, rows_per_call: int = 1) -> dict:
+    """Call ``fn`` once per input (after a few warm-up calls); stdout/stderr are discarded."""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()) as sink, contextlib.redirect_stderr(sink):
+        for x in inputs[:warmup]:
+            fn(x)
+        for x in inputs:
+            t0 = time.perf_counter_ns()
+            fn(x)
+            samples.append(time.perf_counter_ns() - t0)
+            sink.seek(0)
+            sink.truncate()  # DEBUG prints and sklearn feature-name warnings on every call
+    return summarize(samples, rows_per_call)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def reading_dicts(X: np.ndarray) -> list[dict]:
+    return [dict(zip(model_service.FEATURE_COLUMNS, map(float, row))) for row in X]
+
+
+def model_benchmarks(X: np.ndarray, batch_sizes: list[int], batch_calls: int) -> dict:
+    bundle = ModelRegistry().current
+    readings = reading_dicts(X)
+    results = {
+        "predict_single": measure(lambda r: model_service.predict_single(r, bundle.iforest, bundle.scaler), readings),
+    }
+    if bundle.rf_model is not None:
+        results["predict_supervised_single"] = measure(
+            lambda r: model_service.predict_supervised_single(r, bundle.rf_model), readings
+        )
+    if bundle.rf_modes is not None:
+        results["predict_failure_modes_single"] = measure(
+            lambda r: model_service.predict_failure_modes_single(r, bundle.rf_modes), readings
+        )
+
+    rng = np.random.default_rng(1)
+    for size in batch_sizes:
+        frames = [pd.DataFrame(X[rng.integers(0, len(X), size)], columns=model_service.FEATURE_COLUMNS)
+                  for _ in range(batch_calls)]
+        results[f"predict_batch[{size}]"] = measure(
+            lambda df: model_service.predict_batch(df, bundle.iforest, bundle.scaler),
+            frames, warmup=1, rows_per_call=size,
+        )
+
+    if bundle.kmeans is not None:
+        rows = [x.reshape(1, -1) for x in X]
+        scaled = [bundle.kmeans_scaler.transform(r) for r in rows]
+        grid = ModeLookupGrid(bundle.kmeans_scaler, bundle.kmeans_index)
+        results["kmeans_sklearn_predict"] = measure(bundle.kmeans.predict, scaled)
+        results["kmeans_centroid_index"] = measure(bundle.kmeans_index.assign_with_confidence, scaled)
+        results["kmeans_scale_and_assign"] = measure(
+            lambda r: bundle.kmeans_index.assign_with_confidence(bundle.kmeans_scaler.transform(r)), rows
+        )
+        results["kmeans_lookup_grid"] = measure(lambda r: grid.lookup(r[0].tolist()), rows)
+        for size in batch_sizes:
+            batches = [bundle.kmeans_scaler.transform(X[rng.integers(0, len(X), size)]) for _ in range(batch_calls)]
+            results[f"kmeans_centroid_index[{size}]"] = measure(
+                bundle.kmeans_index.assign_with_confidence, batches, warmup=1, rows_per_call=size
+            )
+    return results
+
+
+def handler_benchmarks(X: np.ndarray) -> dict:
+    from fastapi.testclient import TestClient
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from src.app import app
+    # No `with`: skip startup hooks (simulation loop, watchers) so only the handler is timed.
+    # Both request shapes hit the same app; the api/main names match earlier result files.
+    api_client = main_client = TestClient(app)
+    bodies = reading_dicts(X)
+    repeat = bodies[:1] * len(bodies)  # same reading every call -> prediction cache hits
+
+    def post(client, path, **params):
+        def call(body):
+            client.post(path, json=body, params=params).raise_for_status()
+        return call
+
+    results = {}
+    for mode in ("unsupervised", "supervised"):
+        results[f"api /predict {mode}"] = measure(post(api_client, "/predict", mode=mode), bodies)
+        results[f"api /predict {mode} cached"] = measure(post(api_client, "/predict", mode=mode), repeat)
+    for model_type in ("isolation_forest", "random_forest"):
+        typed = [{**b, "model_type": model_type} for b in bodies]
+        results[f"main /predict {model_type}"] = measure(post(main_client, "/predict"), typed)
+        results[f"main /predict {model_type} cached"] = measure(post(main_client, "/predict"), typed[:1] * len(typed))
+    return results
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"\nvs {baseline.get('commit', '?')[:10]} ({baseline.get('timestamp')})")
+    print(f"{'benchmark':<42}{'p50 before':>12}{'p50 now':>12}{'change':>9}")
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = (now["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        print(f"{name:<42}{before['p50_ms']:>12.3f}{now['p50_ms']:>12.3f}{change:>+8.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300, help="single-row calls per benchmark")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--batch-calls", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-handlers", action="store_true")
+    parser.add_argument("--output", default="bench_inference.json")
+    parser.add_argument("--compare", help="earlier JSON output to print p50 changes against")
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATA_PATH, usecols=model_service.FEATURE_COLUMNS)
+    rng = np.random.default_rng(args.seed)
+    X = df.values[rng.integers(0, len(df), args.iterations)]
+
+    results = model_benchmarks(X, args.batch_sizes, args.batch_calls)
+    if not args.skip_handlers:
+        results.update(handler_benchmarks(X))
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": vars(args),
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'benchmark':<42}{'p50 ms':>10}{'p95 ms':>10}{'rows/s':>14}")
+    for name, r in results.items():
+        print(f"{name:<42}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['rows_per_s']:>14,.0f}")
+    print(f"\nWrote {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
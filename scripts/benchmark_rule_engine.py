@@ -0,0 +1,158 @@
+"""
+Benchmark for the vectorized automation rule engine (src/rule_engine.py).
+
+Builds a Room_Status table with N rooms in an in-memory SQLite database,
+then runs T ticks in which a fraction of rooms get a new occupancy reading.
+Each tick is evaluated three ways:
+
+  engine  - RuleEngine.apply over NumPy columns + write_back of changed cells
+  sql     - the notebook's UPDATE statements run against the whole table
+  python  - a per-row Python loop over the same rules
+
+Run from the repo root:  python scripts/benchmark_rule_engine.py --rooms 50000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from rule_engine import DEFAULT_RULES, compile_rules, write_back  # noqa: E402
+
+SCHEMA = """
+    CREATE TABLE Room_Status (
+        Room_ID INTEGER PRIMARY KEY,
+        Occupancy_Count INTEGER,
+        AC_Status TEXT,
+        Lights_Status TEXT,
+        Last_Updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+SQL_RULES = [
+    "UPDATE Room_Status SET Lights_Status = 'OFF', Last_Updated = CURRENT_TIMESTAMP "
+    "WHERE Occupancy_Count = 0 AND Lights_Status != 'OFF'",
+    "UPDATE Room_Status SET AC_Status = 'LOW POWER', Last_Updated = CURRENT_TIMESTAMP "
+    "WHERE Occupancy_Count > 0 AND Occupancy_Count < 5 AND AC_Status != 'LOW POWER'",
+    "SELECT Room_ID FROM Room_Status WHERE Occupancy_Count > 20",
+]
+
+
+COLUMNS = ("Room_ID", "Occupancy_Count", "AC_Status", "Lights_Status")
+
+
+def make_state(n_rooms: int, rng: np.random.Generator) -> dict[str, np.ndarray]:
+    return {
+        "Room_ID": np.arange(1, n_rooms + 1),
+        "Occupancy_Count": rng.integers(0, 30, n_rooms),
+        "AC_Status": np.full(n_rooms, "ON", dtype="<U16"),
+        "Lights_Status": np.full(n_rooms, "ON", dtype="<U16"),
+    }
+
+
+def make_db(state: dict[str, np.ndarray]) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(SCHEMA)
+    conn.executemany(
+        "INSERT INTO Room_Status (Room_ID, Occupancy_Count, AC_Status, Lights_Status) VALUES (?, ?, ?, ?)",
+        zip(*(state[c].tolist() for c in COLUMNS)),
+    )
+    conn.commit()
+    return conn
+
+
+def sense(state: dict[str, np.ndarray], rng: np.random.Generator, fraction: float) -> np.ndarray:
+    """New occupancy for a random subset of rooms; people arriving turns lights/AC back on."""
+    n_rooms = len(state["Room_ID"])
+    rows = rng.choice(n_rooms, int(n_rooms * fraction), replace=False)
+    occupancy = rng.integers(0, 30, len(rows))
+    state["Occupancy_Count"][rows] = occupancy
+    state["Lights_Status"][rows[occupancy > 0]] = "ON"
+    state["AC_Status"][rows[occupancy >= 5]] = "ON"
+    return rows
+
+
+def sense_db(conn: sqlite3.Connection, state: dict[str, np.ndarray], rows: np.ndarray) -> None:
+    with conn:
+        conn.executemany(
+            "UPDATE Room_Status SET Occupancy_Count = ?, AC_Status = ?, Lights_Status = ? WHERE Room_ID = ?",
+            zip(*(state[c][rows].tolist() for c in ("Occupancy_Count", "AC_Status", "Lights_Status", "Room_ID"))),
+        )
+
+
+def python_rules(records: list[dict]) -> int:
+    changed = 0
+    for room in records:
+        occupancy = room["Occupancy_Count"]
+        if occupancy == 0 and room["Lights_Status"] != "OFF":
+            room["Lights_Status"] = "OFF"
+            changed += 1
+        if 0 < occupancy < 5 and room["AC_Status"] != "LOW POWER":
+            room["AC_Status"] = "LOW POWER"
+            changed += 1
+        room["overcrowded"] = occupancy > 20
+    return changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=50_000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--changed", type=float, default=0.05, help="fraction of rooms with a new reading per tick")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    engine = compile_rules(DEFAULT_RULES)
+    state = make_state(args.rooms, rng)
+    engine_db = make_db(state)
+    sql_db = make_db(state)
+    # settle the initial state so ticks only see real transitions
+    write_back(engine_db, state, engine.apply(state))
+    for statement in SQL_RULES:
+        sql_db.execute(statement).fetchall()
+    sql_db.commit()
+
+    timings = {"engine eval": [], "engine write": [], "sql": [], "python": []}
+    cells = []
+    for _ in range(args.ticks):
+        rows = sense(state, rng, args.changed)
+        sense_db(engine_db, state, rows)
+        sense_db(sql_db, state, rows)
+        records = [dict(zip(COLUMNS, row)) for row in zip(*(state[c].tolist() for c in COLUMNS))]
+
+        t0 = time.perf_counter()
+        result = engine.apply(state)
+        t1 = time.perf_counter()
+        cells.append(write_back(engine_db, state, result))
+        t2 = time.perf_counter()
+        with sql_db:
+            for statement in SQL_RULES:
+                sql_db.execute(statement).fetchall()
+        t3 = time.perf_counter()
+        python_rules(records)
+        t4 = time.perf_counter()
+
+        timings["engine eval"].append(t1 - t0)
+        timings["engine write"].append(t2 - t1)
+        timings["sql"].append(t3 - t2)
+        timings["python"].append(t4 - t3)
+
+    query = "SELECT Room_ID, AC_Status, Lights_Status FROM Room_Status ORDER BY Room_ID"
+    assert engine_db.execute(query).fetchall() == sql_db.execute(query).fetchall(), "engine and SQL disagree"
+
+    print(f"{args.rooms} rooms, {args.ticks} ticks, {args.changed:.0%} new readings per tick")
+    print(f"changed cells written per tick: mean {np.mean(cells):.0f}")
+    for name, values in timings.items():
+        ms = np.array(values) * 1000
+        print(f"  {name:<13} mean {ms.mean():8.2f} ms   p95 {np.percentile(ms, 95):8.2f} ms")
+    total = np.array(timings["engine eval"]) + np.array(timings["engine write"])
+    print(f"  engine total  {1 / total.mean():,.0f} ticks/s ({args.rooms / total.mean() / 1e6:.1f}M rooms/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Serialization cost per reading for every /predict wire format.
+
+Single reading (decode one request body, encode one response):
+  pydantic       FastAPI's body model + response_model path: json.loads and
+                 SensorReading validation, PredictionResponse + jsonable_encoder + stdlib json
+  orjson         SensorReading.model_validate_json on the raw bytes, orjson.dumps of the result dict
+  msgpack        msgpack.unpackb + SensorReading.model_validate, msgpack.packb
+
+Bulk (POST /predict/batch bodies of --batch rows, per-reading cost):
+  json records / json columns / msgpack columns / arrow
+
+No models are run; only bytes <-> Python/NumPy conversion is timed.
+
+Run from the repo root:  python scripts/benchmark_serialization.py
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+os.environ.setdefault("PREDICTION_LOG_PATH", os.path.join(tempfile.mkdtemp(), "predictions.db"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from src.model_service import FEATURE_COLUMNS  # noqa: E402
+from src.routers.predict import PredictionResponse, SensorReading, parse_reading  # noqa: E402
+from src.serialization import (  # noqa: E402
+    ARROW, JSON, MSGPACK, arrow_stream, columns_from_body, dumps_json, msgpack_available,
+)
+
+RESULT = {
+    "is_anomaly": 0,
+    "anomaly_score": 0.10816755644938819,
+    "operating_mode_cluster": 3,
+    "cluster_name": "Extreme/stressed operation",
+    "cluster_confidence": 0.43089905858881916,
+    "cluster_recommendations": ["Avoid max load", "Schedule maintenance ASAP"],
+    "failure_modes": {"TWF": 0.0, "HDF": 0.01, "PWF": 0.0, "OSF": 0.02, "RNF": 0.0},
+}
+
+
+def per_call_us(fn, inputs: list, repeats: int) -> float:
+    """Best-of-``repeats`` mean microseconds per call over ``inputs``."""
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for x in inputs:
+            fn(x)
+        best = min(best, (time.perf_counter() - t0) / len(inputs))
+    return best * 1e6
+
+
+def single_reading(readings: list[dict], repeats: int) -> dict[str, tuple[float, float, int]]:
+    """(decode us, encode us, request + response bytes) per format."""
+    json_bodies = [json.dumps(r).encode() for r in readings]
+    results = [RESULT] * len(readings)
+
+    def pydantic_encode(result):
+        return json.dumps(jsonable_encoder(PredictionResponse(**result)), ensure_ascii=False,
+                          separators=(",", ":")).encode()
+
+    out = {
+        "pydantic": (
+            per_call_us(lambda b: SensorReading.model_validate(json.loads(b)), json_bodies, repeats),
+            per_call_us(pydantic_encode, results, repeats),
+            len(json_bodies[0]) + len(pydantic_encode(RESULT)),
+        ),
+        "orjson": (
+            per_call_us(lambda b: parse_reading(b, JSON), json_bodies, repeats),
+            per_call_us(dumps_json, results, repeats),
+            len(json_bodies[0]) + len(dumps_json(RESULT)),
+        ),
+    }
+    if msgpack_available():
+        import msgpack
+        packed = [msgpack.packb(r) for r in readings]
+        out["msgpack"] = (
+            per_call_us(lambda b: parse_reading(b, MSGPACK), packed, repeats),
+            per_call_us(msgpack.packb, results, repeats),
+            len(packed[0]) + len(msgpack.packb(RESULT)),
+        )
+    return out
+
+
+def bulk(df: pd.DataFrame, repeats: int) -> dict[str, tuple[float, float, int]]:
+    """Same triple per reading for one batch body of ``len(df)`` rows."""
+    n = len(df)
+    columns = {c: df[c].to_numpy() for c in FEATURE_COLUMNS}
+    scores = {
+        "is_anomaly": np.zeros(n, dtype=np.int8),
+        "anomaly_score": np.random.default_rng(0).random(n),
+        "operating_mode_cluster": np.zeros(n, dtype=np.int16),
+        "cluster_confidence": np.random.default_rng(1).random(n),
+    }
+
+    def decode(body, media):
+        def run(_):
+            X = columns_from_body(body, media, FEATURE_COLUMNS)
+            return np.column_stack([np.asarray(X[c], dtype=float) for c in FEATURE_COLUMNS])
+        return run
+
+    bodies = {
+        "json records": (JSON, dumps_json(df[FEATURE_COLUMNS].to_dict("records")), dumps_json),
+        "json columns": (JSON, dumps_json(columns), dumps_json),
+        "arrow": (ARROW, arrow_stream(columns), arrow_stream),
+    }
+    if msgpack_available():
+        import msgpack
+        packb = lambda cols: msgpack.packb({k: np.asarray(v).tolist() for k, v in cols.items()})  # noqa: E731
+        bodies["msgpack columns"] = (MSGPACK, packb(columns), packb)
+
+    out = {}
+    for name, (media, body, encoder) in bodies.items():
+        encoded = encoder(scores)
+        out[name] = (
+            per_call_us(decode(body, media), [None], repeats) / n,
+            per_call_us(lambda _: encoder(scores), [None], repeats) / n,
+            (len(body) + len(encoded)) / n,
+        )
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readings", type=int, default=2000, help="single-reading bodies per timing pass")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1_000, 100_000], help="rows per bulk body")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    df = pd.read_csv(os.path.join("data", "ai4i2020.csv"), usecols=FEATURE_COLUMNS)
+    readings = df.sample(args.readings, replace=True, random_state=0).to_dict("records")
+
+    print(f"{'format':<26}{'decode us':>11}{'encode us':>11}{'total us':>10}{'bytes':>8}   (per reading)")
+    for name, (dec, enc, size) in single_reading(readings, args.repeats).items():
+        print(f"{'single ' + name:<26}{dec:>11.2f}{enc:>11.2f}{dec + enc:>10.2f}{size:>8.0f}")
+    for n in args.batch:
+        batch = df.sample(n, replace=True, random_state=1)
+        for name, (dec, enc, size) in bulk(batch, args.repeats).items():
+            print(f"{f'batch {n} {name}':<26}{dec:>11.3f}{enc:>11.3f}{dec + enc:>10.3f}{size:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Startup time and resident memory of one or more uvicorn apps.
+
+Each app is launched in its own process, timed until it answers
+/openapi.json (startup hooks have run by then), and its RSS is read after
+a short settle. Totals are what running all of them side by side costs,
+e.g. the old two-process deployment against the combined app:
+
+  python scripts/compare_app_footprint.py --apps src.api:app src.main:app
+  python scripts/compare_app_footprint.py --apps src.app:app
+
+Linux only (reads /proc). Run from the repo root.
+"""
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def memory_kb(pid: int) -> dict[str, int]:
+    values = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def measure(app: str, settle: float, timeout: float = 120.0) -> dict:
+    port = free_port()
+    cmd = [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"]
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise SystemExit(f"{app} exited with code {proc.returncode}")
+            if time.perf_counter() - t0 > timeout:
+                raise SystemExit(f"{app} did not start within {timeout:g}s")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.05)
+        startup = time.perf_counter() - t0
+        time.sleep(settle)
+        mem = memory_kb(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return {"startup_s": startup, "rss_mb": mem["VmRSS"] / 1024, "peak_rss_mb": mem["VmHWM"] / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", nargs="+", default=["src.app:app"], metavar="MODULE:APP")
+    parser.add_argument("--repeats", type=int, default=3, help="launches per app; medians are reported")
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds to idle before reading RSS")
+    args = parser.parse_args()
+
+    print(f"{'app':<22}{'startup s':>11}{'RSS MB':>10}{'peak MB':>10}")
+    totals = {"startup_s": 0.0, "rss_mb": 0.0, "peak_rss_mb": 0.0}
+    for app in args.apps:
+        runs = [measure(app, args.settle) for _ in range(args.repeats)]
+        med = {k: statistics.median(r[k] for r in runs) for k in totals}
+        for k in totals:
+            totals[k] += med[k]
+        print(f"{app:<22}{med['startup_s']:>11.2f}{med['rss_mb']:>10.1f}{med['peak_rss_mb']:>10.1f}")
+    if len(args.apps) > 1:
+        print(f"{'total':<22}{totals['startup_s']:>11.2f}{totals['rss_mb']:>10.1f}{totals['peak_rss_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
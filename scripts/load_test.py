@@ -0,0 +1,257 @@
+"""
+Asyncio load generator for the HTTP API.
+
+Drives a running server (or one it launches with uvicorn) with a weighted
+mix of requests, e.g. predictions, dashboard polling and access-log reads,
+and reports per-endpoint latency percentiles, error rate and achieved
+throughput.
+
+Arrivals are open-loop Poisson at --rps. Latency is measured from each
+request's scheduled send time, so a server that falls behind shows the
+queueing delay instead of hiding it. --rps 0 switches to closed loop: each
+of --concurrency workers sends back-to-back, which measures saturation
+throughput directly. --ramp runs several arrival rates in a row and reports
+the highest rate each endpoint sustained within --slo-ms and 1% errors.
+
+Examples (from the repo root):
+  python scripts/load_test.py --launch src.main:app --rps 200 --duration 20
+  python scripts/load_test.py --launch src.api:app --app api --ramp 25 50 100 200
+  python scripts/load_test.py --url http://127.0.0.1:8000 --rps 0 --concurrency 64 \\
+      --mix predict_unsupervised=1 dashboard=4
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+DATA_PATH = os.path.join("data", "ai4i2020.csv")
+FEATURES = ["Rotational speed [rpm]", "Process temperature [K]", "Torque [Nm]", "Tool wear [min]"]
+
+# name -> (method, path, query params, body kind); body kind None = no body
+SCENARIOS = {
+    "main": {
+        "predict_unsupervised": ("POST", "/predict", {}, "isolation_forest"),
+        "predict_supervised": ("POST", "/predict", {}, "random_forest"),
+        "dashboard": ("GET", "/api/dashboard/stats", {}, None),
+        "dashboard_chart": ("GET", "/api/dashboard/chart", {}, None),
+        "access_logs": ("GET", "/api/access/logs", {}, None),
+        "access_stats": ("GET", "/api/access/stats", {}, None),
+    },
+    "api": {
+        "predict_unsupervised": ("POST", "/predict", {"mode": "unsupervised"}, "reading"),
+        "predict_supervised": ("POST", "/predict", {"mode": "supervised"}, "reading"),
+        "health": ("GET", "/health", {}, None),
+    },
+}
+DEFAULT_MIX = {
+    "main": "predict_unsupervised=3 predict_supervised=1 dashboard=4 dashboard_chart=2 access_logs=1",
+    "api": "predict_unsupervised=3 predict_supervised=1",
+}
+READY_PATH = {"main": "/", "api": "/health"}
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.latencies.append(seconds)
+        if not ok:
+            self.errors += 1
+
+    def summary(self, duration: float) -> dict:
+        n = len(self.latencies)
+        ms = np.array(self.latencies) * 1000 if n else np.zeros(1)
+        return {
+            "requests": n,
+            "errors": self.errors,
+            "error_rate": round(self.errors / n, 4) if n else 0.0,
+            "ok_per_s": round((n - self.errors) / duration, 1),
+            "p50_ms": round(float(np.percentile(ms, 50)), 2),
+            "p95_ms": round(float(np.percentile(ms, 95)), 2),
+            "p99_ms": round(float(np.percentile(ms, 99)), 2),
+            "max_ms": round(float(ms.max()), 2),
+        }
+
+
+def parse_mix(items: list[str], scenarios: dict) -> dict[str, float]:
+    mix = {}
+    for item in items:
+        name, _, weight = item.partition("=")
+        if name not in scenarios:
+            raise SystemExit(f"Unknown request kind '{name}'; choose from {list(scenarios)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def make_request_factory(scenarios: dict, readings: list[dict]):
+    def build(kind: str) -> dict:
+        method, path, params, body = scenarios[kind]
+        request = {"method": method, "url": path, "params": params}
+        if body is not None:
+            payload = dict(random.choice(readings))
+            if body != "reading":
+                payload["model_type"] = body
+            request["json"] = payload
+        return request
+    return build
+
+
+async def send(client: httpx.AsyncClient, request: dict) -> bool:
+    try:
+        resp = await client.request(**request)
+        return resp.status_code < 400
+    except httpx.HTTPError:
+        return False
+
+
+async def open_loop(client, build, mix, rps: float, duration: float, concurrency: int) -> dict:
+    stats = {kind: EndpointStats() for kind in mix}
+    kinds, weights = list(mix), list(mix.values())
+    in_flight = asyncio.Semaphore(concurrency)
+    tasks = []
+
+    async def fire(kind: str, scheduled: float) -> None:
+        async with in_flight:
+            ok = await send(client, build(kind))
+        stats[kind].record(time.perf_counter() - scheduled, ok)
+
+    start = time.perf_counter()
+    next_at = start
+    while next_at < start + duration:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(random.choices(kinds, weights)[0], next_at)))
+        next_at += random.expovariate(rps)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    return {kind: s.summary(elapsed) for kind, s in stats.items()}
+
+
+async def closed_loop(client, build, mix, duration: float, concurrency: int) -> dict:
+    stats = {kind: EndpointStats() for kind in mix}
+    kinds, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            kind = random.choices(kinds, weights)[0]
+            t0 = time.perf_counter()
+            ok = await send(client, build(kind))
+            stats[kind].record(time.perf_counter() - t0, ok)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {kind: s.summary(elapsed) for kind, s in stats.items()}
+
+
+def print_step(label: str, results: dict) -> None:
+    print(f"\n{label}")
+    print(f"{'endpoint':<22}{'requests':>9}{'err %':>7}{'ok/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for kind, r in results.items():
+        print(f"{kind:<22}{r['requests']:>9}{r['error_rate'] * 100:>7.1f}{r['ok_per_s']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+
+
+def saturation(steps: list[tuple[float, dict]], slo_ms: float) -> dict[str, float]:
+    """Highest achieved ok/s per endpoint over steps that met the SLO and <1% errors."""
+    best: dict[str, float] = {}
+    for _, results in steps:
+        for kind, r in results.items():
+            if r["error_rate"] < 0.01 and r["p99_ms"] <= slo_ms:
+                best[kind] = max(best.get(kind, 0.0), r["ok_per_s"])
+            else:
+                best.setdefault(kind, 0.0)
+    return best
+
+
+def launch(app: str, host: str, port: int, workers: int, ready_path: str) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "uvicorn", app, "--host", host, "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    url = f"http://{host}:{port}{ready_path}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"uvicorn exited with code {proc.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    proc.terminate()
+    raise SystemExit(f"Server did not become ready at {url}")
+
+
+async def run(args) -> dict:
+    scenarios = SCENARIOS[args.app]
+    mix = parse_mix(args.mix or DEFAULT_MIX[args.app].split(), scenarios)
+    readings = pd.read_csv(DATA_PATH, usecols=FEATURES).sample(1000, random_state=args.seed).to_dict("records")
+    build = make_request_factory(scenarios, readings)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    steps = []
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        for rps in (args.ramp or [args.rps]):
+            if rps > 0:
+                results = await open_loop(client, build, mix, rps, args.duration, args.concurrency)
+                label = f"open loop, {rps:g} req/s offered, {args.duration:g}s"
+            else:
+                results = await closed_loop(client, build, mix, args.duration, args.concurrency)
+                label = f"closed loop, {args.concurrency} workers, {args.duration:g}s"
+            print_step(label, results)
+            steps.append((rps, results))
+    best = saturation(steps, args.slo_ms)
+    print(f"\nSaturation throughput (p99 <= {args.slo_ms:g} ms, <1% errors):")
+    for kind, value in best.items():
+        print(f"  {kind:<22}{value:>9.1f} ok/s")
+    return {"app": args.app, "url": args.url, "mix": mix,
+            "steps": [{"rps": rps, "results": r} for rps, r in steps], "saturation": best}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", choices=list(SCENARIOS), default="main", help="which API's endpoints to drive")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--launch", metavar="MODULE:APP", help="start uvicorn with this app for the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when launching")
+    parser.add_argument("--mix", nargs="+", metavar="KIND=WEIGHT", help="request mix, e.g. dashboard=4 access_logs=1")
+    parser.add_argument("--rps", type=float, default=100, help="offered arrival rate; 0 = closed loop")
+    parser.add_argument("--ramp", type=float, nargs="+", help="run these arrival rates in sequence")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per step")
+    parser.add_argument("--concurrency", type=int, default=64, help="max in-flight requests / workers")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--slo-ms", type=float, default=500.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the results here")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    server = None
+    if args.launch:
+        host, _, port = args.url.removeprefix("http://").partition(":")
+        server = launch(args.launch, host, int(port or 80), args.workers, READY_PATH[args.app])
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+In-process load test for the dashboard read path.
+
+Hammers /api/dashboard/stats and /api/dashboard/chart at a target request
+rate through the ASGI app (no network) while the simulation scheduler runs,
+then reports achieved throughput and how steady the tick rate stayed.
+
+Run from the repo root:  python scripts/load_test_dashboard.py --rps 1000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from main import app  # noqa: E402
+from simulation_service import simulation  # noqa: E402
+
+
+async def run(rps: int, duration: float, concurrency: int) -> None:
+    tick_times = []
+    simulation.on_tick(lambda snapshot: tick_times.append(time.monotonic()))
+    ticker = asyncio.create_task(simulation.run())
+
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    errors = 0
+    paths = ["/api/dashboard/stats", "/api/dashboard/chart"]
+    interval = concurrency / rps  # each worker's share of the arrival rate
+    deadline = time.monotonic() + duration
+
+    async def worker(worker_id: int, client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        next_send = time.monotonic() + worker_id * interval / concurrency
+        i = worker_id
+        while next_send < deadline:
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            t0 = time.perf_counter()
+            resp = await client.get(paths[i % len(paths)])
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code != 200:
+                errors += 1
+            i += 1
+            next_send += interval
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.monotonic()
+        await asyncio.gather(*(worker(w, client) for w in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    ticker.cancel()
+
+    latencies.sort()
+    gaps = [b - a for a, b in zip(tick_times, tick_times[1:])]
+    print(f"Requests:          {len(latencies)} in {elapsed:.1f}s ({len(latencies) / elapsed:.0f} req/s, target {rps})")
+    print(f"Errors:            {errors}")
+    print(f"Latency p50/p99:   {latencies[len(latencies) // 2] * 1e3:.2f} / {latencies[int(len(latencies) * 0.99)] * 1e3:.2f} ms")
+    print(f"Ticks:             {len(tick_times)} (expected ~{elapsed / simulation.tick_interval:.0f})")
+    if gaps:
+        print(f"Tick gap min/max:  {min(gaps):.3f} / {max(gaps):.3f} s (interval {simulation.tick_interval}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rps", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.rps, args.duration, args.concurrency))
@@ -0,0 +1,91 @@
+"""
+The one FastAPI app: predictions (both request shapes), model management,
+access control, dashboard/live push, energy history and reports, all on a
+single model registry and SQLite pool (see services.py).
+
+  uvicorn src.app:app
+
+``src.api:app`` and ``src.main:app`` are kept as aliases of this app.
+"""
+import os
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+try:
+    from . import services
+    from .profiler import ProfilingMiddleware
+    from .routers import access, admin, dashboard, models, predict, reports
+    from .serialization import FastJSONResponse
+except ImportError:  # loaded top-level by src/main.py
+    import services
+    from profiler import ProfilingMiddleware
+    from routers import access, admin, dashboard, models, predict, reports
+    from serialization import FastJSONResponse
+
+app = FastAPI(
+    title="Aurora Smart Building API",
+    description="IsolationForest + RandomForest + K-Means on AI4I data, access control and building telemetry.",
+    version="3.0.0",
+    default_response_class=FastJSONResponse,
+)
+
+# Comma-separated CORS_ORIGINS; defaults to the dev frontends (CRA and Vite)
+CORS_ORIGINS = os.environ.get(
+    "CORS_ORIGINS",
+    "http://localhost:3000,http://127.0.0.1:3000,http://localhost:5173,http://127.0.0.1:5173",
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[origin.strip() for origin in CORS_ORIGINS.split(",") if origin.strip()],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+# Passes requests straight through unless an admin armed a profile session
+app.add_middleware(ProfilingMiddleware, profiler=services.PROFILER)
+
+app.include_router(predict.router)
+app.include_router(models.router)  # v2 paths: /health, /models, ...
+app.include_router(models.router, prefix="/api")  # Aurora paths: /api/models, ...
+app.include_router(access.router)
+app.include_router(dashboard.router)
+app.include_router(reports.router)
+app.include_router(admin.router)
+
+
+@app.on_event("startup")
+async def startup_event():
+    services.start()
+    status = services.REGISTRY.status()
+    if status["unsupervised_model_loaded"]:
+        print("Anomaly Model loaded.")
+    else:
+        print(f"Warning: ML Model failed to load: {status['last_error']}")
+    if status["supervised_model_loaded"]:
+        print("Supervised Model loaded.")
+
+    if not os.path.exists(services.ACCESS_DB_PATH):
+        print("Initializing Database...")
+        try:
+            from .init_db import init_db
+        except ImportError:
+            from init_db import init_db
+        init_db()
+
+    app.state.background_tasks = dashboard.start_background_tasks()
+    await dashboard.load_energy_history()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in app.state.background_tasks:
+        task.cancel()
+    reports.report_queue.shutdown()
+    services.stop()
+
+
+@app.get("/")
+def read_root():
+    return {"status": "online", "system": "Aurora Building Health API"}
@@ -0,0 +1,183 @@
+"""
+Offline bulk scoring of historian exports too large to load at once.
+
+    python -m src.bulk_score historian.csv scored.parquet --mode supervised --workers 4
+
+The input (CSV or Parquet) is read in chunks. Worker processes load the
+model bundle once at startup and score the four feature columns of each
+chunk. The output columns from /predict/batch are then appended to the
+chunk in place and written to Parquet or CSV as it completes, in input
+order. Only ``--workers * 2`` chunks are held in memory at a time.
+
+Rows with a missing or non-finite feature are not scored; their output
+columns are left empty (null). Outputs named like an input column (the AI4I
+failure-mode labels in supervised mode) are written as ``pred_<name>``.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .model_registry import MODEL_DIR, ModelBundle, ModelRegistry
+    from .model_service import FEATURE_COLUMNS
+    from .serialization import arrow_available
+except ImportError:  # run as a script from src/
+    from model_registry import MODEL_DIR, ModelBundle, ModelRegistry
+    from model_service import FEATURE_COLUMNS
+    from serialization import arrow_available
+
+DEFAULT_CHUNKSIZE = 100_000
+
+_bundle: ModelBundle | None = None  # per worker process
+
+
+def _load_bundle(model_dir: str) -> None:
+    global _bundle
+    _bundle = ModelRegistry(model_dir).current
+
+
+def score_chunk(X: np.ndarray, mode: str) -> dict[str, np.ndarray]:
+    """Output columns for one chunk of features; rows with NaN/inf are returned as nulls."""
+    valid = np.isfinite(X).all(axis=1)
+    if valid.all():
+        return _bundle.score_batch(X, mode)
+    # The models reject empty input; an all-invalid chunk scores one placeholder row that is never kept
+    scored = _bundle.score_batch(X[valid] if valid.any() else np.zeros((1, X.shape[1])), mode)
+    columns = {}
+    for name, values in scored.items():
+        if np.issubdtype(values.dtype, np.integer):
+            full = np.zeros(len(X), dtype=values.dtype)
+            full[valid] = values
+            columns[name] = pd.arrays.IntegerArray(full, mask=~valid)
+        else:
+            full = np.full(len(X), np.nan)
+            full[valid] = values
+            columns[name] = full
+    return columns
+
+
+def read_chunks(path: str, chunksize: int, keep: list[str] | None) -> Iterator[pd.DataFrame]:
+    columns = None if keep is None else list(dict.fromkeys(keep + FEATURE_COLUMNS))
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        # Features as float in every chunk, so a chunk without decimals cannot change the output schema
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns,
+                               dtype={c: float for c in FEATURE_COLUMNS})
+
+
+class ChunkWriter:
+    """Appends scored chunks to one Parquet or CSV file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self._writer = None
+        self._first = True
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            elif table.schema != self._writer.schema:
+                try:
+                    table = table.cast(self._writer.schema)
+                except (pa.ArrowInvalid, ValueError) as e:
+                    raise ValueError(
+                        f"Chunk columns changed type ({e}); restrict them with --keep or write CSV"
+                    ) from e
+            self._writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    mode: str = "unsupervised",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: int = os.cpu_count() or 1,
+    keep: list[str] | None = None,
+    model_dir: str = MODEL_DIR,
+) -> int:
+    """Score ``input_path`` into ``output_path``; returns the number of rows written."""
+    if (input_path.endswith(".parquet") or output_path.endswith(".parquet")) and not arrow_available():
+        raise RuntimeError("Parquet input/output needs pyarrow")
+
+    pool = ProcessPoolExecutor(workers, initializer=_load_bundle, initargs=(model_dir,)) if workers > 1 else None
+    if pool is None:
+        _load_bundle(model_dir)
+    writer = ChunkWriter(output_path)
+    pending: deque[tuple[pd.DataFrame, Future | dict]] = deque()
+    rows = 0
+    t0 = time.perf_counter()
+
+    def flush_one() -> None:
+        nonlocal rows
+        chunk, result = pending.popleft()
+        columns = result.result() if isinstance(result, Future) else result
+        inputs = set(chunk.columns)
+        for name, values in columns.items():
+            # appended to the chunk read from disk, no frame copy; AI4I label columns are kept
+            chunk[f"pred_{name}" if name in inputs else name] = values
+        writer.write(chunk)
+        rows += len(chunk)
+        print(f"{rows:,} rows scored ({rows / (time.perf_counter() - t0):,.0f} rows/s)", file=sys.stderr)
+
+    try:
+        for chunk in read_chunks(input_path, chunksize, keep):
+            missing = [c for c in FEATURE_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(f"{input_path} is missing required columns: {missing}")
+            X = chunk[FEATURE_COLUMNS].to_numpy(dtype=float)  # only the features travel to workers
+            pending.append((chunk, pool.submit(score_chunk, X, mode) if pool else score_chunk(X, mode)))
+            if len(pending) >= max(workers, 1) * 2:
+                flush_one()
+        while pending:
+            flush_one()
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or .parquet file with the AI4I feature columns")
+    parser.add_argument("output", help="output file; .parquet writes Parquet, anything else CSV")
+    parser.add_argument("--mode", choices=["unsupervised", "supervised"], default="unsupervised")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="scoring processes (1 scores in this process)")
+    parser.add_argument("--keep", nargs="+", metavar="COLUMN",
+                        help="input columns to carry into the output besides the features (default: all)")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    rows = run(args.input, args.output, args.mode, args.chunksize, args.workers, args.keep, args.model_dir)
+    print(f"Wrote {rows:,} rows to {args.output} in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
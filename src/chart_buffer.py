@@ -0,0 +1,105 @@
+import json
+import math
+from datetime import datetime
+
+import numpy as np
+
+
+class ChartRingBuffer:
+    """Fixed-capacity (timestamp, uv, pv) history stored as NumPy columns.
+
+    ``append`` is O(1) (one slot write, no list shifting). Encoded JSON for a
+    given (window, max_points) request is cached and only rebuilt after the
+    next append. Not thread-safe: the simulation scheduler and the async
+    handlers that read it share the event loop thread.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.float64)
+        self.uv = np.zeros(capacity, dtype=np.int64)
+        self.pv = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+        self._head = 0  # next write position
+        self._version = 0
+        self._encoded: dict[tuple, bytes] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, ts: float, uv: int, pv: int) -> None:
+        i = self._head
+        self.ts[i] = ts
+        self.uv[i] = uv
+        self.pv[i] = pv
+        self._head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self._version += 1
+        self._encoded.clear()
+
+    @property
+    def last_ts(self) -> float | None:
+        return float(self.ts[self._head - 1]) if self.size else None
+
+    def last_point(self) -> dict:
+        i = self._head - 1
+        return self._point(self.ts[i], self.uv[i], self.pv[i])
+
+    def _ordered(self, column: np.ndarray) -> np.ndarray:
+        if self.size < self.capacity:
+            return column[:self.size]
+        return np.concatenate((column[self._head:], column[:self._head]))
+
+    def window(self, seconds: float | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Oldest-to-newest columns, limited to the last ``seconds`` if given."""
+        ts, uv, pv = self._ordered(self.ts), self._ordered(self.uv), self._ordered(self.pv)
+        if seconds is not None and self.size:
+            start = np.searchsorted(ts, ts[-1] - seconds, side="right")
+            ts, uv, pv = ts[start:], uv[start:], pv[start:]
+        return ts, uv, pv
+
+    @staticmethod
+    def downsample(ts, uv, pv, max_points: int):
+        """Average fixed-size buckets so at most ``max_points`` remain (newest bucket kept full)."""
+        n = len(ts)
+        if n <= max_points:
+            return ts, uv, pv
+        bucket = math.ceil(n / max_points)
+        # Align buckets to the newest point so the live edge is never partial.
+        starts = np.arange(n % bucket, n, bucket)
+        if starts[0] != 0:
+            starts = np.concatenate(([0], starts))
+        counts = np.diff(np.append(starts, n))
+        ends = starts + counts - 1
+        uv = np.rint(np.add.reduceat(uv, starts) / counts).astype(np.int64)
+        pv = np.rint(np.add.reduceat(pv, starts) / counts).astype(np.int64)
+        return ts[ends], uv, pv
+
+    @staticmethod
+    def _point(ts, uv, pv) -> dict:
+        return {
+            "name": datetime.fromtimestamp(float(ts)).strftime("%H:%M:%S"),
+            "uv": int(uv),
+            "pv": int(pv),
+        }
+
+    def columns(
+        self, seconds: float | None = None, max_points: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(ts, uv, pv) behind ``points(...)``, with epoch-second timestamps."""
+        ts, uv, pv = self.window(seconds)
+        if max_points is not None:
+            ts, uv, pv = self.downsample(ts, uv, pv, max_points)
+        return ts, uv, pv
+
+    def points(self, seconds: float | None = None, max_points: int | None = None) -> list[dict]:
+        return [self._point(*row) for row in zip(*self.columns(seconds, max_points))]
+
+    def encoded(self, seconds: float | None = None, max_points: int | None = None) -> bytes:
+        """JSON bytes for ``points(...)``, cached until the next append."""
+        key = (seconds, max_points)
+        body = self._encoded.get(key)
+        if body is None:
+            body = json.dumps(self.points(seconds, max_points), separators=(",", ":")).encode()
+            self._encoded[key] = body
+        return body
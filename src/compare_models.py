@@ -13,7 +13,7 @@ y = df["Machine failure"].values
 
 # Unsupervised
 model, scaler = load_model()
-df_unsup = predict_batch(df, model, scaler)
+df_unsup = predict_batch(df, model, scaler, copy=False)
 y_pred_unsup = df_unsup["is_anomaly"].values
 print("IsolationForest (unsupervised)")
 print(classification_report(y, y_pred_unsup))
@@ -0,0 +1,208 @@
+"""
+Stratified K-fold evaluation of the IsolationForest, the RandomForests and
+K-Means, with 95% confidence intervals across folds. "rf" is the binary
+Machine failure forest (rf_supervised.pkl); "rf_modes" is the multi-output
+failure-mode forest (rf_failure_modes.pkl), which serves random_forest requests
+when present, scored on its Machine failure output.
+
+    python -m src.cross_validate                        # 5 folds, all models
+    python -m src.cross_validate --folds 10 --repeats 2 --models rf rf_modes --json cv.json
+
+The CSV is read once (feature and failure label columns only). Fold indices are
+stratified on Machine failure and cached under models/cv_folds/, keyed by
+the labels, fold count, repeats and seed, so later runs on the same data
+skip the split. Each (model, fold) fit runs as one task in a process pool.
+The workers receive the data once, at startup. Every test fold is held out
+of its fit, unlike compare_models.py, which scores the RF partly on its
+own training rows.
+
+Models are built by the same factories as the training scripts
+(model_service.build_isolation_forest, supervised_train.build_classifier),
+so a training change is evaluated as trained.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.cluster import KMeans
+from sklearn.metrics import f1_score, precision_score, recall_score, roc_auc_score, silhouette_score
+from sklearn.model_selection import RepeatedStratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+try:
+    from .model_service import FAILURE_LABELS, FEATURE_COLUMNS, build_isolation_forest
+    from .supervised_train import build_classifier
+except ImportError:  # run as a script from src/
+    from model_service import FAILURE_LABELS, FEATURE_COLUMNS, build_isolation_forest
+    from supervised_train import build_classifier
+
+DATA_PATH = os.path.join("data", "ai4i2020.csv")
+LABEL = "Machine failure"
+FOLD_CACHE_DIR = os.path.join("models", "cv_folds")
+MODELS = ("iforest", "rf", "rf_modes", "kmeans")
+N_CLUSTERS = 4  # as in train_kmeans_on_ai4i.py
+SILHOUETTE_SAMPLE = 2000
+
+_X: np.ndarray | None = None  # per worker process
+_y: np.ndarray | None = None
+_Y_modes: np.ndarray | None = None  # one column per FAILURE_LABELS entry
+
+
+def fold_indices(y: np.ndarray, n_splits: int, repeats: int, seed: int,
+                 cache_dir: str = FOLD_CACHE_DIR) -> list[np.ndarray]:
+    """Test-row indices of every fold, loaded from the cache when the labels are unchanged."""
+    key = hashlib.sha1(np.ascontiguousarray(y).tobytes()).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"{key}_k{n_splits}_r{repeats}_s{seed}.npz")
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return [cached[f"fold_{i}"] for i in range(len(cached.files))]
+    splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=repeats, random_state=seed)
+    folds = [test for _, test in splitter.split(np.zeros(len(y)), y)]
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez_compressed(path, **{f"fold_{i}": test for i, test in enumerate(folds)})
+    return folds
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, Y_modes: np.ndarray) -> None:
+    global _X, _y, _Y_modes
+    _X, _y, _Y_modes = X, y, Y_modes
+
+
+def _classification_metrics(y_true: np.ndarray, y_pred: np.ndarray, score: np.ndarray) -> dict[str, float]:
+    return {
+        "precision": precision_score(y_true, y_pred, zero_division=0),
+        "recall": recall_score(y_true, y_pred, zero_division=0),
+        "f1": f1_score(y_true, y_pred, zero_division=0),
+        "roc_auc": roc_auc_score(y_true, score),
+    }
+
+
+def evaluate_fold(model: str, test: np.ndarray, n_jobs: int = 1) -> dict[str, float]:
+    """Fit ``model`` on every row outside ``test`` and score it on ``test``."""
+    train = np.ones(len(_X), dtype=bool)
+    train[test] = False
+    X_train, X_test, y_test = _X[train], _X[test], _y[test]
+    t0 = time.perf_counter()
+
+    if model == "iforest":
+        scaler = StandardScaler().fit(X_train)
+        forest = build_isolation_forest().set_params(n_jobs=n_jobs).fit(scaler.transform(X_train))
+        X_scaled = scaler.transform(X_test)
+        # decision_function is higher for normal rows, so negate it to rank failures first
+        metrics = _classification_metrics(
+            y_test, (forest.predict(X_scaled) == -1).astype(int), -forest.decision_function(X_scaled)
+        )
+    elif model == "rf":
+        clf = build_classifier().set_params(n_jobs=n_jobs).fit(X_train, _y[train])
+        metrics = _classification_metrics(y_test, clf.predict(X_test), clf.predict_proba(X_test)[:, 1])
+    elif model == "rf_modes":
+        clf = build_classifier(modes=True).set_params(n_jobs=n_jobs).fit(X_train, _Y_modes[train])
+        col = FAILURE_LABELS.index(LABEL)
+        metrics = _classification_metrics(
+            y_test, clf.predict(X_test)[:, col], clf.predict_proba(X_test)[col][:, 1]
+        )
+    elif model == "kmeans":
+        scaler = StandardScaler().fit(X_train)
+        kmeans = KMeans(n_clusters=N_CLUSTERS, init="k-means++", max_iter=300, random_state=42, n_init=10)
+        kmeans.fit(scaler.transform(X_train))
+        X_scaled = scaler.transform(X_test)
+        labels = kmeans.predict(X_scaled)
+        metrics = {
+            "silhouette": silhouette_score(X_scaled, labels, sample_size=min(SILHOUETTE_SAMPLE, len(X_test)),
+                                           random_state=42),
+            "inertia_per_row": -kmeans.score(X_scaled) / len(X_test),
+        }
+    else:
+        raise ValueError(f"Unknown model '{model}'")
+
+    metrics["fit_score_seconds"] = time.perf_counter() - t0
+    return {name: float(value) for name, value in metrics.items()}
+
+
+def summarize(values: list[float], confidence: float = 0.95) -> dict[str, float]:
+    """Mean, std and Student-t confidence interval over per-fold values."""
+    arr = np.asarray(values, dtype=float)
+    mean = float(arr.mean())
+    std = float(arr.std(ddof=1)) if len(arr) > 1 else 0.0
+    half = float(stats.t.ppf((1 + confidence) / 2, len(arr) - 1) * std / np.sqrt(len(arr))) if len(arr) > 1 else 0.0
+    return {"mean": mean, "std": std, "ci_low": mean - half, "ci_high": mean + half}
+
+
+def cross_validate(
+    data_path: str = DATA_PATH,
+    models: tuple[str, ...] = MODELS,
+    n_splits: int = 5,
+    repeats: int = 1,
+    seed: int = 42,
+    workers: int = os.cpu_count() or 1,
+) -> dict[str, Any]:
+    df = pd.read_csv(data_path, usecols=FEATURE_COLUMNS + FAILURE_LABELS)
+    X = df[FEATURE_COLUMNS].to_numpy(dtype=float)
+    y = df[LABEL].to_numpy()
+    Y_modes = df[FAILURE_LABELS].to_numpy()
+    folds = fold_indices(y, n_splits, repeats, seed)
+
+    tasks = [(model, i) for model in models for i in range(len(folds))]
+    per_fold: dict[str, list[dict[str, float]]] = {model: [] for model in models}
+    t0 = time.perf_counter()
+    if workers > 1:
+        # one model fit per worker at a time; the pool already uses every core
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(X, y, Y_modes)) as pool:
+            futures = [(model, pool.submit(evaluate_fold, model, folds[i])) for model, i in tasks]
+            for model, future in futures:
+                per_fold[model].append(future.result())
+    else:
+        _init_worker(X, y, Y_modes)
+        for model, i in tasks:
+            per_fold[model].append(evaluate_fold(model, folds[i], n_jobs=-1))
+
+    return {
+        "data": data_path,
+        "rows": len(y),
+        "folds": n_splits,
+        "repeats": repeats,
+        "seed": seed,
+        "elapsed_seconds": time.perf_counter() - t0,
+        "models": {
+            model: {metric: summarize([fold[metric] for fold in results]) for metric in results[0]}
+            for model, results in per_fold.items()
+        },
+        "per_fold": per_fold,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=list(MODELS))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=1, help="repeat the K-fold split with new shuffles")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes fitting folds in parallel (1 fits in this process)")
+    parser.add_argument("--json", metavar="PATH", help="also write the full results as JSON")
+    args = parser.parse_args()
+
+    results = cross_validate(args.data, tuple(args.models), args.folds, args.repeats, args.seed, args.workers)
+    n = args.folds * args.repeats
+    print(f"{results['rows']} rows, {n} folds, {results['elapsed_seconds']:.1f}s\n")
+    print(f"{'model':<10}{'metric':<20}{'mean':>9}{'std':>9}{'95% CI':>20}")
+    for model, metrics in results["models"].items():
+        for metric, s in metrics.items():
+            ci = f"[{s['ci_low']:.3f}, {s['ci_high']:.3f}]"
+            print(f"{model:<10}{metric:<20}{s['mean']:>9.3f}{s['std']:>9.3f}{ci:>20}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class SQLitePool:
+    """Reusable SQLite connections, up to ``size`` per database file.
+
+    Connections are opened lazily on first use and handed to one borrower
+    at a time, so they can move between threadpool threads safely. Callers
+    that would exceed ``size`` wait up to ``timeout`` seconds for a free one.
+    """
+
+    def __init__(self, size: int = 4, timeout: float = 5.0):
+        self.size = size
+        self.timeout = timeout
+        self._idle: dict[str, queue.LifoQueue] = {}
+        self._opened: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _checkout(self, path: str) -> sqlite3.Connection:
+        with self._lock:
+            idle = self._idle.setdefault(path, queue.LifoQueue())
+            try:
+                return idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._opened.get(path, 0) < self.size:
+                self._opened[path] = self._opened.get(path, 0) + 1
+                conn = sqlite3.connect(path, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                return conn
+        try:
+            return idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free connection to {path} after {self.timeout:g}s") from None
+
+    @contextmanager
+    def connection(self, path: str) -> Iterator[sqlite3.Connection]:
+        conn = self._checkout(path)
+        try:
+            yield conn
+        except sqlite3.Error:
+            # don't hand a connection in an unknown state to the next caller
+            conn.close()
+            with self._lock:
+                self._opened[path] -= 1
+            raise
+        else:
+            self._idle[path].put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            for path, idle in self._idle.items():
+                while True:
+                    try:
+                        idle.get_nowait().close()
+                    except queue.Empty:
+                        break
+                    self._opened[path] -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "databases": {
+                path: {"open": self._opened.get(path, 0), "idle": idle.qsize()}
+                for path, idle in self._idle.items()
+            },
+        }
@@ -0,0 +1,193 @@
+"""
+Streaming feature drift against the distribution the models were fit on.
+
+Bin edges come from the reference CSV's per-feature quantiles, so each
+reference bin holds about the same share of rows. Every live reading bumps
+one counter per feature in the current time window (a bisect over the fixed
+edges, so O(1) per reading), and a running total over the retained windows
+is kept as windows rotate in and out. PSI and a binned two-sample KS
+statistic are computed from those counts only when stats are read, at
+O(features * bins) cost.
+"""
+import bisect
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .model_service import FEATURE_COLUMNS
+except ImportError:  # loaded top-level by src/main.py
+    from model_service import FEATURE_COLUMNS
+
+REFERENCE_PATH = os.path.join("data", "ai4i_training_phys.csv")
+PSI_EPSILON = 1e-4  # floor for empty-bin shares, keeps PSI finite
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+KS_ALPHA_COEFF = 1.358  # two-sample KS critical value coefficient at alpha = 0.05
+
+
+def population_stability_index(expected: np.ndarray, counts: np.ndarray) -> float:
+    actual = np.maximum(counts / counts.sum(), PSI_EPSILON)
+    expected = np.maximum(expected, PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def binned_ks(expected: np.ndarray, counts: np.ndarray) -> float:
+    """Largest CDF gap at the bin edges; a lower bound of the exact KS statistic."""
+    return float(np.max(np.abs(np.cumsum(counts / counts.sum()) - np.cumsum(expected))))
+
+
+def psi_status(psi: float) -> str:
+    if psi >= PSI_SIGNIFICANT:
+        return "significant"
+    if psi >= PSI_MODERATE:
+        return "moderate"
+    return "stable"
+
+
+class _Window:
+    __slots__ = ("start", "count", "counts")
+
+    def __init__(self, start: float, n_bins: list[int]):
+        self.start = start
+        self.count = 0
+        self.counts = [[0] * n for n in n_bins]
+
+
+class DriftMonitor:
+    """Fixed-bin histograms of live readings per feature, over rotating time windows."""
+
+    def __init__(
+        self,
+        reference_path: str = REFERENCE_PATH,
+        features: Sequence[str] = FEATURE_COLUMNS,
+        bins: int = 20,
+        window_seconds: float = 300.0,
+        windows: int = 12,
+        min_count: int = 50,
+    ):
+        self.reference_path = reference_path
+        self.features = list(features)
+        self.bins = bins
+        self.window_seconds = window_seconds
+        self.min_count = min_count
+        self.reference_rows = 0
+        self.edges: list[list[float]] = []
+        self.expected: list[np.ndarray] = []
+        self._windows: deque[_Window] = deque(maxlen=windows)
+        self._total: _Window | None = None
+        self._window_no = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._total is not None
+
+    def load_reference(self) -> bool:
+        """Fit bin edges and reference shares; False (monitor stays off) when the CSV is missing."""
+        if not os.path.exists(self.reference_path):
+            print(f"Drift monitor disabled: {self.reference_path} not found")
+            return False
+        df = pd.read_csv(self.reference_path, usecols=self.features)
+        edges, expected = [], []
+        for name in self.features:
+            values = df[name].to_numpy(dtype=float)
+            # interior quantile edges; repeated values collapse into one bin
+            cuts = np.unique(np.quantile(values, np.linspace(0, 1, self.bins + 1)[1:-1]))
+            idx = np.searchsorted(cuts, values, side="right")  # same binning as bisect_right
+            edges.append(cuts.tolist())
+            expected.append(np.bincount(idx, minlength=len(cuts) + 1) / len(values))
+        with self._lock:
+            self.edges, self.expected = edges, expected
+            self.reference_rows = len(df)
+            self._windows.clear()
+            self._window_no = 0
+            self._total = _Window(0.0, [len(e) + 1 for e in edges])
+        return True
+
+    def _rotate(self, now: float) -> _Window:
+        window_no = int(now // self.window_seconds)
+        if self._windows and window_no <= self._window_no:
+            return self._windows[-1]
+        n_bins = [len(e) + 1 for e in self.edges]
+        # a gap longer than the retention pushes at most maxlen empty windows
+        steps = 1 if not self._windows else min(window_no - self._window_no, self._windows.maxlen)
+        for i in range(steps):
+            if len(self._windows) == self._windows.maxlen:
+                old = self._windows.popleft()
+                self._total.count -= old.count
+                for total, counts in zip(self._total.counts, old.counts):
+                    for b, c in enumerate(counts):
+                        total[b] -= c
+            start = (window_no - steps + 1 + i) * self.window_seconds
+            self._windows.append(_Window(start, n_bins))
+        self._window_no = window_no
+        self._total.start = self._windows[0].start
+        return self._windows[-1]
+
+    def observe(self, values: Sequence[float], now: float | None = None) -> None:
+        """Count one reading (FEATURE_COLUMNS order); no-op until the reference is loaded."""
+        if self._total is None or not all(math.isfinite(v) for v in values):
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            window = self._rotate(now)
+            window.count += 1
+            self._total.count += 1
+            for f, v in enumerate(values):
+                b = bisect.bisect_right(self.edges[f], v)
+                window.counts[f][b] += 1
+                self._total.counts[f][b] += 1
+
+    def _scores(self, window: _Window) -> dict[str, Any]:
+        out: dict[str, Any] = {"start": window.start, "count": window.count}
+        if window.count < self.min_count:
+            out["features"] = None  # too few readings for stable scores
+            return out
+        # two-sample KS threshold with the reference as the second sample
+        ks_critical = KS_ALPHA_COEFF * math.sqrt(
+            (window.count + self.reference_rows) / (window.count * self.reference_rows)
+        )
+        features = {}
+        for name, expected, counts in zip(self.features, self.expected, window.counts):
+            counts = np.asarray(counts, dtype=float)
+            psi = population_stability_index(expected, counts)
+            ks = binned_ks(expected, counts)
+            features[name] = {
+                "psi": round(psi, 4),
+                "ks": round(ks, 4),
+                "ks_drift": ks > ks_critical,
+                "status": psi_status(psi),
+            }
+        out["ks_critical"] = round(ks_critical, 4)
+        out["features"] = features
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        if self._total is None:
+            return {"enabled": False, "reference": self.reference_path}
+        with self._lock:
+            self._rotate(time.time())  # idle periods still age windows out
+            windows = [self._scores(w) for w in self._windows]
+            retained = self._scores(self._total)
+        drifting = [
+            name for name, s in (retained["features"] or {}).items() if s["status"] == "significant" or s["ks_drift"]
+        ]
+        return {
+            "enabled": True,
+            "reference": self.reference_path,
+            "reference_rows": self.reference_rows,
+            "bins": self.bins,
+            "window_seconds": self.window_seconds,
+            "windows": self._windows.maxlen,
+            "retained": retained,
+            "current": windows[-1],
+            "history": windows,
+            "drifting": drifting,
+        }
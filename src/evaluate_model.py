@@ -9,7 +9,7 @@ def main() -> None:
     df = pd.read_csv(DATA_PATH)
     y_true = df["Machine failure"].values
     model, scaler = load_model()
-    df_pred = predict_batch(df, model, scaler)
+    df_pred = predict_batch(df, model, scaler, copy=False)
     y_pred = df_pred["is_anomaly"].values
     print(classification_report(y_true, y_pred))
 
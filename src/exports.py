@@ -0,0 +1,195 @@
+import csv
+import io
+import sqlite3
+import zlib
+from typing import Any, Iterator, Mapping, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def iter_query_chunks(
+    db_path: str,
+    sql: str,
+    params: Sequence[Any] = (),
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[tuple[list[str], list[tuple]]]:
+    """Yield (column names, rows) from a SQLite cursor ``chunk_rows`` at a time."""
+    # The streaming response may resume this generator from different threadpool threads.
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    try:
+        cursor = conn.execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        rows = cursor.fetchmany(chunk_rows)
+        yield columns, rows  # always at least once so empty exports still carry a header
+        while rows:
+            rows = cursor.fetchmany(chunk_rows)
+            if rows:
+                yield columns, rows
+    finally:
+        conn.close()
+
+
+def _gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _csv_stream(chunks: Iterator[tuple[list[str], list[tuple]]]) -> Iterator[bytes]:
+    header_written = False
+    for columns, rows in chunks:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        yield buf.getvalue().encode()
+
+
+def stream_csv(chunks: Iterator[tuple[list[str], list[tuple]]], gzip: bool = False) -> Iterator[bytes]:
+    """CSV bytes, one piece per cursor chunk, optionally gzip-compressed on the fly."""
+    stream = _csv_stream(chunks)
+    return _gzip_stream(stream) if gzip else stream
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose buffered bytes can be taken after each row group."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def arrow_type(sql_type: str):
+    """pyarrow type for a SQLite declared column type, following SQLite's affinity rules."""
+    import pyarrow as pa
+
+    sql_type = sql_type.upper()
+    if "INT" in sql_type:
+        return pa.int64()
+    if any(t in sql_type for t in ("CHAR", "CLOB", "TEXT")):
+        return pa.string()
+    if not sql_type or "BLOB" in sql_type:
+        return pa.binary()
+    return pa.float64()  # REAL, and NUMERIC stored as numbers
+
+
+def table_column_types(db_path: str, table: str) -> dict[str, str]:
+    """Declared type of every column of ``table``, for ``stream_parquet``."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+    finally:
+        conn.close()
+
+
+def _parquet_schema(columns: list[str], rows: list[tuple], column_types: Mapping[str, str]):
+    import pyarrow as pa
+
+    fields = []
+    for i, name in enumerate(columns):
+        if name in column_types:
+            dtype = arrow_type(column_types[name])
+        else:
+            dtype = pa.array([row[i] for row in rows]).type
+            if pa.types.is_null(dtype):  # no values to infer from; text holds anything SQLite returns
+                dtype = pa.string()
+        fields.append(pa.field(name, dtype))
+    return pa.schema(fields)
+
+
+def stream_parquet(
+    chunks: Iterator[tuple[list[str], list[tuple]]],
+    column_types: Mapping[str, str] | None = None,
+) -> Iterator[bytes]:
+    """Parquet bytes, one row group per cursor chunk. Requires pyarrow.
+
+    The schema is fixed before the first row group is written, from the
+    declared SQL types in ``column_types`` and otherwise from the first
+    chunk's values, so a column that is all NULL in the first chunk cannot
+    make later chunks fail mid-download.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _DrainableSink()
+    writer = schema = None
+    try:
+        for columns, rows in chunks:
+            if writer is None:
+                schema = _parquet_schema(columns, rows, column_types or {})
+                writer = pq.ParquetWriter(sink, schema, compression="snappy")
+            values = list(zip(*rows)) if rows else [() for _ in columns]
+            # inferred per chunk, then cast: NULL-only and int-for-text columns convert cleanly
+            arrays = [pa.array(col).cast(field.type) for col, field in zip(values, schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        if writer is not None:
+            writer.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_response(
+    sql: str,
+    params: tuple,
+    name: str,
+    format: str,
+    gzip: bool,
+    db_path: str,
+    column_types: Mapping[str, str] | None = None,
+) -> StreamingResponse:
+    """Stream a query result as a CSV (optionally gzipped) or Parquet download.
+
+    ``column_types`` maps result columns to their declared SQL types, which
+    fix the Parquet schema (see ``stream_parquet``).
+    """
+    chunks = iter_query_chunks(db_path, sql, params)
+    if format == "parquet":
+        if not parquet_available():
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+        return StreamingResponse(
+            stream_parquet(chunks, column_types),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f'attachment; filename="{name}.parquet"'},
+        )
+    filename = f"{name}.csv.gz" if gzip else f"{name}.csv"
+    return StreamingResponse(
+        stream_csv(chunks, gzip=gzip),
+        media_type="application/gzip" if gzip else "text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
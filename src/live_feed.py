@@ -0,0 +1,67 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Iterable
+
+
+def encode_event(event: str, data: Any) -> str:
+    """Serialize one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class LiveFeed:
+    """Fan-out hub for Server-Sent Events.
+
+    The producer encodes each event once; every subscriber only gets the
+    already-encoded frame pushed onto its own bounded queue. A slow client
+    drops its oldest frames instead of holding back everyone else.
+    """
+
+    def __init__(self, queue_size: int = 32, keepalive: float = 15.0):
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self._subscribers: dict[asyncio.Queue, frozenset[str]] = {}
+        self._state: dict[str, dict[str, Any]] = {}
+
+    def subscriber_count(self, topic: str | None = None) -> int:
+        if topic is None:
+            return len(self._subscribers)
+        return sum(1 for topics in self._subscribers.values() if topic in topics)
+
+    def publish(self, topic: str, data: Any) -> None:
+        frame = encode_event(topic, data)
+        for queue, topics in self._subscribers.items():
+            if topic not in topics:
+                continue
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    def publish_changes(self, topic: str, data: dict[str, Any]) -> None:
+        """Publish only the top-level keys whose value changed since the last call."""
+        previous = self._state.get(topic, {})
+        delta = {k: v for k, v in data.items() if previous.get(k) != v}
+        self._state[topic] = dict(data)
+        if delta:
+            self.publish(topic, delta)
+
+    async def stream(
+        self,
+        topics: Iterable[str],
+        initial: Iterable[str] = (),
+    ) -> AsyncIterator[str]:
+        """Yield SSE frames for one client until it disconnects."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[queue] = frozenset(topics)
+        try:
+            for frame in initial:
+                yield frame
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection.
+                    yield ": keepalive\n\n"
+                    continue
+                yield frame
+        finally:
+            self._subscribers.pop(queue, None)
@@ -0,0 +1,322 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import joblib
+import numpy as np
+
+try:
+    from .model_service import FAILURE_LABELS, failure_mode_probabilities, train_and_save_model
+    from .online_scaler import OnlineScaler
+    from .operating_mode import CentroidIndex, ModeLookupGrid
+    from .temporal_features import RollingWindow
+except ImportError:  # loaded top-level by src/main.py
+    from model_service import FAILURE_LABELS, failure_mode_probabilities, train_and_save_model
+    from online_scaler import OnlineScaler
+    from operating_mode import CentroidIndex, ModeLookupGrid
+    from temporal_features import RollingWindow
+
+MODEL_DIR = "models"
+ARTIFACTS = {
+    "iforest": "isolation_forest.pkl",
+    "scaler": "scaler.pkl",
+    "rf_model": "rf_supervised.pkl",
+    "rf_temporal": "rf_supervised_temporal.pkl",
+    "rf_modes": "rf_failure_modes.pkl",
+    "kmeans": "kmeans_clustering.pkl",
+    "kmeans_scaler": "scaler_kmeans.pkl",
+}
+REQUIRED_ARTIFACTS = ("iforest", "scaler")
+
+# Same readings as scripts/verify_test_cases.py, spanning normal to critical.
+CANARY_READINGS = np.array([
+    [1500.0, 310.0, 40.0, 10.0],
+    [1500.0, 345.0, 40.0, 10.0],
+    [1500.0, 310.0, 90.0, 10.0],
+    [1500.0, 310.0, 40.0, 230.0],
+    [2900.0, 340.0, 80.0, 250.0],
+])
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """One consistent set of artifacts. Handlers hold a reference for the whole request."""
+    version: int
+    fingerprint: tuple
+    loaded_at: float
+    iforest: Any
+    scaler: Any
+    rf_model: Any = None
+    rf_temporal: Any = None
+    rf_modes: Any = None
+    kmeans: Any = None
+    kmeans_scaler: Any = None
+    kmeans_index: CentroidIndex | None = None
+    online_scaler: OnlineScaler | None = None
+    online_kmeans_scaler: OnlineScaler | None = None
+    kmeans_grid: ModeLookupGrid | None = None
+
+    def score_batch(self, X: np.ndarray, mode: str) -> dict[str, np.ndarray]:
+        """Vectorized v2 scoring of ``X`` (rows in FEATURE_COLUMNS order), one model call per step.
+
+        Raises LookupError in supervised mode when the bundle has no Random Forest.
+        """
+        columns: dict[str, np.ndarray] = {}
+        if mode == "unsupervised":
+            X_scaled = self.online_scaler.current.scaler.transform(X)
+            columns["is_anomaly"] = (self.iforest.predict(X_scaled) == -1).astype(np.int8)
+            columns["anomaly_score"] = self.iforest.decision_function(X_scaled)
+        elif self.rf_model is None and self.rf_modes is None:
+            raise LookupError("Random Forest model unavailable")
+        else:
+            # the balanced binary forest sets the alarm when present; the
+            # failure-mode forest adds per-mode probabilities
+            probs = failure_mode_probabilities(X, self.rf_modes) if self.rf_modes is not None else None
+            if self.rf_model is not None:
+                proba = self.rf_model.predict_proba(X)
+                columns["is_anomaly"] = self.rf_model.classes_[proba.argmax(axis=1)].astype(np.int8)
+                columns["anomaly_score"] = proba[:, 1]
+            else:
+                columns["is_anomaly"] = (probs[:, 0] > 0.5).astype(np.int8)
+                columns["anomaly_score"] = probs[:, 0]
+            if probs is not None:
+                for i, label in enumerate(FAILURE_LABELS[1:], start=1):
+                    columns[label] = probs[:, i]
+        if self.kmeans_index is not None:
+            kmeans_scaled = self.online_kmeans_scaler.current.transform(X)
+            cluster_ids, confidences = self.kmeans_index.assign_with_confidence(kmeans_scaled)
+            columns["operating_mode_cluster"] = cluster_ids.astype(np.int16)
+            columns["cluster_confidence"] = confidences
+        return columns
+
+
+class ModelRegistry:
+    """Watches ``models/`` and atomically swaps in validated ModelBundles.
+
+    Loading and canary validation happen off the request path; the swap is
+    a single reference assignment, so requests that already grabbed
+    ``current`` finish on the version they started with.
+
+    The watcher only loads a set of files once their fingerprint has not
+    changed for a whole poll, and a load is discarded if any file changed
+    while it ran, so a deploy copying artifacts one by one is never picked
+    up halfway (an iforest/scaler mismatch would pass the canary checks).
+
+    With ``train_if_missing`` a model_dir without the IsolationForest or its
+    scaler is trained once from the default CSV, as load_model() does.
+    """
+
+    def __init__(
+        self,
+        model_dir: str = MODEL_DIR,
+        poll_interval: float = 5.0,
+        canary: np.ndarray = CANARY_READINGS,
+        kmeans_grid: bool = False,
+        train_if_missing: bool = False,
+    ):
+        self.model_dir = model_dir
+        self.train_if_missing = train_if_missing
+        self.poll_interval = poll_interval
+        self.canary = canary
+        self.kmeans_grid = kmeans_grid
+        self.last_error: str | None = None
+        self._current: ModelBundle | None = None
+        self._version = 0
+        self._attempted: tuple | None = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._listeners: list[Callable[[ModelBundle], None]] = []
+
+    @property
+    def current(self) -> ModelBundle:
+        if self._current is None:
+            self.reload()
+        if self._current is None:
+            raise RuntimeError(f"No valid models in {self.model_dir}: {self.last_error}")
+        return self._current
+
+    def on_swap(self, listener: Callable[[ModelBundle], None]) -> None:
+        """Register a callback run after every successful swap (e.g. cache invalidation)."""
+        self._listeners.append(listener)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.model_dir, ARTIFACTS[name])
+
+    def fingerprint(self) -> tuple:
+        entries = []
+        for name in ARTIFACTS:
+            try:
+                st = os.stat(self._path(name))
+                entries.append((name, st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                entries.append((name, None, None))
+        return tuple(entries)
+
+    def _load(self, fingerprint: tuple) -> ModelBundle:
+        loaded: dict[str, Any] = {}
+        for name in ARTIFACTS:
+            path = self._path(name)
+            if not os.path.exists(path):
+                if name in REQUIRED_ARTIFACTS:
+                    raise FileNotFoundError(path)
+                loaded[name] = None
+                continue
+            loaded[name] = joblib.load(path)
+
+        kmeans = loaded["kmeans"]
+        kmeans_scaler = loaded["kmeans_scaler"]
+        has_kmeans = kmeans is not None and kmeans_scaler is not None
+        kmeans_index = CentroidIndex.from_model(kmeans) if has_kmeans else None
+        online_kmeans_scaler = OnlineScaler.from_scaler(
+            kmeans_scaler, max_count=100_000, publish_every=1_000
+        ) if has_kmeans else None
+        kmeans_grid = None
+        if has_kmeans and self.kmeans_grid:
+            kmeans_grid = ModeLookupGrid(
+                kmeans_scaler, kmeans_index, scaler_version=online_kmeans_scaler.current.version
+            )
+        return ModelBundle(
+            version=self._version + 1,
+            fingerprint=fingerprint,
+            loaded_at=time.time(),
+            iforest=loaded["iforest"],
+            scaler=loaded["scaler"],
+            rf_model=loaded["rf_model"],
+            rf_temporal=loaded["rf_temporal"],
+            rf_modes=loaded["rf_modes"],
+            kmeans=kmeans if has_kmeans else None,
+            kmeans_scaler=kmeans_scaler if has_kmeans else None,
+            kmeans_index=kmeans_index,
+            online_scaler=OnlineScaler.from_scaler(
+                loaded["scaler"], max_count=100_000, publish_every=1_000
+            ),
+            online_kmeans_scaler=online_kmeans_scaler,
+            kmeans_grid=kmeans_grid,
+        )
+
+    def validate(self, bundle: ModelBundle) -> None:
+        """Run the canary set through every model; raise ValueError on bad output."""
+        X = self.canary
+        X_scaled = bundle.scaler.transform(X)
+        # trees route NaN like a missing value, so a broken scaler would still give finite scores
+        if not np.all(np.isfinite(X_scaled)):
+            raise ValueError("Scaler canary output is not finite")
+        scores = bundle.iforest.decision_function(X_scaled)
+        preds = bundle.iforest.predict(X_scaled)
+        if scores.shape != (len(X),) or not np.all(np.isfinite(scores)):
+            raise ValueError("IsolationForest canary scores are not finite")
+        if not set(np.unique(preds)) <= {-1, 1}:
+            raise ValueError("IsolationForest canary predictions outside {-1, 1}")
+
+        if bundle.rf_model is not None:
+            probs = bundle.rf_model.predict_proba(X)
+            if probs.shape[0] != len(X) or not np.all((probs >= 0) & (probs <= 1)):
+                raise ValueError("RandomForest canary probabilities outside [0, 1]")
+
+        if bundle.rf_temporal is not None:
+            # canary readings as one machine's stream, through the serving feature code
+            window = RollingWindow(X.shape[1])
+            X_temporal = np.array([np.concatenate((x, window.update(x))) for x in X])
+            probs = bundle.rf_temporal.predict_proba(X_temporal)
+            if probs.shape[0] != len(X) or not np.all((probs >= 0) & (probs <= 1)):
+                raise ValueError("Temporal RandomForest canary probabilities outside [0, 1]")
+
+        if bundle.rf_modes is not None:
+            per_label = bundle.rf_modes.predict_proba(X)
+            if len(per_label) != len(FAILURE_LABELS) or any(
+                p.shape[0] != len(X) or not np.all((p >= 0) & (p <= 1)) for p in per_label
+            ):
+                raise ValueError(f"Failure-mode forest must give {len(FAILURE_LABELS)} label probabilities")
+
+        if bundle.kmeans_index is not None:
+            labels, dists = bundle.kmeans_index.assign(bundle.kmeans_scaler.transform(X))
+            if labels.max() >= bundle.kmeans.n_clusters or not np.all(np.isfinite(dists)):
+                raise ValueError("K-Means canary assignment is invalid")
+            if bundle.kmeans_grid is not None:
+                grid_labels, _, hit = bundle.kmeans_grid.lookup_batch(X)
+                if np.any(grid_labels[hit] != labels[hit]):
+                    raise ValueError("K-Means lookup grid disagrees with exact assignment")
+
+    def _train_missing(self) -> None:
+        missing = [name for name in REQUIRED_ARTIFACTS if not os.path.exists(self._path(name))]
+        if missing:
+            print(f"Model files not found ({', '.join(missing)}). Training new model...")
+            try:
+                train_and_save_model(model_path=self._path("iforest"), scaler_path=self._path("scaler"))
+            except Exception as e:  # reported through last_error by the load that follows
+                print(f"Training failed: {type(e).__name__}: {e}")
+
+    def reload(self, force: bool = False, settled: tuple | None = None) -> bool:
+        """Load, validate and swap if artifacts changed. Returns True on swap.
+
+        ``settled`` is the fingerprint the caller saw one poll earlier; the
+        reload is skipped unless the files still match it.
+        """
+        with self._reload_lock:
+            if self._current is None and self.train_if_missing:
+                self._train_missing()
+            fingerprint = self.fingerprint()
+            if settled is not None and fingerprint != settled:
+                return False
+            if not force and fingerprint in (self._attempted, getattr(self._current, "fingerprint", None)):
+                return False
+            try:
+                bundle = self._load(fingerprint)
+                if self.fingerprint() != fingerprint:
+                    # files changed mid-load: retry once they settle, not now
+                    return False
+                self._attempted = fingerprint
+                self.validate(bundle)
+            except Exception as e:
+                self._attempted = fingerprint
+                # Keep serving the previous version; a later write changes the fingerprint.
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"Model reload rejected: {self.last_error}")
+                return False
+            self._version = bundle.version
+            self._current = bundle
+            self.last_error = None
+        print(f"Model bundle v{bundle.version} loaded from {self.model_dir}")
+        for listener in self._listeners:
+            listener(bundle)
+        return True
+
+    def _watch(self) -> None:
+        previous = self.fingerprint()
+        while not self._stop.wait(self.poll_interval):
+            fingerprint = self.fingerprint()
+            # a fingerprint unchanged for a whole poll means the deploy finished copying
+            if fingerprint == previous:
+                self.reload(settled=fingerprint)
+            previous = fingerprint
+
+    def start(self) -> None:
+        """Start the background watcher thread (idempotent)."""
+        if self._current is None:
+            self.reload()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval)
+
+    def status(self) -> dict[str, Any]:
+        bundle = self._current
+        return {
+            "version": bundle.version if bundle else None,
+            "loaded_at": bundle.loaded_at if bundle else None,
+            "unsupervised_model_loaded": bool(bundle and bundle.iforest is not None),
+            "supervised_model_loaded": bool(bundle and bundle.rf_model is not None),
+            "temporal_model_loaded": bool(bundle and bundle.rf_temporal is not None),
+            "failure_mode_model_loaded": bool(bundle and bundle.rf_modes is not None),
+            "kmeans_model_loaded": bool(bundle and bundle.kmeans is not None),
+            "watching": self._thread is not None and self._thread.is_alive(),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,202 @@
+import dataclasses
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable
+
+try:
+    from .model_registry import ARTIFACTS, REQUIRED_ARTIFACTS, ModelBundle, ModelRegistry
+except ImportError:  # loaded top-level by src/main.py
+    from model_registry import ARTIFACTS, REQUIRED_ARTIFACTS, ModelBundle, ModelRegistry
+
+SEGMENT_DIR = os.path.join("models", "segments")
+# Artifact groups a segment may leave out and borrow from the global bundle
+FALLBACK_FIELDS = {
+    "kmeans": ("kmeans", "kmeans_scaler", "kmeans_index", "online_kmeans_scaler", "kmeans_grid"),
+    "random_forest": ("rf_model", "rf_temporal", "rf_modes"),
+}
+
+
+def missing_groups(bundle: ModelBundle) -> list[str]:
+    missing = []
+    if bundle.kmeans_index is None:
+        missing.append("kmeans")
+    if bundle.rf_model is None and bundle.rf_modes is None:
+        missing.append("random_forest")
+    return missing
+
+
+def with_fallback(segment_bundle: ModelBundle, base: ModelBundle | None) -> ModelBundle:
+    """``segment_bundle`` with its missing artifact groups taken from ``base``.
+
+    The merged bundle gets a fresh ``loaded_at``, so cache keys built from it
+    change whenever either side is reloaded.
+    """
+    groups = missing_groups(segment_bundle)
+    if not groups or base is None:
+        return segment_bundle
+    borrowed = {field: getattr(base, field) for group in groups for field in FALLBACK_FIELDS[group]}
+    return dataclasses.replace(segment_bundle, loaded_at=time.time(), **borrowed)
+
+
+def segment_candidates(site: str | None, asset_type: str | None) -> list[str]:
+    """Segment names to try for a reading, most specific first."""
+    candidates = []
+    if site is not None and asset_type is not None:
+        candidates.append(f"site={site}/type={asset_type}")
+    if site is not None:
+        candidates.append(f"site={site}")
+    if asset_type is not None:
+        candidates.append(f"type={asset_type}")
+    return candidates
+
+
+class ModelRouter:
+    """Per-segment ModelBundles loaded on demand into a size-bounded LRU.
+
+    A segment is a directory under ``root`` holding the same artifacts as
+    ``models/`` (at least the IsolationForest and its scaler), named
+    Hive-style: ``type=L``, ``site=plant-a`` or ``site=plant-a/type=L``.
+    Readings route to the most specific segment that exists and to the
+    global bundle otherwise. A segment without K-Means or a Random Forest
+    uses the global bundle's (``fallback``); ``rebase`` re-merges resident
+    segments when the global bundle is swapped.
+
+    Resident bundles are charged their artifact sizes on disk; the least
+    recently used are evicted once the total passes ``max_bytes``. Concurrent
+    requests for a segment that is not resident share a single load.
+    """
+
+    def __init__(
+        self,
+        root: str = SEGMENT_DIR,
+        max_bytes: int = 512 * 2**20,
+        kmeans_grid: bool = False,
+        fallback: Callable[[], ModelBundle] | None = None,
+    ):
+        self.root = root
+        self.fallback = fallback
+        self.max_bytes = max_bytes
+        self.kmeans_grid = kmeans_grid
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+        self.available: frozenset[str] = frozenset()
+        self.failed: dict[str, str] = {}
+        # segment -> (registry, bundle as loaded, bundle served with fallbacks, size)
+        self._entries: OrderedDict[str, tuple[ModelRegistry, ModelBundle, ModelBundle, int]] = OrderedDict()
+        self._loading: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rescan ``root`` for segments, drop resident bundles whose files changed and retry failed loads."""
+        found = set()
+        for dirpath, _, filenames in os.walk(self.root):
+            if dirpath != self.root and all(ARTIFACTS[name] in filenames for name in REQUIRED_ARTIFACTS):
+                found.add(os.path.relpath(dirpath, self.root).replace(os.sep, "/"))
+        with self._lock:
+            self.available = frozenset(found)
+            self.failed.clear()
+            for segment, (registry, bundle, _, size) in list(self._entries.items()):
+                if segment not in found or registry.fingerprint() != bundle.fingerprint:
+                    del self._entries[segment]
+                    self.resident_bytes -= size
+
+    def resolve(self, site: str | None, asset_type: str | None) -> str | None:
+        """Name of the segment serving this site/asset type, or None for the global bundle."""
+        for segment in segment_candidates(site, asset_type):
+            if segment in self.available:
+                return segment
+        return None
+
+    def bundle(self, segment: str) -> ModelBundle:
+        """Resident bundle for ``segment``, loading it (once, for all waiters) on a miss.
+
+        Raises LookupError when the segment's models do not load or validate;
+        the error sticks until ``refresh()``.
+        """
+        with self._lock:
+            entry = self._entries.get(segment)
+            if entry is not None:
+                self._entries.move_to_end(segment)
+                self.hits += 1
+                return entry[2]
+            if segment in self.failed:
+                raise LookupError(f"Models for segment '{segment}' unavailable: {self.failed[segment]}")
+            future = self._loading.get(segment)
+            owner = future is None
+            if owner:
+                future = self._loading[segment] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            registry, own, size = self._load(segment)
+            bundle = with_fallback(own, self._base())
+        except Exception as e:
+            error = LookupError(f"Models for segment '{segment}' unavailable: {e}")
+            with self._lock:
+                self.failed[segment] = str(e)
+                del self._loading[segment]
+            future.set_exception(error)
+            raise error
+        with self._lock:
+            self._entries[segment] = (registry, own, bundle, size)
+            self.resident_bytes += size
+            # The newest entry always stays, even if it alone exceeds the budget
+            while self.resident_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, _, _, evicted) = self._entries.popitem(last=False)
+                self.resident_bytes -= evicted
+                self.evictions += 1
+            del self._loading[segment]
+        future.set_result(bundle)
+        return bundle
+
+    def _base(self) -> ModelBundle | None:
+        if self.fallback is None:
+            return None
+        try:
+            return self.fallback()
+        except RuntimeError:  # no global models: serve the segment's own artifacts only
+            return None
+
+    def rebase(self, base: ModelBundle) -> None:
+        """Re-merge resident segments that borrow artifacts (hooked to global registry swaps)."""
+        with self._lock:
+            for segment, (registry, own, served, size) in self._entries.items():
+                if served is not own:
+                    self._entries[segment] = (registry, own, with_fallback(own, base), size)
+
+    def _load(self, segment: str) -> tuple[ModelRegistry, ModelBundle, int]:
+        path = os.path.join(self.root, *segment.split("/"))
+        registry = ModelRegistry(path, kmeans_grid=self.kmeans_grid)
+        bundle = registry.current  # loads and runs the canary checks
+        size = sum(entry[2] or 0 for entry in bundle.fingerprint)
+        return registry, bundle, size
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "segments": sorted(self.available),
+                "resident": list(self._entries),
+                "resident_mb": round(self.resident_bytes / 2**20, 1),
+                "max_mb": round(self.max_bytes / 2**20, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "loading": list(self._loading),
+                "failed": dict(self.failed),
+                "borrowed": {
+                    segment: missing_groups(own) for segment, (_, own, _, _) in self._entries.items()
+                    if missing_groups(own)
+                },
+            }
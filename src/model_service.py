@@ -17,11 +17,26 @@ MODEL_PATH = os.path.join(MODEL_DIR, "isolation_forest.pkl")
 SCALER_PATH = os.path.join(MODEL_DIR, "scaler.pkl")
 SUPERVISED_MODEL_PATH = os.path.join(MODEL_DIR, "rf_supervised.pkl")
 
+# Outputs of the multi-output failure-mode forest (supervised_train.py --modes)
+FAILURE_LABELS = ["Machine failure", "TWF", "HDF", "PWF", "OSF", "RNF"]
+
+
+def build_isolation_forest(contamination: float = 0.07, random_state: int = 42) -> IsolationForest:
+    """Unfitted IsolationForest as trained for serving (also used by cross_validate.py)."""
+    return IsolationForest(
+        n_estimators=200,
+        contamination=contamination,
+        random_state=random_state,
+        n_jobs=-1,
+    )
+
 
 def train_and_save_model(
     csv_path: str = os.path.join("data", "ai4i_training_phys.csv"),
     contamination: float = 0.07,
     random_state: int = 42,
+    model_path: str = MODEL_PATH,
+    scaler_path: str = SCALER_PATH,
 ) -> tuple[IsolationForest, StandardScaler]:
     df = pd.read_csv(csv_path)
     missing = [c for c in FEATURE_COLUMNS if c not in df.columns]
@@ -30,16 +45,11 @@ def train_and_save_model(
     X = df[FEATURE_COLUMNS].values
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
-    model = IsolationForest(
-        n_estimators=200,
-        contamination=contamination,
-        random_state=random_state,
-        n_jobs=-1,
-    )
+    model = build_isolation_forest(contamination, random_state)
     model.fit(X_scaled)
-    os.makedirs(MODEL_DIR, exist_ok=True)
-    joblib.dump(model, MODEL_PATH)
-    joblib.dump(scaler, SCALER_PATH)
+    os.makedirs(os.path.dirname(model_path) or ".", exist_ok=True)
+    joblib.dump(model, model_path)
+    joblib.dump(scaler, scaler_path)
     return model, scaler
 
 
@@ -107,11 +117,39 @@ def predict_supervised_single(
     }
 
 
+def failure_mode_probabilities(X: np.ndarray, model: Any) -> np.ndarray:
+    """(n_rows, n_labels) positive-class probabilities from one pass of a multi-output forest."""
+    per_label = model.predict_proba(X)  # each tree is traversed once for all labels
+    out = np.zeros((len(X), len(per_label)))
+    for i, (probs, classes) in enumerate(zip(per_label, model.classes_)):
+        positive = np.flatnonzero(classes == 1)
+        if len(positive):  # a label never positive in training stays 0
+            out[:, i] = probs[:, positive[0]]
+    return out
+
+
+def predict_failure_modes_single(
+    reading: dict[str, Any],
+    model: Any,
+) -> dict[str, Any]:
+    X = _validate_and_prepare_features(reading)
+    probs = failure_mode_probabilities(X, model)[0]
+    return {
+        # > 0.5 is what predict() would pick, without a second traversal
+        "is_anomaly": int(probs[0] > 0.5),
+        "anomaly_score": float(probs[0]),
+        "model": "Random Forest (failure modes)",
+        "failure_modes": {label: float(p) for label, p in zip(FAILURE_LABELS[1:], probs[1:])},
+    }
+
+
 def predict_batch(
     df: pd.DataFrame,
     model: IsolationForest | None = None,
     scaler: StandardScaler | None = None,
+    copy: bool = True,
 ) -> pd.DataFrame:
+    """Score every row; ``copy=False`` appends the two output columns to ``df`` itself."""
     if model is None or scaler is None:
         model, scaler = load_model()
     missing = [c for c in FEATURE_COLUMNS if c not in df.columns]
@@ -121,7 +159,7 @@ def predict_batch(
     X_scaled = scaler.transform(X)
     scores = model.decision_function(X_scaled)
     preds = model.predict(X_scaled)
-    out = df.copy()
+    out = df.copy() if copy else df
     out["anomaly_score"] = scores
     out["is_anomaly"] = (preds == -1).astype(int)
     return out
@@ -0,0 +1,135 @@
+import threading
+from dataclasses import dataclass
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+
+@dataclass(frozen=True)
+class ScalerSnapshot:
+    """An immutable, versioned StandardScaler published by an OnlineScaler."""
+    version: int
+    n_samples_seen: int
+    scaler: StandardScaler
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return self.scaler.transform(X)
+
+
+class OnlineScaler:
+    """Welford/Chan running mean and variance with atomically swappable snapshots.
+
+    Updates accumulate under a lock; readers only ever dereference
+    ``current``, which is replaced as a whole by ``publish()``.
+    """
+
+    def __init__(
+        self,
+        n_features: int,
+        max_count: int | None = None,
+        publish_every: int | None = None,
+    ):
+        self.n_features = n_features
+        # Caps the weight of past samples so long-running streams keep tracking drift.
+        self.max_count = max_count
+        self.publish_every = publish_every
+        self.count = 0
+        self.mean = np.zeros(n_features, dtype=float)
+        self.m2 = np.zeros(n_features, dtype=float)
+        self.feature_names_in_: np.ndarray | None = None
+        self._since_publish = 0
+        self._version = 0
+        self._lock = threading.Lock()
+        self._current: ScalerSnapshot | None = None
+
+    @classmethod
+    def from_scaler(cls, scaler: StandardScaler, **kwargs) -> "OnlineScaler":
+        """Seed running statistics from an already fitted StandardScaler."""
+        online = cls(n_features=len(scaler.mean_), **kwargs)
+        online.count = int(np.max(scaler.n_samples_seen_))
+        online.mean = np.asarray(scaler.mean_, dtype=float).copy()
+        online.m2 = np.asarray(scaler.var_, dtype=float) * online.count
+        online.feature_names_in_ = getattr(scaler, "feature_names_in_", None)
+        online.publish()
+        return online
+
+    @property
+    def current(self) -> ScalerSnapshot | None:
+        return self._current
+
+    def partial_fit(self, X: np.ndarray) -> "OnlineScaler":
+        """Merge a batch of rows into the running statistics (Chan et al.)."""
+        X = np.asarray(X, dtype=float).reshape(-1, self.n_features)
+        n_b = X.shape[0]
+        if n_b == 0:
+            return self
+        mean_b = X.mean(axis=0)
+        m2_b = ((X - mean_b) ** 2).sum(axis=0)
+
+        with self._lock:
+            n_a = self.count
+            if self.max_count is not None and n_a > self.max_count:
+                self.m2 *= self.max_count / n_a
+                n_a = self.max_count
+            n = n_a + n_b
+            delta = mean_b - self.mean
+            self.mean = self.mean + delta * (n_b / n)
+            self.m2 = self.m2 + m2_b + delta ** 2 * (n_a * n_b / n)
+            self.count = n
+            self._since_publish += n_b
+            should_publish = (
+                self.publish_every is not None
+                and self._since_publish >= self.publish_every
+            )
+
+        if should_publish:
+            self.publish()
+        return self
+
+    def partial_fit_csv(
+        self,
+        csv_path: str,
+        columns: list[str],
+        chunksize: int = 50_000,
+    ) -> "OnlineScaler":
+        """Batch ingestion: stream a CSV in chunks without loading it whole."""
+        for chunk in pd.read_csv(csv_path, usecols=columns, chunksize=chunksize):
+            self.partial_fit(chunk[columns].values)
+        return self
+
+    def _build_scaler(self) -> StandardScaler:
+        var = self.m2 / self.count if self.count else np.zeros(self.n_features)
+        scale = np.sqrt(var)
+        # Same zero-variance guard as sklearn's StandardScaler.
+        scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+        scaler = StandardScaler()
+        scaler.mean_ = self.mean.copy()
+        scaler.var_ = var
+        scaler.scale_ = scale
+        scaler.n_samples_seen_ = self.count
+        scaler.n_features_in_ = self.n_features
+        if self.feature_names_in_ is not None:
+            scaler.feature_names_in_ = self.feature_names_in_
+        return scaler
+
+    def publish(self) -> ScalerSnapshot:
+        """Freeze the current statistics into a new version and swap it in."""
+        with self._lock:
+            self._version += 1
+            snapshot = ScalerSnapshot(
+                version=self._version,
+                n_samples_seen=self.count,
+                scaler=self._build_scaler(),
+            )
+            self._since_publish = 0
+            self._current = snapshot
+        return snapshot
+
+    def save_snapshot(self, path: str) -> ScalerSnapshot | None:
+        """Persist the current snapshot's scaler (loadable with joblib like scaler.pkl)."""
+        snapshot = self._current
+        if snapshot is not None:
+            joblib.dump(snapshot.scaler, path)
+        return snapshot
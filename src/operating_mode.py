@@ -0,0 +1,201 @@
+import numpy as np
+
+
+class CentroidIndex:
+    """K-Means centroids with cached squared norms for batched assignment.
+
+    ``||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2``, so with ``||c||^2`` cached the
+    labels and the distances behind ``cluster_confidence`` both come out of a
+    single ``X @ C.T`` per batch instead of ``predict`` plus a second
+    ``np.linalg.norm`` pass.
+    """
+
+    def __init__(self, centers: np.ndarray):
+        self.centers = np.ascontiguousarray(centers, dtype=float)
+        self.centers_t = self.centers.T.copy()
+        self.center_sq_norms = np.einsum("ij,ij->i", self.centers, self.centers)
+
+    @classmethod
+    def from_model(cls, kmeans) -> "CentroidIndex":
+        return cls(kmeans.cluster_centers_)
+
+    def sq_distances(self, X_scaled: np.ndarray) -> np.ndarray:
+        X_scaled = np.asarray(X_scaled, dtype=float)
+        x_sq = np.einsum("ij,ij->i", X_scaled, X_scaled)[:, None]
+        d2 = x_sq - 2.0 * (X_scaled @ self.centers_t) + self.center_sq_norms
+        # Cancellation can push tiny distances slightly below zero.
+        return np.maximum(d2, 0.0)
+
+    def assign(self, X_scaled: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (cluster ids, distance to the assigned centroid) per row."""
+        d2 = self.sq_distances(X_scaled)
+        labels = d2.argmin(axis=1)
+        dists = np.sqrt(d2[np.arange(len(labels)), labels])
+        return labels, dists
+
+    def assign_with_confidence(self, X_scaled: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Same as ``assign`` but maps distances to ``1 / (1 + d)`` confidences."""
+        labels, dists = self.assign(X_scaled)
+        return labels, 1.0 / (1.0 + dists)
+
+
+# (low, high) per feature in FEATURE_COLUMNS order; covers the AI4I ranges with margin.
+DEFAULT_GRID_BOUNDS = (
+    (1100.0, 2900.0),  # Rotational speed [rpm]
+    (304.0, 316.0),    # Process temperature [K]
+    (0.0, 80.0),       # Torque [Nm]
+    (0.0, 256.0),      # Tool wear [min]
+)
+DEFAULT_GRID_BINS = (96, 48, 96, 48)
+
+
+class ModeLookupGrid:
+    """Precomputed quantized table of operating modes (one int8 per cell).
+
+    Cells whose centre is within one cell diagonal of a Voronoi boundary are
+    marked ``-1``; those readings, and anything out of bounds, fall back to
+    the exact ``CentroidIndex`` computation. Every other lookup is one array
+    index plus the distance to that single centroid for the confidence.
+    """
+
+    AMBIGUOUS = -1
+
+    def __init__(
+        self,
+        scaler,
+        index: CentroidIndex,
+        bounds=DEFAULT_GRID_BOUNDS,
+        bins=DEFAULT_GRID_BINS,
+        scaler_version: int | None = None,
+    ):
+        self.scaler_version = scaler_version
+        self.lo = np.array([b[0] for b in bounds], dtype=float)
+        self.hi = np.array([b[1] for b in bounds], dtype=float)
+        self.bins = np.array(bins, dtype=int)
+        self.step = (self.hi - self.lo) / self.bins
+        self.strides = np.array(
+            [int(np.prod(self.bins[i + 1:])) for i in range(len(self.bins))], dtype=int
+        )
+        # Largest distance (in scaled space) between a reading and its cell centre.
+        self.half_diagonal = 0.5 * float(np.linalg.norm(self.step / scaler.scale_))
+        self.labels = self._build(scaler, index)
+        # Plain-Python copies keep the single-reading path free of numpy overhead.
+        self._axes = list(zip(
+            self.lo.tolist(), (1.0 / self.step).tolist(), self.bins.tolist(), self.strides.tolist()
+        ))
+        self._mean = np.asarray(scaler.mean_, dtype=float).tolist()
+        self._scale = np.asarray(scaler.scale_, dtype=float).tolist()
+        self._centers = index.centers.tolist()
+        self._center_arr = index.centers
+        self._mean_arr = np.asarray(scaler.mean_, dtype=float)
+        self._scale_arr = np.asarray(scaler.scale_, dtype=float)
+
+    def _build(self, scaler, index: CentroidIndex) -> np.ndarray:
+        mean = np.asarray(scaler.mean_, dtype=float)
+        scale = np.asarray(scaler.scale_, dtype=float)
+        axes = [self.lo[i] + (np.arange(n) + 0.5) * self.step[i] for i, n in enumerate(self.bins)]
+        labels = np.empty(int(np.prod(self.bins)), dtype=np.int8)
+
+        # One slab of the first axis at a time keeps the distance matrix small.
+        rest = np.stack(np.meshgrid(*axes[1:], indexing="ij"), axis=-1).reshape(-1, len(axes) - 1)
+        slab = len(rest)
+        for i, first in enumerate(axes[0]):
+            X = np.column_stack([np.full(slab, first), rest])
+            d2 = index.sq_distances((X - mean) / scale)
+            nearest_two = np.sqrt(np.partition(d2, 1, axis=1)[:, :2])
+            lbl = d2.argmin(axis=1).astype(np.int8)
+            lbl[nearest_two[:, 1] - nearest_two[:, 0] <= 2 * self.half_diagonal] = self.AMBIGUOUS
+            labels[i * slab:(i + 1) * slab] = lbl
+        return labels
+
+    def lookup(self, values) -> tuple[int, float] | None:
+        """Cluster id and confidence for one raw reading, or None to fall back."""
+        flat = 0
+        for v, (lo, inv_step, n, stride) in zip(values, self._axes):
+            if v < lo:
+                return None
+            i = int((v - lo) * inv_step)
+            if i >= n:
+                return None
+            flat += i * stride
+        label = int(self.labels[flat])
+        if label == self.AMBIGUOUS:
+            return None
+        d2 = 0.0
+        for v, m, s, c in zip(values, self._mean, self._scale, self._centers[label]):
+            z = (v - m) / s - c
+            d2 += z * z
+        return label, 1.0 / (1.0 + d2 ** 0.5)
+
+    def lookup_batch(self, X: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized lookup: (labels, confidences, hit mask); misses are -1 / nan."""
+        X = np.asarray(X, dtype=float)
+        cells = np.floor((X - self.lo) / self.step).astype(np.int64)
+        in_bounds = np.all((cells >= 0) & (cells < self.bins), axis=1)
+        flat = np.where(in_bounds, np.clip(cells, 0, self.bins - 1) @ self.strides, 0)
+        labels = np.where(in_bounds, self.labels[flat], self.AMBIGUOUS).astype(int)
+        hit = labels != self.AMBIGUOUS
+        diff = (X - self._mean_arr) / self._scale_arr - self._center_arr[np.where(hit, labels, 0)]
+        confidence = np.where(hit, 1.0 / (1.0 + np.sqrt((diff * diff).sum(axis=1))), np.nan)
+        return labels, confidence, hit
+
+    @property
+    def nbytes(self) -> int:
+        return self.labels.nbytes
+
+
+def grid_report(
+    grid: ModeLookupGrid,
+    scaler,
+    index: CentroidIndex,
+    X: np.ndarray,
+    n_timing: int = 2000,
+) -> dict[str, float]:
+    """Accuracy of the grid against exact assignment on X, plus per-reading latency."""
+    import time
+
+    X = np.asarray(X, dtype=float)
+    exact_labels, exact_conf = index.assign_with_confidence(scaler.transform(X))
+    labels, conf, hit = grid.lookup_batch(X)
+
+    sample = X[:n_timing]
+    t0 = time.perf_counter()
+    for row in sample:
+        grid.lookup(row)
+    grid_us = (time.perf_counter() - t0) / len(sample) * 1e6
+    t0 = time.perf_counter()
+    for row in sample:
+        index.assign_with_confidence(scaler.transform(row.reshape(1, -1)))
+    exact_us = (time.perf_counter() - t0) / len(sample) * 1e6
+
+    return {
+        "rows": float(len(X)),
+        "grid_hit_rate": float(hit.mean()),
+        "label_accuracy_on_hits": float((labels[hit] == exact_labels[hit]).mean()) if hit.any() else float("nan"),
+        "max_confidence_error": float(np.abs(conf[hit] - exact_conf[hit]).max()) if hit.any() else float("nan"),
+        "grid_lookup_us": grid_us,
+        "exact_assign_us": exact_us,
+        "grid_megabytes": grid.nbytes / 1e6,
+    }
+
+
+if __name__ == "__main__":
+    import time
+    import warnings
+
+    import joblib
+    import pandas as pd
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    kmeans = joblib.load("models/kmeans_clustering.pkl")
+    scaler = joblib.load("models/scaler_kmeans.pkl")
+    index = CentroidIndex.from_model(kmeans)
+
+    t0 = time.perf_counter()
+    grid = ModeLookupGrid(scaler, index)
+    print(f"Built {tuple(grid.bins.tolist())} grid in {time.perf_counter() - t0:.2f}s")
+
+    df = pd.read_csv("data/ai4i2020.csv")
+    X = df[["Rotational speed [rpm]", "Process temperature [K]", "Torque [Nm]", "Tool wear [min]"]].values
+    for key, value in grid_report(grid, scaler, index, X).items():
+        print(f"  {key:<24} {value:.4f}")
@@ -54,9 +54,30 @@ export const AccessControl = () => {
   };
 
   useEffect(() => {
-    fetchData();
-    const interval = setInterval(fetchData, 5000); // Poll every 5s
-    return () => clearInterval(interval);
+    // Server push replaces the 5s poll; fetchData stays for the manual retry
+    const source = new EventSource('http://127.0.0.1:8000/api/stream/access');
+
+    source.addEventListener('snapshot', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      setLogs(data.logs);
+      setStats(data.stats);
+      setError('');
+      setLoading(false);
+    });
+    source.addEventListener('access', (e) => {
+      const delta = JSON.parse((e as MessageEvent).data);
+      setStats(prev => (prev ? { ...prev, ...delta } : delta));
+    });
+    source.addEventListener('access_logs', (e) => {
+      const newLogs: AccessLog[] = JSON.parse((e as MessageEvent).data);
+      setLogs(prev => [...newLogs, ...prev].slice(0, 50));
+    });
+    source.onerror = () => {
+      setError('Could not connect to backend. Is uvicorn running?');
+      setLoading(false);
+    };
+
+    return () => source.close();
   }, []);
 
   return (
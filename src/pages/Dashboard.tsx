@@ -17,24 +17,29 @@ export const Dashboard = ({ onNavigate }: DashboardProps) => {
     alerts: { value: "...", trend: "...", trendUp: false }
   });
   
-  const [chartData, setChartData] = React.useState([]);
+  const [chartData, setChartData] = React.useState<any[]>([]);
 
   React.useEffect(() => {
-    const fetchData = async () => {
-      try {
-        const statsRes = await fetch('http://127.0.0.1:8000/api/dashboard/stats');
-        const chartRes = await fetch('http://127.0.0.1:8000/api/dashboard/chart');
-        
-        if (statsRes.ok) setStats(await statsRes.json());
-        if (chartRes.ok) setChartData(await chartRes.json());
-      } catch (e) {
-        console.error("Dashboard API Error", e);
-      }
-    };
-    
-    fetchData();
-    const interval = setInterval(fetchData, 2000); // Live updates
-    return () => clearInterval(interval);
+    // Server push: one snapshot on connect, then only changed stats and new chart points
+    const source = new EventSource('http://127.0.0.1:8000/api/stream/dashboard');
+
+    source.addEventListener('snapshot', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      setStats(data.stats);
+      setChartData(data.chart);
+    });
+    source.addEventListener('stats', (e) => {
+      const delta = JSON.parse((e as MessageEvent).data);
+      setStats(prev => ({ ...prev, ...delta }));
+    });
+    source.addEventListener('chart', (e) => {
+      const point = JSON.parse((e as MessageEvent).data);
+      // Same window the snapshot comes from: /api/dashboard/chart's 60 s at one point per 2 s tick
+      setChartData(prev => [...prev, point].slice(-30));
+    });
+    source.onerror = () => console.error("Dashboard stream error, reconnecting...");
+
+    return () => source.close();
   }, []);
 
   return (
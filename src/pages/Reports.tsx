@@ -6,6 +6,7 @@ import { FileText, Download, Filter, BarChart3, AlertTriangle, CheckCircle } fro
 export const Reports = () => {
   const [reports, setReports] = React.useState<any[]>([]);
   const [generating, setGenerating] = React.useState(false);
+  const [reportKind, setReportKind] = React.useState('energy');
 
   const fetchReports = async () => {
     try {
@@ -20,10 +21,17 @@ export const Reports = () => {
     fetchReports();
   }, []);
 
+  // Reports run as background jobs: poll until the job leaves Queued/Running
+  React.useEffect(() => {
+    if (!reports.some(r => r.status === 'Queued' || r.status === 'Running')) return;
+    const timer = setTimeout(fetchReports, 1000);
+    return () => clearTimeout(timer);
+  }, [reports]);
+
   const handleGenerate = async () => {
     setGenerating(true);
     try {
-      const res = await fetch('http://127.0.0.1:8000/api/reports/generate', { method: 'POST' });
+      const res = await fetch(`http://127.0.0.1:8000/api/reports/generate?kind=${reportKind}`, { method: 'POST' });
       if (res.ok) {
         const newReport = await res.json();
         setReports(prev => [newReport, ...prev]);
@@ -36,16 +44,8 @@ export const Reports = () => {
   };
 
   const handleDownload = (report: any) => {
-    const headers = "ID,Report Name,Date Generated,Type,Status";
-    const row = `${report.id},${report.name},${report.date},${report.type},${report.status}`;
-    const csvContent = "data:text/csv;charset=utf-8," + headers + "\n" + row;
-    const encodedUri = encodeURI(csvContent);
-    const link = document.createElement("a");
-    link.setAttribute("href", encodedUri);
-    link.setAttribute("download", `${report.name.replace(/\s+/g, '_')}_${report.date}.csv`);
-    document.body.appendChild(link);
-    link.click();
-    document.body.removeChild(link);
+    if (report.status !== 'Ready') return;
+    window.location.href = `http://127.0.0.1:8000/api/reports/${report.id}/download`;
   };
 
   return (
@@ -54,7 +54,17 @@ export const Reports = () => {
       
       <div className="px-8 mt-8">
         <GlassCard title="Generated Reports">
-          <div className="flex justify-end mb-6">
+          <div className="flex justify-end gap-3 mb-6">
+            <select
+              value={reportKind}
+              onChange={(e) => setReportKind(e.target.value)}
+              className="px-3 py-2 rounded-lg bg-[var(--glass-bg)] border border-[var(--glass-border)] text-[var(--text-main)] text-sm"
+            >
+              <option value="energy">Energy Consumption</option>
+              <option value="access_denials">Access Denial Analysis</option>
+              <option value="anomaly_summary">Model Anomaly Summary</option>
+              <option value="rul_plan">Maintenance RUL Plan</option>
+            </select>
             <button 
               onClick={handleGenerate}
               disabled={generating}
@@ -100,6 +110,8 @@ export const Reports = () => {
                       <div className="flex items-center gap-2">
                         {report.status === 'Ready' ? (
                           <CheckCircle size={14} className="text-[var(--color-success)]" />
+                        ) : report.status === 'Failed' ? (
+                          <AlertTriangle size={14} className="text-[var(--color-danger)]" />
                         ) : (
                           <div className="w-3 h-3 rounded-full border-2 border-[var(--color-warning)] border-t-transparent animate-spin" />
                         )}
@@ -111,7 +123,8 @@ export const Reports = () => {
                     <td className="p-4 text-right">
                       <button 
                         onClick={() => handleDownload(report)}
-                        className="p-2 rounded hover:bg-[var(--glass-bg)] text-[var(--text-muted)] hover:text-[var(--text-main)] transition-colors"
+                        disabled={report.status !== 'Ready'}
+                        className="disabled:opacity-30 p-2 rounded hover:bg-[var(--glass-bg)] text-[var(--text-muted)] hover:text-[var(--text-main)] transition-colors"
                         title="Download CSV"
                       >
                         <Download size={18} />
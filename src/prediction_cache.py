@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Sequence
+
+# Sensor resolution per feature, in FEATURE_COLUMNS order: readings closer
+# together than this share a cache entry.
+DEFAULT_RESOLUTIONS = (
+    1.0,   # Rotational speed [rpm]
+    0.1,   # Process temperature [K]
+    0.1,   # Torque [Nm]
+    1.0,   # Tool wear [min]
+)
+
+
+class PredictionCache:
+    """Bounded LRU + TTL cache of scoring results keyed on quantized readings.
+
+    Keys also carry the scoring mode and the model version, so a model swap
+    never serves stale scores; ``clear()`` is still hooked to registry swaps
+    to release the memory held by entries of the old version.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: float = 60.0,
+        resolutions: Sequence[float] = DEFAULT_RESOLUTIONS,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.resolutions = tuple(resolutions)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, values: Sequence[float], mode: str, version: Hashable) -> tuple:
+        quantized = tuple(round(v / r) for v, r in zip(values, self.resolutions))
+        return (mode, version) + quantized
+
+    def get(self, key: Hashable) -> Any | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, *_: Any) -> None:
+        """Drop every entry (accepts and ignores a swapped-in bundle)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,189 @@
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any
+
+DB_PATH = "predictions.db"
+
+COLUMNS = (
+    "ts",
+    "machine_id",
+    "source",
+    "mode",
+    "model_version",
+    "rotational_speed_rpm",
+    "process_temperature_k",
+    "torque_nm",
+    "tool_wear_min",
+    "is_anomaly",
+    "score",
+    "cluster",
+    "segment",
+)
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS predictions (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        machine_id TEXT,
+        source TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        model_version INTEGER,
+        rotational_speed_rpm REAL,
+        process_temperature_k REAL,
+        torque_nm REAL,
+        tool_wear_min REAL,
+        is_anomaly INTEGER,
+        score REAL,
+        cluster INTEGER,
+        segment TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_predictions_machine_ts ON predictions (machine_id, ts);
+"""
+
+INSERT = f"INSERT INTO predictions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+
+
+class PredictionLog:
+    """Append-only history of scored readings, written off the request path.
+
+    ``record`` only does a non-blocking ``put`` on a bounded queue; a daemon
+    thread drains it and inserts up to ``batch_size`` rows per transaction.
+    If the writer falls behind and the queue fills, new records are dropped
+    and counted rather than slowing ``/predict`` down.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 100_000,
+    ):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        if "segment" not in {row[1] for row in conn.execute("PRAGMA table_info(predictions)")}:
+            conn.execute("ALTER TABLE predictions ADD COLUMN segment TEXT")  # logs from before segments
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        # WAL lets readers (history queries, exports) run while the writer inserts
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record(
+        self,
+        *,
+        source: str,
+        mode: str,
+        features: tuple[float, float, float, float],
+        is_anomaly: int,
+        score: float,
+        machine_id: str | None = None,
+        model_version: int | None = None,
+        cluster: int | None = None,
+        segment: str | None = None,
+    ) -> None:
+        # model_version counts per registry, so segment (None = global models) tells them apart
+        row = (time.time(), machine_id, source, mode, model_version, *features, is_anomaly, score, cluster, segment)
+        try:
+            self._queue.put_nowait(row)
+            self.recorded += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self, conn: sqlite3.Connection, block: bool) -> int:
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval) if block else self._queue.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            with conn:
+                conn.executemany(INSERT, batch)
+            self.written += len(batch)
+        return len(batch)
+
+    def _run(self) -> None:
+        conn = self._connect()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._drain(conn, block=True)
+                except sqlite3.Error as e:
+                    print(f"Prediction log write failed: {e}")
+                    time.sleep(self.flush_interval)
+            while self._drain(conn, block=False):
+                pass  # flush what is left on shutdown
+        finally:
+            conn.close()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    def history(
+        self,
+        machine_id: str | None,
+        start: float | None = None,
+        end: float | None = None,
+        limit: int = 500,
+    ) -> list[dict[str, Any]]:
+        """Newest-first score history of one machine (``None`` = readings without an id)."""
+        filters = ["machine_id IS ?"]
+        params: list[Any] = [machine_id]
+        if start is not None:
+            filters.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            filters.append("ts < ?")
+            params.append(end)
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM predictions WHERE {' AND '.join(filters)} "
+                "ORDER BY ts DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [dict(row) for row in rows]
+
+    def has_rows(self) -> bool:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT 1 FROM predictions LIMIT 1").fetchone() is not None
+        finally:
+            conn.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "writer_running": self._thread is not None and self._thread.is_alive(),
+        }
+
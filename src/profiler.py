@@ -0,0 +1,252 @@
+"""
+On-demand request profiling: a statistical sampler plus tracemalloc, armed
+for the next N matching requests or T seconds, whichever ends first.
+
+The sampler reads every thread's stack with ``sys._current_frames()`` at a
+fixed interval while at least one profiled request is in flight. That
+catches both the event loop and the threadpool workers that run sync
+handlers and model code, which a per-thread tracer like cProfile only sees
+in the thread that enabled it. Stacks are aggregated into the folded
+"frame;frame;frame count" format read by flamegraph.pl, inferno and
+speedscope.
+
+Nothing runs while no session is armed: ProfilingMiddleware checks one
+attribute and passes the request straight through.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from typing import Any
+
+DEFAULT_INTERVAL = 0.005  # seconds between stack samples
+MAX_SECONDS = 300.0
+TOP_N = 25
+# Leaf frames of threads parked in a wait, not doing request work
+IDLE_LEAVES = {"wait", "select", "poll", "get", "_recv", "accept", "run_forever"}
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ProfileSession:
+    def __init__(self, requests: int | None, seconds: float, path_prefix: str,
+                 interval: float, memory: bool):
+        self.id = uuid.uuid4().hex[:8]
+        self.max_requests = requests
+        self.seconds = seconds
+        self.path_prefix = path_prefix
+        self.interval = interval
+        self.memory = memory
+        self.started_at = time.time()
+        self.deadline = time.monotonic() + seconds
+        self.started = 0  # profiled requests admitted
+        self.in_flight = 0
+        self.requests: list[dict[str, Any]] = []
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+        self.finished_at: float | None = None
+        self.memory_top: list[dict[str, Any]] = []
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._started_tracemalloc = False
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def admits(self, path: str) -> bool:
+        return path.startswith(self.path_prefix) and (self.max_requests is None or self.started < self.max_requests)
+
+    @property
+    def done(self) -> bool:
+        complete = self.max_requests is not None and len(self.requests) >= self.max_requests
+        return complete or time.monotonic() >= self.deadline
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "running": self.finished_at is None,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "path_prefix": self.path_prefix,
+            "max_requests": self.max_requests,
+            "seconds": self.seconds,
+            "interval_ms": self.interval * 1000,
+            "memory": self.memory,
+            "requests_profiled": len(self.requests),
+            "samples": self.samples,
+        }
+
+    def folded(self) -> str:
+        """Flame-graph input: one "outer;...;inner count" line per distinct stack."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, n: int = TOP_N) -> list[dict[str, Any]]:
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack[1:]):  # skip the thread-name root
+                total[label] += count
+        return [
+            {
+                "function": label,
+                "self_samples": own[label],
+                "total_samples": total[label],
+                "self_pct": round(100 * own[label] / self.samples, 2) if self.samples else 0.0,
+                "total_pct": round(100 * total[label] / self.samples, 2) if self.samples else 0.0,
+            }
+            for label, _ in total.most_common(n)
+        ]
+
+    def report(self) -> dict[str, Any]:
+        durations = sorted(r["duration_ms"] for r in self.requests)
+        return {
+            **self.status(),
+            "latency_ms": {
+                "p50": durations[len(durations) // 2] if durations else None,
+                "max": durations[-1] if durations else None,
+            },
+            "requests": self.requests,
+            "top_functions": self.top_functions(),
+            "top_allocations": self.memory_top,
+        }
+
+
+class RequestProfiler:
+    """Holds at most one armed ProfileSession and the last finished one."""
+
+    def __init__(self):
+        self.session: ProfileSession | None = None
+        self.last: ProfileSession | None = None
+        self._finishing: ProfileSession | None = None  # left self.session, not yet in self.last
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> ProfileSession | None:
+        """The armed session, or the one stop() is still finalizing."""
+        return self.session or self._finishing
+
+    def start(
+        self,
+        requests: int | None = 100,
+        seconds: float = 30.0,
+        path_prefix: str = "/predict",
+        interval: float = DEFAULT_INTERVAL,
+        memory: bool = True,
+    ) -> ProfileSession:
+        with self._lock:
+            if self.active is not None:
+                raise RuntimeError(f"Profile session {self.active.id} is already running")
+            session = ProfileSession(requests, min(seconds, MAX_SECONDS), path_prefix, interval, memory)
+            if memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(10)
+                    session._started_tracemalloc = True
+                session._baseline = tracemalloc.take_snapshot()
+            session._sampler = threading.Thread(target=self._sample, args=(session,), name="profiler", daemon=True)
+            self.session = session
+            session._sampler.start()
+            return session
+
+    def stop(self) -> ProfileSession | None:
+        """Finish the running session now (no-op when none is armed)."""
+        with self._lock:
+            session = self.session
+            if session is None:
+                return None
+            self.session = None
+            self._finishing = session
+            session._stop.set()
+        if session._sampler is not threading.current_thread():
+            session._sampler.join(timeout=5)
+        if session.memory:
+            exclude = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+            snapshot = tracemalloc.take_snapshot().filter_traces(exclude)
+            baseline = session._baseline.filter_traces(exclude)
+            session.memory_top = [
+                {
+                    "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count_diff": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(baseline, "lineno")[:TOP_N]
+            ]
+            session._baseline = None
+            if session._started_tracemalloc:
+                tracemalloc.stop()
+        session.finished_at = time.time()
+        # Published only once finalized, so readers of last never see a partial report
+        with self._lock:
+            self.last = session
+            self._finishing = None
+        return session
+
+    def _stop_in_background(self, session: ProfileSession) -> None:
+        # Snapshots and joins stay off the event loop and the sampler itself
+        if self.session is session:
+            threading.Thread(target=self.stop, name="profiler-stop", daemon=True).start()
+
+    def request_started(self, session: ProfileSession) -> None:
+        with self._lock:
+            session.started += 1
+            session.in_flight += 1
+
+    def request_finished(self, session: ProfileSession, path: str, status: int | None, duration: float) -> None:
+        with self._lock:
+            session.in_flight -= 1
+            session.requests.append({"path": path, "status": status, "duration_ms": round(duration * 1000, 3)})
+        if session.done:
+            self._stop_in_background(session)
+
+    def _sample(self, session: ProfileSession) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not session._stop.wait(session.interval):
+            if session.done:
+                self._stop_in_background(session)
+                return
+            if not session.in_flight:
+                continue
+            for tid, frame in sys._current_frames().items():
+                if tid == own_id or frame.f_code.co_name in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if tid not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(tid, str(tid)).replace(" ", "_"))
+                session.stacks[tuple(reversed(stack))] += 1
+                session.samples += 1
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; a single attribute check per request while no session is armed."""
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        session = self.profiler.session
+        if session is None or scope["type"] != "http" or not session.admits(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.profiler.request_started(session)
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.request_finished(session, scope["path"], status, time.perf_counter() - t0)
@@ -0,0 +1,254 @@
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+import pandas as pd
+
+REPORT_DIR = "reports"
+AI4I_PATH = os.path.join("data", "ai4i2020.csv")
+FEATURE_COLUMNS = [
+    "Rotational speed [rpm]",
+    "Process temperature [K]",
+    "Torque [Nm]",
+    "Tool wear [min]",
+]
+
+
+class ReportQueueFull(RuntimeError):
+    pass
+
+
+@dataclass
+class ReportJob:
+    id: str
+    kind: str
+    name: str
+    created_at: datetime
+    status: str = "Queued"  # Queued -> Running -> Ready | Failed
+    finished_at: datetime | None = None
+    rows: int | None = None
+    error: str | None = None
+    path: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        # Same fields the Reports page always showed, plus job details
+        return {
+            "id": self.id,
+            "name": self.name,
+            "date": self.created_at.strftime("%b %d, %Y"),
+            "type": "CSV",
+            "status": self.status,
+            "kind": self.kind,
+            "created_at": self.created_at.isoformat(timespec="seconds"),
+            "finished_at": self.finished_at.isoformat(timespec="seconds") if self.finished_at else None,
+            "rows": self.rows,
+            "error": self.error,
+        }
+
+
+class ReportQueue:
+    """Bounded thread pool that runs report builders and keeps their CSV output.
+
+    ``reports`` maps a kind to ``(display name, builder)``; a builder returns
+    a DataFrame. ``submit`` only enqueues, so the request thread returns at
+    once with the job id.
+    """
+
+    def __init__(
+        self,
+        reports: dict[str, tuple[str, Callable[[], pd.DataFrame]]],
+        output_dir: str = REPORT_DIR,
+        max_workers: int = 2,
+        max_pending: int = 20,
+        keep: int = 100,
+    ):
+        self.reports = reports
+        self.output_dir = output_dir
+        self.max_pending = max_pending
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+        self._jobs: dict[str, ReportJob] = {}
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def submit(self, kind: str) -> ReportJob:
+        if kind not in self.reports:
+            raise KeyError(kind)
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j.status in ("Queued", "Running"))
+            if pending >= self.max_pending:
+                raise ReportQueueFull(f"{pending} reports already pending")
+            job = ReportJob(
+                id=f"REP-{uuid.uuid4().hex[:8].upper()}",
+                kind=kind,
+                name=self.reports[kind][0],
+                created_at=datetime.now(),
+            )
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job
+
+    def _prune(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status in ("Ready", "Failed")]
+        for job in finished[:max(0, len(self._jobs) - self.keep)]:
+            del self._jobs[job.id]
+            if job.path and os.path.exists(job.path):
+                os.remove(job.path)
+
+    def _run(self, job: ReportJob) -> None:
+        job.status = "Running"
+        try:
+            df = self.reports[job.kind][1]()
+            path = os.path.join(self.output_dir, f"{job.id}.csv")
+            df.to_csv(path, index=False)
+            job.rows = len(df)
+            job.path = path
+            job.status = "Ready"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "Failed"
+        finally:
+            job.finished_at = datetime.now()
+
+    def get(self, job_id: str) -> ReportJob | None:
+        return self._jobs.get(job_id)
+
+    def list(self) -> list[ReportJob]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Report builders ---
+
+ENERGY_REPORT_COLUMNS = [
+    "date", "energy_total_kwh", "energy_mean_kwh", "energy_peak_kwh", "occupancy_mean", "occupancy_peak",
+    "live_energy_kwh", "live_load_mean_kw", "live_load_peak_kw", "live_occupancy_mean",
+]
+LIVE_SAMPLE_SECONDS = 2.0  # simulation tick interval
+
+
+def energy_consumption_report(store, live_sample_seconds: float = LIVE_SAMPLE_SECONDS) -> pd.DataFrame:
+    """Daily energy totals and occupancy from the time-series rollups.
+
+    The CSV history is hourly kWh, so its daily sum is energy. Live ticks are
+    instantaneous load in kW, one sample per ``live_sample_seconds``, so their
+    energy is sum * interval / 3600.
+    """
+    spans = [b for b in (store.bounds("energy"), store.bounds("live_power")) if b is not None]
+    if not spans:
+        return pd.DataFrame(columns=ENERGY_REPORT_COLUMNS)
+    start = min(b[0] for b in spans) // 86400 * 86400
+    end = max(b[1] for b in spans) + 3600
+    n_days = -(-(end - start) // 86400)
+    # max_points = number of days makes the store answer from the daily rollup
+    series = ["energy", "occupancy", "live_power", "live_occupancy"]
+    _, data = store.query(series, start, end, max_points=n_days)
+    frames = {
+        name: pd.DataFrame(data[name], columns=["bucket", "sum", "mean", "min", "max"]).set_index("bucket")
+        for name in series
+    }
+    days = sorted(set().union(*(frame.index for frame in frames.values())))
+    energy, occupancy, live, live_occupancy = (frames[name].reindex(days) for name in series)
+    return pd.DataFrame({
+        "date": pd.to_datetime(days, unit="s").strftime("%Y-%m-%d"),
+        "energy_total_kwh": energy["sum"].round(2).values,
+        "energy_mean_kwh": energy["mean"].round(2).values,
+        "energy_peak_kwh": energy["max"].round(2).values,
+        "occupancy_mean": occupancy["mean"].round(1).values,
+        "occupancy_peak": occupancy["max"].values,
+        "live_energy_kwh": (live["sum"] * live_sample_seconds / 3600).round(2).values,
+        "live_load_mean_kw": live["mean"].round(1).values,
+        "live_load_peak_kw": live["max"].values,
+        "live_occupancy_mean": live_occupancy["mean"].round(1).values,
+    })
+
+
+ACCESS_DENIAL_QUERY = """
+    SELECT
+        U.User_Name,
+        U.Department,
+        U.Access_Level AS Role,
+        D.Door_Location,
+        D.Zone AS Door_Zone,
+        COUNT(*) AS Denied_Count,
+        MIN(AL.Access_Time) AS First_Attempt,
+        MAX(AL.Access_Time) AS Last_Attempt,
+        SUM(CASE WHEN strftime('%H', AL.Access_Time) < '08'
+                   OR strftime('%H', AL.Access_Time) > '18' THEN 1 ELSE 0 END) AS After_Hours
+    FROM Access_Logs AL
+    JOIN Users U ON AL.User_ID = U.User_ID
+    JOIN Doors D ON AL.Door_ID = D.Door_ID
+    WHERE AL.Access_Status = 'Denied'
+    GROUP BY U.User_ID, D.Door_ID
+    ORDER BY Denied_Count DESC, Last_Attempt DESC
+"""
+
+
+def access_denial_report(db_path: str) -> pd.DataFrame:
+    """Denied attempts per user and door, with after-hours counts."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query(ACCESS_DENIAL_QUERY, conn)
+    finally:
+        conn.close()
+
+
+PREDICTION_SUMMARY_QUERY = """
+    SELECT
+        COALESCE(machine_id, '(unassigned)') AS machine_id,
+        mode,
+        COUNT(*) AS readings,
+        SUM(is_anomaly) AS anomalies,
+        AVG(score) AS mean_score,
+        MIN(score) AS min_score,
+        MAX(score) AS max_score,
+        datetime(MIN(ts), 'unixepoch') AS first_seen,
+        datetime(MAX(ts), 'unixepoch') AS last_seen
+    FROM predictions
+    GROUP BY machine_id, mode
+    ORDER BY anomalies DESC, readings DESC
+"""
+
+
+def anomaly_summary_report(bundle, prediction_log=None, csv_path: str = AI4I_PATH) -> pd.DataFrame:
+    """Per-machine outcomes from the prediction log, or per product type on the AI4I data if it is empty."""
+    if prediction_log is not None and prediction_log.has_rows():
+        conn = sqlite3.connect(prediction_log.db_path)
+        try:
+            out = pd.read_sql_query(PREDICTION_SUMMARY_QUERY, conn)
+        finally:
+            conn.close()
+        out["anomaly_rate"] = (out["anomalies"] / out["readings"]).round(4)
+        return out
+    df = pd.read_csv(csv_path, usecols=["Type", "Machine failure", *FEATURE_COLUMNS])
+    X = df[FEATURE_COLUMNS].values
+    scores = bundle.iforest.decision_function(bundle.scaler.transform(X))
+    summary = pd.DataFrame({
+        "Type": df["Type"].values,
+        "anomaly_score": scores,
+        "is_anomaly": (scores < 0).astype(int),
+        "actual_failure": df["Machine failure"].values,
+    })
+    if bundle.rf_model is not None:
+        summary["predicted_failure"] = bundle.rf_model.predict(X)
+    agg = {
+        "readings": ("anomaly_score", "size"),
+        "anomalies": ("is_anomaly", "sum"),
+        "mean_anomaly_score": ("anomaly_score", "mean"),
+        "min_anomaly_score": ("anomaly_score", "min"),
+        "actual_failures": ("actual_failure", "sum"),
+    }
+    if "predicted_failure" in summary:
+        agg["predicted_failures"] = ("predicted_failure", "sum")
+    out = summary.groupby("Type").agg(**agg).reset_index()
+    out["anomaly_rate"] = (out["anomalies"] / out["readings"]).round(4)
+    return out
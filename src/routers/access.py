@@ -0,0 +1,124 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+from pydantic import BaseModel
+
+try:
+    from .. import services
+    from ..exports import export_response
+except ImportError:  # loaded top-level by src/main.py
+    import services
+    from exports import export_response
+
+router = APIRouter()
+
+
+class AccessLog(BaseModel):
+    Log_ID: int
+    User_Name: str
+    Role: str
+    Door_Location: str
+    Access_Time: str
+    Access_Status: str
+    Door_Zone: str
+
+
+class AccessStat(BaseModel):
+    total_entries: int
+    security_alerts: int
+    active_doors: int
+
+
+ACCESS_LOG_QUERY = """
+    SELECT
+        AL.Log_ID,
+        U.User_Name,
+        U.Access_Level as Role,
+        D.Door_Location,
+        AL.Access_Time,
+        AL.Access_Status,
+        D.Zone as Door_Zone
+    FROM Access_Logs AL
+    JOIN Users U ON AL.User_ID = U.User_ID
+    JOIN Doors D ON AL.Door_ID = D.Door_ID
+"""
+# Declared types of the columns above (Access_Time is stored as text)
+ACCESS_LOG_TYPES = {
+    "Log_ID": "INTEGER",
+    "User_Name": "TEXT",
+    "Role": "TEXT",
+    "Door_Location": "TEXT",
+    "Access_Time": "TEXT",
+    "Access_Status": "TEXT",
+    "Door_Zone": "TEXT",
+}
+
+ACCESS_STATS_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM Access_Logs),
+        (SELECT COUNT(*) FROM Access_Logs WHERE Access_Status = 'Denied'),
+        (SELECT COUNT(*) FROM Doors),
+        (SELECT COALESCE(MAX(Log_ID), 0) FROM Access_Logs)
+"""
+
+
+def fetch_access_logs(limit: int = 50, after_id: Optional[int] = None):
+    with services.DB_POOL.connection(services.ACCESS_DB_PATH) as conn:
+        if after_id is None:
+            rows = conn.execute(ACCESS_LOG_QUERY + " ORDER BY AL.Access_Time DESC LIMIT ?", (limit,)).fetchall()
+        else:
+            rows = conn.execute(
+                ACCESS_LOG_QUERY + " WHERE AL.Log_ID > ? ORDER BY AL.Access_Time DESC LIMIT ?",
+                (after_id, limit),
+            ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def fetch_access_stats():
+    with services.DB_POOL.connection(services.ACCESS_DB_PATH) as conn:
+        total_entries, security_alerts, active_doors, last_log_id = conn.execute(ACCESS_STATS_QUERY).fetchone()
+    return {
+        "total_entries": total_entries,
+        "security_alerts": security_alerts,
+        "active_doors": active_doors
+    }, last_log_id
+
+
+@router.get("/api/access/logs", response_model=List[AccessLog])
+def get_access_logs(limit: int = 50):
+    return fetch_access_logs(limit)
+
+
+@router.get("/api/access/stats", response_model=AccessStat)
+def get_access_stats():
+    stats, _ = fetch_access_stats()
+    return stats
+
+
+# Chunked cursor reads streamed straight to the client: memory stays flat
+# regardless of table size. Long-lived, so they open their own connection
+# instead of holding one from the pool.
+@router.get("/api/access/logs/export")
+def export_access_logs(
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    gzip: bool = False,
+    status: Optional[str] = Query(None, pattern="^(Granted|Denied)$"),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    filters, params = [], []
+    if status:
+        filters.append("AL.Access_Status = ?")
+        params.append(status)
+    if start:
+        filters.append("AL.Access_Time >= ?")
+        params.append(start)
+    if end:
+        filters.append("AL.Access_Time < ?")
+        params.append(end)
+    where = f" WHERE {' AND '.join(filters)}" if filters else ""
+    # Log_ID order walks the rowid instead of sorting the whole table first
+    sql = ACCESS_LOG_QUERY + where + " ORDER BY AL.Log_ID"
+    return export_response(
+        sql, tuple(params), "access_logs", format, gzip, services.ACCESS_DB_PATH, ACCESS_LOG_TYPES,
+    )
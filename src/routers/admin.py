@@ -0,0 +1,82 @@
+"""
+Admin-only endpoints, disabled (404) unless ADMIN_TOKEN is set.
+
+Profiling a latency spike in place:
+  POST /admin/profile?requests=200&seconds=60     arm a session for /predict
+  GET  /admin/profile                              progress of the current/last session
+  GET  /admin/profile/report                       latency, hottest functions, top allocation sites
+  GET  /admin/profile/flamegraph                   folded stacks (flamegraph.pl / inferno / speedscope)
+  DELETE /admin/profile                            finish early
+"""
+import secrets
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+try:
+    from .. import services
+    from ..profiler import MAX_SECONDS, ProfileSession
+except ImportError:  # loaded top-level by src/main.py
+    import services
+    from profiler import MAX_SECONDS, ProfileSession
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    if not services.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, services.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)], include_in_schema=False)
+
+
+def finished_session() -> ProfileSession:
+    running = services.PROFILER.active
+    if running is not None:
+        raise HTTPException(status_code=409, detail=f"Profile session {running.id} is still running")
+    if services.PROFILER.last is None:
+        raise HTTPException(status_code=404, detail="No profile session has finished yet")
+    return services.PROFILER.last
+
+
+@router.post("/profile", status_code=202)
+def start_profile(
+    requests: Optional[int] = Query(100, ge=1, description="Profile this many matching requests"),
+    seconds: float = Query(30.0, gt=0, le=MAX_SECONDS, description="...or stop after this long"),
+    path: str = Query("/predict", description="Only requests whose path starts with this"),
+    interval_ms: float = Query(5.0, ge=1, le=100, description="Stack sampling interval"),
+    memory: bool = Query(True, description="Also diff tracemalloc snapshots (slows requests while on)"),
+) -> dict[str, Any]:
+    try:
+        session = services.PROFILER.start(requests, seconds, path, interval_ms / 1000, memory)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return session.status()
+
+
+@router.get("/profile")
+def profile_status() -> dict[str, Any]:
+    session = services.PROFILER.active or services.PROFILER.last
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profile session")
+    return session.status()
+
+
+@router.delete("/profile")
+def stop_profile() -> dict[str, Any]:
+    session = services.PROFILER.stop()
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profile session is running")
+    return session.status()
+
+
+@router.get("/profile/report")
+def profile_report() -> dict[str, Any]:
+    return finished_session().report()
+
+
+@router.get("/profile/flamegraph", response_class=PlainTextResponse)
+def profile_flamegraph() -> str:
+    return finished_session().folded()
@@ -0,0 +1,191 @@
+"""
+Dashboard, live push (Server-Sent Events) and energy history endpoints.
+
+The simulation ticks once per interval on its own scheduler; each tick is
+fanned out as encoded deltas to every open dashboard and buffered for the
+energy time-series store, which is written in batches off the event loop.
+"""
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+import numpy as np
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import Response, StreamingResponse
+
+try:
+    from ..live_feed import LiveFeed, encode_event
+    from ..serialization import ARROW, JSON, MSGPACK, encode, encode_columns, negotiate
+    from ..simulation_service import simulation, CHART_WINDOW_HOURS
+    from ..timeseries_store import TimeSeriesStore, ENERGY_CSV_PATH
+    from .access import fetch_access_logs, fetch_access_stats
+except ImportError:  # loaded top-level by src/main.py
+    from live_feed import LiveFeed, encode_event
+    from serialization import ARROW, JSON, MSGPACK, encode, encode_columns, negotiate
+    from simulation_service import simulation, CHART_WINDOW_HOURS
+    from timeseries_store import TimeSeriesStore, ENERGY_CSV_PATH
+    from routers.access import fetch_access_logs, fetch_access_stats
+
+router = APIRouter()
+
+
+# Snapshot reads only: no threadpool hop, no locks, no simulation side effects.
+# JSON by default; Accept: application/msgpack (both) or Arrow (chart) for other formats.
+@router.get("/api/dashboard/stats")
+async def get_dashboard_stats(request: Request):
+    return encode(simulation.get_dashboard_stats(), negotiate(request.headers.get("accept")))
+
+
+@router.get("/api/dashboard/chart")
+async def get_dashboard_chart(
+    request: Request,
+    window: float = Query(60, gt=0, le=CHART_WINDOW_HOURS * 3600, description="Seconds of history"),
+    points: int = Query(30, gt=0, le=2000, description="Max points; longer windows are averaged"),
+):
+    media = negotiate(request.headers.get("accept"), (JSON, MSGPACK, ARROW))
+    if media == ARROW:
+        ts, uv, pv = simulation.live_chart.columns(window, points)
+        return encode_columns({"ts": ts, "uv": uv, "pv": pv}, media)
+    if media == MSGPACK:
+        return encode(simulation.get_dashboard_chart(window, points), media)
+    return Response(content=simulation.get_dashboard_chart_json(window, points), media_type=JSON)
+
+
+# --- Live Push ---
+# Replaces per-client polling of the endpoints above.
+feed = LiveFeed()
+ACCESS_PUSH_INTERVAL = 4.0  # seconds between access-control DB checks
+_last_chart_point = None
+
+
+def push_dashboard_tick(snapshot):
+    global _last_chart_point
+    # Always diff against the previous tick so late subscribers get correct deltas
+    feed.publish_changes("stats", snapshot.stats)
+    point = snapshot.chart_point
+    if point is not _last_chart_point:
+        feed.publish("chart", point)
+        _last_chart_point = point
+
+
+simulation.on_tick(push_dashboard_tick)
+
+
+async def access_push_loop():
+    last_log_id = None
+    while True:
+        try:
+            if feed.subscriber_count("access"):
+                stats, max_log_id = await asyncio.to_thread(fetch_access_stats)
+                feed.publish_changes("access", stats)
+                if last_log_id is not None and max_log_id > last_log_id:
+                    new_logs = await asyncio.to_thread(fetch_access_logs, 50, last_log_id)
+                    feed.publish("access_logs", new_logs)
+                last_log_id = max_log_id
+        except Exception as e:
+            print(f"Access push failed: {e}")
+        await asyncio.sleep(ACCESS_PUSH_INTERVAL)
+
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.get("/api/stream/dashboard")
+async def stream_dashboard():
+    current = simulation.snapshot
+    snapshot = encode_event("snapshot", {"stats": current.stats, "chart": simulation.get_dashboard_chart()})
+    return StreamingResponse(
+        feed.stream(("stats", "chart"), initial=[snapshot]),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/api/stream/access")
+async def stream_access():
+    stats, _ = await asyncio.to_thread(fetch_access_stats)
+    logs = await asyncio.to_thread(fetch_access_logs)
+    snapshot = encode_event("snapshot", {"stats": stats, "logs": logs})
+    return StreamingResponse(
+        feed.stream(("access", "access_logs"), initial=[snapshot]),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+# --- Energy Time-Series Store ---
+# Minute/hour/day rollups fed by the historical CSV ("energy", "occupancy",
+# "temperature") and by simulation ticks, kept apart as "live_power" (kW)
+# and "live_occupancy" so instantaneous load never mixes with hourly kWh.
+energy_store = TimeSeriesStore()
+ENERGY_FLUSH_INTERVAL = 30.0  # seconds of ticks per store write
+_pending_ticks: list[tuple[float, float, float]] = []
+
+
+def record_energy_tick(snapshot):
+    # Runs on the event loop: buffer only, energy_flush_loop does the disk write
+    _pending_ticks.append((snapshot.created_at, simulation.current_energy, simulation.current_occupants))
+
+
+simulation.on_tick(record_energy_tick)
+
+
+def flush_energy_ticks(points: list[tuple[float, float, float]]) -> None:
+    if not points:
+        return
+    ts, power, occupancy = np.array(points).T
+    energy_store.ingest("live_power", ts, power)
+    energy_store.ingest("live_occupancy", ts, occupancy)
+
+
+async def energy_flush_loop():
+    global _pending_ticks
+    try:
+        while True:
+            await asyncio.sleep(ENERGY_FLUSH_INTERVAL)
+            points, _pending_ticks = _pending_ticks, []
+            try:
+                await asyncio.to_thread(flush_energy_ticks, points)
+            except Exception as e:
+                print(f"Energy store write failed: {e}")
+    except asyncio.CancelledError:
+        # shutdown: keep the last partial batch
+        points, _pending_ticks = _pending_ticks, []
+        flush_energy_ticks(points)
+        raise
+
+
+async def load_energy_history():
+    if energy_store.bounds("energy") is None and os.path.exists(ENERGY_CSV_PATH):
+        rows = await asyncio.to_thread(energy_store.ingest_csv, ENERGY_CSV_PATH)
+        print(f"Energy store seeded with {rows} rows from {ENERGY_CSV_PATH}")
+
+
+def start_background_tasks() -> list[asyncio.Task]:
+    return [
+        asyncio.create_task(simulation.run()),
+        asyncio.create_task(access_push_loop()),
+        asyncio.create_task(energy_flush_loop()),
+    ]
+
+
+def _epoch(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+@router.get("/api/energy/chart")
+def get_energy_chart(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    points: int = Query(48, gt=0, le=2000),
+    source: Literal["history", "live"] = Query("history", description="Hourly kWh history or live load (kW)"),
+):
+    # Resolution (minute/hour/day) is picked from the range so at most `points` rows come back
+    if source == "history" and energy_store.bounds("energy") is None:
+        return simulation.get_energy_chart()
+    return energy_store.energy_chart(_epoch(start), _epoch(end), points, source)
@@ -0,0 +1,127 @@
+"""
+Model, cache and prediction-log endpoints. The app mounts this router both
+at the root (v2 paths such as /models) and under /api (Aurora paths such as
+/api/models), so the two route sets share one handler each.
+"""
+from typing import Any, Optional
+
+from fastapi import APIRouter, Query
+
+try:
+    from .. import services
+    from ..exports import export_response, table_column_types
+except ImportError:  # loaded top-level by src/main.py
+    import services
+    from exports import export_response, table_column_types
+
+router = APIRouter()
+
+
+@router.get("/health")
+def health_check() -> dict[str, Any]:
+    bundle = services.REGISTRY.current
+    kmeans_scaler = bundle.online_kmeans_scaler
+    return {
+        "status": "ok",
+        "unsupervised_model_loaded": bundle.iforest is not None,
+        "supervised_model_loaded": bundle.rf_model is not None,
+        "kmeans_model_loaded": bundle.kmeans is not None,
+        "model_version": bundle.version,
+        "scaler_version": bundle.online_scaler.current.version,
+        "kmeans_scaler_version": kmeans_scaler.current.version if kmeans_scaler else None,
+    }
+
+
+@router.get("/models")
+def get_models() -> dict[str, Any]:
+    return services.REGISTRY.status()
+
+
+@router.post("/models/reload")
+def reload_models() -> dict[str, Any]:
+    """Check models/ now instead of waiting for the next watcher poll; also rescans models/segments/."""
+    swapped = services.REGISTRY.reload()
+    services.MODEL_ROUTER.refresh()
+    return {"swapped": swapped, **services.REGISTRY.status()}
+
+
+@router.get("/models/segments")
+def segment_models() -> dict[str, Any]:
+    return services.MODEL_ROUTER.stats()
+
+
+@router.post("/scaler/publish")
+def publish_scalers() -> dict[str, Any]:
+    """Freeze the running statistics into new scaler versions right away."""
+    bundle = services.REGISTRY.current
+    kmeans_scaler = bundle.online_kmeans_scaler
+    return {
+        "scaler_version": bundle.online_scaler.publish().version,
+        "kmeans_scaler_version": kmeans_scaler.publish().version if kmeans_scaler else None,
+    }
+
+
+@router.get("/cache/stats")
+def cache_stats() -> dict[str, Any]:
+    return services.PREDICTION_CACHE.stats()
+
+
+@router.get("/features/stats")
+def temporal_feature_stats() -> dict[str, Any]:
+    return services.TEMPORAL_FEATURES.stats()
+
+
+@router.get("/drift/stats")
+def drift_stats() -> dict[str, Any]:
+    """PSI and binned KS per feature of live /predict readings vs the training data."""
+    return services.DRIFT_MONITOR.stats()
+
+
+@router.get("/db/stats")
+def db_pool_stats() -> dict[str, Any]:
+    return services.DB_POOL.stats()
+
+
+@router.get("/predictions/history")
+def prediction_history(
+    machine_id: Optional[str] = None,
+    start: Optional[float] = Query(None, description="Epoch seconds, inclusive"),
+    end: Optional[float] = Query(None, description="Epoch seconds, exclusive"),
+    limit: int = Query(500, ge=1, le=10_000),
+) -> dict[str, Any]:
+    """Newest-first scores logged for one machine; omit machine_id for readings sent without one."""
+    return {
+        "machine_id": machine_id,
+        "predictions": services.PREDICTION_LOG.history(machine_id, start, end, limit),
+    }
+
+
+@router.get("/predictions/stats")
+def prediction_log_stats() -> dict[str, Any]:
+    return services.PREDICTION_LOG.stats()
+
+
+@router.get("/predictions/export")
+def export_predictions(
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    gzip: bool = False,
+    machine_id: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+):
+    filters, params = [], []
+    if machine_id:
+        filters.append("machine_id = ?")
+        params.append(machine_id)
+    if start is not None:
+        filters.append("ts >= ?")
+        params.append(start)
+    if end is not None:
+        filters.append("ts < ?")
+        params.append(end)
+    where = f" WHERE {' AND '.join(filters)}" if filters else ""
+    sql = "SELECT * FROM predictions" + where + " ORDER BY id"
+    path = services.PREDICTION_LOG_PATH
+    return export_response(
+        sql, tuple(params), "predictions", format, gzip, path, table_column_types(path, "predictions"),
+    )
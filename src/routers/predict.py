@@ -0,0 +1,376 @@
+"""
+POST /predict for both request shapes the API has served:
+
+  v2      POST /predict?mode=unsupervised|supervised
+          -> PredictionResponse with the K-Means operating mode
+  Aurora  POST /predict with "model_type": "isolation_forest"|"random_forest" in the body
+          -> {"is_anomaly", "anomaly_score", "model", ["failure_modes"]}
+
+A ``mode`` query parameter selects v2; otherwise a ``model_type`` in the
+body selects the Aurora shape; a request with neither gets
+``services.PREDICT_DEFAULT_SHAPE`` (v2 unsupervised, or Aurora isolation_forest
+when started through src/main.py).
+Both adapters score through ``score_reading`` on the same model bundle, or on
+the per-site/asset-type segment bundle the reading routes to (model_router.py).
+
+Bodies may be JSON or msgpack and responses follow Accept (see
+serialization.py). POST /predict/batch scores many readings at once and
+also takes and returns Arrow IPC tables.
+"""
+from typing import Any, Literal
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, ValidationError
+
+try:
+    from .. import services
+    from ..model_registry import ModelBundle
+    from ..model_service import (
+        FEATURE_COLUMNS,
+        predict_failure_modes_single, predict_single, predict_supervised_single,
+    )
+    from ..serialization import ARROW, JSON, MSGPACK, columns_from_body, decode_body, encode, encode_columns, is_json, negotiate
+except ImportError:  # loaded top-level by src/main.py
+    import services
+    from model_registry import ModelBundle
+    from model_service import (
+        FEATURE_COLUMNS,
+        predict_failure_modes_single, predict_single, predict_supervised_single,
+    )
+    from serialization import ARROW, JSON, MSGPACK, columns_from_body, decode_body, encode, encode_columns, is_json, negotiate
+
+router = APIRouter()
+
+CLUSTER_NAMES = {
+    0: "Low-load operation",
+    1: "Normal operation",
+    2: "High-load operation",
+    3: "Extreme/stressed operation",
+}
+CLUSTER_RECS = {
+    0: ["Less frequent checks", "Economical HVAC setting"],
+    1: ["Standard monitoring", "Log KPIs"],
+    2: ["Increase monitoring", "Plan maintenance soon"],
+    3: ["Avoid max load", "Schedule maintenance ASAP"],
+}
+
+
+class SensorReading(BaseModel):
+    # AI4I column names, plus the field names either app accepted before
+    rotational_speed_rpm: float = Field(
+        alias="Rotational speed [rpm]",
+        validation_alias=AliasChoices("Rotational speed [rpm]", "rotational_speed_rpm", "rotational_speed"),
+    )
+    process_temperature_k: float = Field(
+        alias="Process temperature [K]",
+        validation_alias=AliasChoices("Process temperature [K]", "process_temperature_k", "temperature"),
+    )
+    torque_nm: float = Field(
+        alias="Torque [Nm]",
+        validation_alias=AliasChoices("Torque [Nm]", "torque_nm", "torque"),
+    )
+    tool_wear_min: float = Field(
+        alias="Tool wear [min]",
+        validation_alias=AliasChoices("Tool wear [min]", "tool_wear_min", "tool_wear"),
+    )
+    machine_id: str | None = None
+    # Route to a per-segment model when models/segments/ has one (see model_router.py)
+    site: str | None = None
+    asset_type: str | None = Field(None, validation_alias=AliasChoices("Type", "asset_type"))
+    # Aurora shape: "isolation_forest" (default there) or "random_forest"
+    model_type: str | None = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    def values(self) -> tuple[float, float, float, float]:
+        return (self.rotational_speed_rpm, self.process_temperature_k, self.torque_nm, self.tool_wear_min)
+
+
+def parse_reading(body: bytes, content_type: str | None) -> SensorReading:
+    """SensorReading from a JSON or msgpack body.
+
+    JSON is validated straight from bytes by pydantic-core, which is cheaper
+    than decoding to a dict first; errors keep FastAPI's 422 shape.
+    """
+    try:
+        if is_json(content_type):
+            return SensorReading.model_validate_json(body)
+        return SensorReading.model_validate(decode_body(body, content_type))
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)])
+
+
+class PredictionResponse(BaseModel):
+    is_anomaly: Literal[0, 1]
+    anomaly_score: float
+    # None when the model bundle has no K-Means
+    operating_mode_cluster: int | None
+    cluster_name: str
+    cluster_confidence: float | None
+    cluster_recommendations: list[str]
+    # TWF/HDF/PWF/OSF/RNF probabilities, when supervised mode ran the failure-mode forest
+    failure_modes: dict[str, float] | None = None
+
+
+def current_bundle() -> ModelBundle:
+    try:
+        return services.REGISTRY.current
+    except RuntimeError:
+        raise HTTPException(status_code=503, detail="ML models unavailable")
+
+
+def segment_bundle(site: str | None, asset_type: str | None) -> tuple[str | None, ModelBundle]:
+    """(segment, bundle) for a site/asset type; segment is None for the global bundle."""
+    segment = services.MODEL_ROUTER.resolve(site, asset_type)
+    if segment is None:
+        return None, current_bundle()
+    try:
+        return segment, services.MODEL_ROUTER.bundle(segment)
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def score_reading(
+    bundle: ModelBundle,
+    scaler: Any,
+    features: np.ndarray,
+    supervised: bool,
+    temporal_row: np.ndarray | None = None,
+) -> dict[str, Any]:
+    """Failure score of one reading: IsolationForest, or the best RandomForest the bundle has."""
+    reading = dict(zip(FEATURE_COLUMNS, features[0]))
+    if not supervised:
+        return predict_single(reading, bundle.iforest, scaler)
+    if temporal_row is not None:
+        X = temporal_row.reshape(1, -1)
+        return {
+            "is_anomaly": int(bundle.rf_temporal.predict(X)[0]),
+            "anomaly_score": float(bundle.rf_temporal.predict_proba(X)[0][1]),
+            "model": "Random Forest (temporal)",
+        }
+    if bundle.rf_model is not None:
+        # RF model was trained on unscaled features. It keeps the alarm: the
+        # failure-mode forest is unweighted and trades recall for precision.
+        result = predict_supervised_single(reading, bundle.rf_model)
+        if bundle.rf_modes is not None:
+            result["failure_modes"] = predict_failure_modes_single(reading, bundle.rf_modes)["failure_modes"]
+        return result
+    if bundle.rf_modes is not None:
+        # overall failure and every mode from a single forest pass
+        return predict_failure_modes_single(reading, bundle.rf_modes)
+    raise HTTPException(status_code=503, detail="Random Forest model unavailable")
+
+
+def operating_mode(
+    bundle: ModelBundle, kmeans_scaler_snapshot: Any, features: np.ndarray,
+) -> tuple[int | None, float | None]:
+    if kmeans_scaler_snapshot is None:  # bundle without K-Means
+        return None, None
+    grid = bundle.kmeans_grid
+    # grid is only valid for the scaler snapshot it was built from
+    if grid is not None and grid.scaler_version == kmeans_scaler_snapshot.version:
+        hit = grid.lookup(features[0].tolist())
+        if hit is not None:
+            return hit
+    kmeans_scaled = kmeans_scaler_snapshot.transform(features)
+    # label + confidence (1 / (1 + distance to center)) from one matrix op
+    cluster_ids, confidences = bundle.kmeans_index.assign_with_confidence(kmeans_scaled)
+    return int(cluster_ids[0]), float(confidences[0])
+
+
+def advance_window(reading: SensorReading, features: np.ndarray) -> np.ndarray | None:
+    # Every reading with a machine id advances its window, whatever the mode
+    if reading.machine_id is None:
+        return None
+    return services.TEMPORAL_FEATURES.update(reading.machine_id, features[0])
+
+
+def log_prediction(reading: SensorReading, source: str, mode: str, model_version: int, segment: str | None,
+                   is_anomaly: int, score: float, cluster: int | None = None) -> None:
+    services.PREDICTION_LOG.record(
+        source=source,
+        mode=mode,
+        machine_id=reading.machine_id,
+        model_version=model_version,
+        features=reading.values(),
+        is_anomaly=is_anomaly,
+        score=score,
+        cluster=cluster,
+        segment=segment,
+    )
+
+
+def predict_v2(reading: SensorReading, mode: str) -> dict[str, Any]:
+    """PredictionResponse fields as a plain dict, ready to encode without a model_dump."""
+    features = np.array([reading.values()])
+    # Pin the model bundle and scaler snapshots once so a concurrent reload or
+    # publish can't mix versions mid-request
+    segment, bundle = segment_bundle(reading.site, reading.asset_type)
+    scaler_snapshot = bundle.online_scaler.current
+    has_kmeans = bundle.online_kmeans_scaler is not None
+    kmeans_scaler_snapshot = bundle.online_kmeans_scaler.current if has_kmeans else None
+
+    if services.ONLINE_SCALER_UPDATES:
+        bundle.online_scaler.partial_fit(features)
+        if has_kmeans:
+            bundle.online_kmeans_scaler.partial_fit(features)
+
+    services.DRIFT_MONITOR.observe(reading.values())
+    temporal_row = advance_window(reading, features)
+    # Temporal scores depend on history, so they bypass the reading cache
+    use_temporal = (
+        services.TEMPORAL_SCORING and mode == "supervised" and temporal_row is not None
+        and bundle.rf_temporal is not None
+    )
+
+    # Segment bundles are reloaded after eviction with version 1 again, so
+    # loaded_at is what tells two loads of one segment apart
+    cache_key = services.PREDICTION_CACHE.key(
+        features[0], mode,
+        (segment, bundle.loaded_at, scaler_snapshot.version, kmeans_scaler_snapshot and kmeans_scaler_snapshot.version),
+    )
+    response = None if use_temporal else services.PREDICTION_CACHE.get(cache_key)
+    if response is None:
+        result = score_reading(
+            bundle, scaler_snapshot.scaler, features, mode == "supervised", temporal_row if use_temporal else None,
+        )
+        cluster_id, confidence = operating_mode(bundle, kmeans_scaler_snapshot, features)
+        response = {
+            "is_anomaly": result["is_anomaly"],
+            "anomaly_score": result["anomaly_score"],
+            "operating_mode_cluster": cluster_id,
+            "cluster_name": CLUSTER_NAMES.get(cluster_id, "Unknown"),
+            "cluster_confidence": confidence,
+            "cluster_recommendations": CLUSTER_RECS.get(cluster_id, []),
+            "failure_modes": result.get("failure_modes"),
+        }
+        if not use_temporal:
+            services.PREDICTION_CACHE.put(cache_key, response)
+    log_prediction(
+        reading, "api", "supervised_temporal" if use_temporal else mode, bundle.version, segment,
+        response["is_anomaly"], response["anomaly_score"], response["operating_mode_cluster"],
+    )
+    return response
+
+
+def predict_aurora(reading: SensorReading) -> dict[str, Any]:
+    features = np.array([reading.values()])
+    segment, bundle = segment_bundle(reading.site, reading.asset_type)
+    scaler_snapshot = bundle.online_scaler.current
+    supervised = reading.model_type == "random_forest"
+
+    services.DRIFT_MONITOR.observe(reading.values())
+    temporal_row = advance_window(reading, features)
+    use_temporal = (
+        services.TEMPORAL_SCORING and supervised and temporal_row is not None and bundle.rf_temporal is not None
+    )
+
+    cache_key = services.PREDICTION_CACHE.key(
+        features[0], reading.model_type, (segment, bundle.loaded_at, scaler_snapshot.version),
+    )
+    result = None if use_temporal else services.PREDICTION_CACHE.get(cache_key)
+    if result is None:
+        result = score_reading(
+            bundle, scaler_snapshot.scaler, features, supervised, temporal_row if use_temporal else None,
+        )
+        if not use_temporal:
+            services.PREDICTION_CACHE.put(cache_key, result)
+    log_prediction(
+        reading, "main", reading.model_type, bundle.version, segment, result["is_anomaly"], result["anomaly_score"],
+    )
+    return result
+
+
+@router.options("/predict")
+def options_predict() -> dict[str, Any]:
+    return {}
+
+
+@router.get("/predict")
+def get_predict_info() -> dict[str, str]:
+    return {
+        "detail": (
+            "Use POST /predict?mode=unsupervised|supervised with JSON body "
+            "{'Rotational speed [rpm]', 'Process temperature [K]', "
+            "'Torque [Nm]', 'Tool wear [min]'}. "
+            "Returns failure risk + operating mode cluster. "
+            "Without ?mode, a body 'model_type' of isolation_forest|random_forest "
+            "returns the Aurora response instead."
+        )
+    }
+
+
+PREDICT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            media: {"schema": SensorReading.model_json_schema(by_alias=True)} for media in (JSON, MSGPACK)
+        },
+    },
+}
+
+
+@router.post(
+    "/predict",
+    response_model=None,
+    openapi_extra=PREDICT_BODY,
+    responses={200: {"model": PredictionResponse, "content": {MSGPACK: {}}}},
+)
+async def predict(
+    request: Request,
+    mode: Literal["unsupervised", "supervised"] | None = Query(None),
+) -> Response:
+    media = negotiate(request.headers.get("accept"))
+    reading = parse_reading(await request.body(), request.headers.get("content-type"))
+    if mode is None and reading.model_type is None and services.PREDICT_DEFAULT_SHAPE == "aurora":
+        reading.model_type = "isolation_forest"
+    if mode is None and reading.model_type is not None:
+        result = await run_in_threadpool(predict_aurora, reading)
+    else:
+        result = await run_in_threadpool(predict_v2, reading, mode or "unsupervised")
+    return encode(result, media)
+
+
+def score_batch(X: np.ndarray, mode: str, site: str | None = None,
+                asset_type: str | None = None) -> dict[str, np.ndarray]:
+    _, bundle = segment_bundle(site, asset_type)
+    try:
+        return bundle.score_batch(X, mode)
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/predict/batch", response_model=None)
+async def predict_batch(
+    request: Request,
+    mode: Literal["unsupervised", "supervised"] = Query("unsupervised"),
+    site: str | None = Query(None, description="Score with this site's segment models, if any"),
+    asset_type: str | None = Query(None, description="Score with this asset type's (L/M/H) segment models, if any"),
+) -> Response:
+    """Score many readings in one call.
+
+    The body is an Arrow IPC stream, or JSON/msgpack records or columns,
+    with the four AI4I feature columns. The response has one column per
+    output (is_anomaly, anomaly_score, operating_mode_cluster,
+    cluster_confidence, plus failure-mode probabilities in supervised mode),
+    in the same row order. Batches are stateless: they are not logged and do
+    not advance per-machine windows.
+    """
+    media = negotiate(request.headers.get("accept"), (JSON, MSGPACK, ARROW))
+    columns = columns_from_body(await request.body(), request.headers.get("content-type"), FEATURE_COLUMNS)
+    missing = [c for c in FEATURE_COLUMNS if c not in columns]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing feature columns: {missing}")
+    try:
+        X = np.column_stack([np.asarray(columns[c], dtype=float) for c in FEATURE_COLUMNS])
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Feature columns must be numeric and equally long: {e}")
+    if not np.isfinite(X).all():
+        raise HTTPException(status_code=422, detail="Feature values must be finite")
+    if len(X) == 0:
+        return encode_columns({}, media)
+    return encode_columns(await run_in_threadpool(score_batch, X, mode, site, asset_type), media)
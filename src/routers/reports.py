@@ -0,0 +1,73 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+try:
+    from .. import services
+    from ..report_jobs import (
+        ReportQueue, ReportQueueFull,
+        energy_consumption_report, access_denial_report, anomaly_summary_report,
+    )
+    from ..rul import load_rul_model, rul_plan_report
+    from ..simulation_service import simulation
+    from .dashboard import energy_store
+except ImportError:  # loaded top-level by src/main.py
+    import services
+    from report_jobs import (
+        ReportQueue, ReportQueueFull,
+        energy_consumption_report, access_denial_report, anomaly_summary_report,
+    )
+    from rul import load_rul_model, rul_plan_report
+    from simulation_service import simulation
+    from routers.dashboard import energy_store
+
+router = APIRouter()
+
+# Reports run on a small bounded pool; the request only enqueues and returns the job
+report_queue = ReportQueue({
+    "energy": (
+        "Energy Consumption Report",
+        lambda: energy_consumption_report(energy_store, simulation.tick_interval),
+    ),
+    "access_denials": ("Access Denial Analysis", lambda: access_denial_report(services.ACCESS_DB_PATH)),
+    "anomaly_summary": (
+        "Model Anomaly Summary",
+        lambda: anomaly_summary_report(services.REGISTRY.current, services.PREDICTION_LOG),
+    ),
+    # machines seen by /predict in the last 24h, trained with `python -m src.rul`
+    "rul_plan": ("Maintenance RUL Plan", lambda: rul_plan_report(load_rul_model(), services.PREDICTION_LOG_PATH)),
+})
+
+
+@router.get("/api/reports")
+def get_reports():
+    return [job.to_dict() for job in report_queue.list()]
+
+
+@router.post("/api/reports/generate", status_code=202)
+def generate_report(kind: str = "energy"):
+    try:
+        job = report_queue.submit(kind)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown report kind '{kind}'. Use one of {list(report_queue.reports)}")
+    except ReportQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_dict()
+
+
+@router.get("/api/reports/{job_id}")
+def get_report(job_id: str):
+    job = report_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return job.to_dict()
+
+
+@router.get("/api/reports/{job_id}/download")
+def download_report(job_id: str):
+    job = report_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if job.status != "Ready":
+        raise HTTPException(status_code=409, detail=f"Report is {job.status}")
+    filename = f"{job.name.replace(' ', '_')}_{job.id}.csv"
+    return FileResponse(job.path, media_type="text/csv", filename=filename)
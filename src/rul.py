@@ -0,0 +1,227 @@
+"""
+Remaining-useful-life estimation from tool wear trajectories.
+
+Trained on the AI4I failure-mode columns:
+  TWF - tool wear failure: the wear level tools fail at
+  OSF - overstrain: wear x torque limit, per product Type
+  PWF / HDF - power and heat-dissipation failures, which depend on the
+              operating point rather than on wear; shallow trees flag them
+
+Wear advances with operating time, so the remaining wear budget divided
+by a machine's wear rate (tool-wear minutes per hour, taken from its
+recent history) gives hours until the first threshold is reached.
+
+Run from the repo root:  python -m src.rul
+"""
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+
+DATA_PATH = os.path.join("data", "ai4i2020.csv")
+RUL_MODEL_PATH = os.path.join("models", "rul_model.pkl")
+
+WEAR = "Tool wear [min]"
+TORQUE = "Torque [Nm]"
+SPEED = "Rotational speed [rpm]"
+PROCESS_TEMP = "Process temperature [K]"
+AIR_TEMP = "Air temperature [K]"
+
+# Tool wear is measured in minutes of use, so a tool in continuous operation
+# wears 60 wear-minutes per hour.
+DEFAULT_WEAR_RATE = 60.0
+HISTORY_WINDOW = 32
+
+
+def _power_features(torque: np.ndarray, speed: np.ndarray) -> np.ndarray:
+    power = torque * speed * 2 * np.pi / 60
+    return np.column_stack((torque, speed, power))
+
+
+def _heat_features(air: np.ndarray, process: np.ndarray, speed: np.ndarray) -> np.ndarray:
+    return np.column_stack((process - air, speed))
+
+
+def _condition_tree(X: np.ndarray, y: np.ndarray) -> DecisionTreeClassifier:
+    return DecisionTreeClassifier(max_depth=4, min_samples_leaf=5, random_state=42).fit(X, y)
+
+
+@dataclass
+class RULModel:
+    twf_wear: float
+    osf_strain: dict[str, float]
+    pwf_tree: DecisionTreeClassifier
+    hdf_tree: DecisionTreeClassifier
+    default_type: str = "M"
+    fitted_on: dict = field(default_factory=dict)
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, quantile: float = 0.05) -> "RULModel":
+        """Thresholds are a low quantile of wear (strain) among rows that failed that way."""
+        twf_wear = float(df.loc[df["TWF"] == 1, WEAR].quantile(quantile))
+        strain = df[WEAR] * df[TORQUE]
+        osf_strain = strain[df["OSF"] == 1].groupby(df["Type"]).quantile(quantile).to_dict()
+        return cls(
+            twf_wear=twf_wear,
+            osf_strain={k: float(v) for k, v in osf_strain.items()},
+            pwf_tree=_condition_tree(_power_features(df[TORQUE].values, df[SPEED].values), df["PWF"].values),
+            hdf_tree=_condition_tree(
+                _heat_features(df[AIR_TEMP].values, df[PROCESS_TEMP].values, df[SPEED].values), df["HDF"].values
+            ),
+            fitted_on={"rows": len(df), "quantile": quantile},
+        )
+
+    def score_fleet(self, fleet: pd.DataFrame) -> pd.DataFrame:
+        """RUL for every row (asset) of ``fleet`` at once.
+
+        Needs ``Tool wear``, ``Torque`` and ``Rotational speed`` columns;
+        ``Type``, ``wear_rate`` (wear-minutes per hour) and both
+        temperatures are optional. Without the temperatures HDF is not
+        assessed (NaN risk).
+        """
+        n = len(fleet)
+        wear = fleet[WEAR].to_numpy(dtype=float)
+        torque = fleet[TORQUE].to_numpy(dtype=float)
+        speed = fleet[SPEED].to_numpy(dtype=float)
+        types = fleet["Type"].to_numpy() if "Type" in fleet else np.full(n, self.default_type)
+        rate = fleet["wear_rate"].to_numpy(dtype=float) if "wear_rate" in fleet else np.full(n, DEFAULT_WEAR_RATE)
+        rate = np.where(np.isfinite(rate) & (rate > 0), rate, DEFAULT_WEAR_RATE)
+
+        twf_left = np.maximum(self.twf_wear - wear, 0.0)
+        fallback = self.osf_strain.get(self.default_type, min(self.osf_strain.values()))
+        strain_limit = pd.Series(types).map(self.osf_strain).fillna(fallback).to_numpy(dtype=float)
+        with np.errstate(divide="ignore"):
+            osf_left = np.where(torque > 0, np.maximum(strain_limit / torque - wear, 0.0), np.inf)
+
+        pwf_risk = self.pwf_tree.predict_proba(_power_features(torque, speed))[:, 1]
+        if AIR_TEMP in fleet and PROCESS_TEMP in fleet:
+            hdf_risk = self.hdf_tree.predict_proba(_heat_features(
+                fleet[AIR_TEMP].to_numpy(dtype=float), fleet[PROCESS_TEMP].to_numpy(dtype=float), speed,
+            ))[:, 1]
+        else:
+            hdf_risk = np.full(n, np.nan)
+
+        wear_left = np.minimum(twf_left, osf_left)
+        rul_hours = wear_left / rate
+        limiting = np.where(twf_left <= osf_left, "TWF", "OSF").astype(object)
+        # An operating point that already sits in a power/heat failure region leaves no life
+        for mode, risk in (("HDF", hdf_risk), ("PWF", pwf_risk)):
+            active = risk >= 0.5
+            rul_hours[active] = 0.0
+            limiting[active] = mode
+        return pd.DataFrame({
+            "twf_wear_left": twf_left,
+            "osf_wear_left": osf_left,
+            "wear_rate": rate,
+            "rul_hours": rul_hours,
+            "limiting_mode": limiting,
+            "pwf_risk": pwf_risk,
+            "hdf_risk": hdf_risk,
+        }, index=fleet.index)
+
+    def save(self, path: str = RUL_MODEL_PATH) -> None:
+        # Plain fields, not the class, so the file loads whether this module
+        # was imported as rul, src.rul or run as __main__
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(vars(self), path)
+
+
+def load_rul_model(path: str = RUL_MODEL_PATH) -> RULModel:
+    return RULModel(**joblib.load(path))
+
+
+def fleet_from_history(
+    history: pd.DataFrame,
+    machine_col: str = "machine_id",
+    time_col: str = "ts",
+    window: int = HISTORY_WINDOW,
+) -> pd.DataFrame:
+    """Collapse per-reading history (epoch-second ``time_col``) into one row per machine.
+
+    Uses each machine's last ``window`` readings: latest wear, mean operating
+    point, and the least-squares wear slope as ``wear_rate``. All groups are
+    reduced together with grouped sums, no per-machine Python loop.
+    """
+    recent = history.sort_values([machine_col, time_col]).groupby(machine_col).tail(window)
+    groups = recent.groupby(machine_col)
+    hours = recent[time_col] / 3600.0
+    dt = hours - groups[time_col].transform("mean") / 3600.0
+    dw = recent[WEAR] - groups[WEAR].transform("mean")
+    sxy = (dt * dw).groupby(recent[machine_col]).sum()
+    sxx = (dt * dt).groupby(recent[machine_col]).sum()
+
+    columns = [c for c in (TORQUE, SPEED, PROCESS_TEMP, AIR_TEMP) if c in recent]
+    fleet = groups[columns].mean()
+    fleet[WEAR] = groups[WEAR].last()
+    if "Type" in recent:
+        fleet["Type"] = groups["Type"].last()
+    fleet["wear_rate"] = (sxy / sxx.where(sxx > 0)).reindex(fleet.index)
+    fleet["readings"] = groups.size()
+    fleet["last_seen"] = groups[time_col].max()
+    return fleet
+
+
+PREDICTION_HISTORY_QUERY = """
+    SELECT machine_id, ts,
+           rotational_speed_rpm AS "Rotational speed [rpm]",
+           process_temperature_k AS "Process temperature [K]",
+           torque_nm AS "Torque [Nm]",
+           tool_wear_min AS "Tool wear [min]"
+    FROM predictions
+    WHERE machine_id IS NOT NULL AND ts >= ?
+"""
+
+
+def fleet_from_prediction_log(db_path: str, since_hours: float = 24.0) -> pd.DataFrame:
+    """Fleet table built from the readings /predict logged in the last ``since_hours``."""
+    conn = sqlite3.connect(db_path)
+    try:
+        history = pd.read_sql_query(PREDICTION_HISTORY_QUERY, conn, params=(time.time() - since_hours * 3600,))
+    finally:
+        conn.close()
+    return fleet_from_history(history)
+
+
+def rul_plan_report(model: RULModel, db_path: str, since_hours: float = 24.0) -> pd.DataFrame:
+    """Machines seen in the prediction log, soonest maintenance first."""
+    fleet = fleet_from_prediction_log(db_path, since_hours)
+    if fleet.empty:
+        return pd.DataFrame(columns=["machine_id", "rul_hours", "limiting_mode"])
+    scored = model.score_fleet(fleet)
+    out = pd.concat([fleet[[WEAR, "readings", "last_seen"]], scored], axis=1)
+    out["last_seen"] = pd.to_datetime(out["last_seen"], unit="s").dt.strftime("%Y-%m-%d %H:%M:%S")
+    return out.sort_values("rul_hours").reset_index().round(3)
+
+
+if __name__ == "__main__":
+    df = pd.read_csv(DATA_PATH)
+    # Evaluate on the last 20% of rows in time, fit on the rows before them
+    split = int(len(df) * 0.8)
+    train, test = df.iloc[:split], df.iloc[split:].reset_index(drop=True)
+    scored = RULModel.fit(train).score_fleet(test)
+    print(f"Held-out evaluation on the last {len(test)} rows:")
+    for mode in ("PWF", "HDF"):
+        flagged = scored["limiting_mode"] == mode
+        print(f"{mode} flagged {flagged.sum()} rows, {test.loc[flagged, mode].sum()} of {test[mode].sum()} actual")
+    wear_modes = (test["TWF"] == 1) | (test["OSF"] == 1)
+    print(f"Median wear left at TWF/OSF failures: {scored.loc[wear_modes, ['twf_wear_left', 'osf_wear_left']].min(axis=1).median():.1f} min")
+
+    # The saved model uses every row
+    model = RULModel.fit(df)
+    model.save()
+    print(f"TWF wear threshold: {model.twf_wear:.1f} min")
+    print("OSF strain thresholds:", {k: round(v) for k, v in model.osf_strain.items()})
+
+    n_assets = 100_000
+    rng = np.random.default_rng(0)
+    fleet = df.sample(n_assets, replace=True, random_state=0).reset_index(drop=True)
+    fleet["wear_rate"] = rng.uniform(20, 60, n_assets)
+    t0 = time.perf_counter()
+    model.score_fleet(fleet)
+    print(f"Scored {n_assets} assets in {time.perf_counter() - t0:.3f}s")
+    print(f"Saved RUL model to {RUL_MODEL_PATH}")
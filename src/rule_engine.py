@@ -0,0 +1,161 @@
+import operator
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+@dataclass(frozen=True)
+class Condition:
+    column: str
+    op: str  # one of OPERATORS, or "in"
+    value: Any
+
+    def mask(self, columns: dict[str, np.ndarray]) -> np.ndarray:
+        values = columns[self.column]
+        if self.op == "in":
+            return np.isin(values, list(self.value))
+        return OPERATORS[self.op](values, self.value)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """IF all ``when`` conditions hold THEN assign ``then``; no ``then`` = flag-only rule."""
+
+    name: str
+    when: tuple[Condition, ...]
+    then: dict[str, Any] = field(default_factory=dict)
+
+
+# The Session 7 notebook rules
+DEFAULT_RULES = [
+    {"name": "energy_saver", "when": [["Occupancy_Count", "==", 0]], "then": {"Lights_Status": "OFF"}},
+    {"name": "eco_mode", "when": [["Occupancy_Count", ">", 0], ["Occupancy_Count", "<", 5]],
+     "then": {"AC_Status": "LOW POWER"}},
+    {"name": "overcrowded", "when": [["Occupancy_Count", ">", 20]]},
+]
+
+
+def compile_rules(specs: Iterable[dict[str, Any]]) -> "RuleEngine":
+    """Build an engine from ``{"name", "when": [[column, op, value], ...], "then": {...}}`` specs."""
+    rules = []
+    for spec in specs:
+        conditions = []
+        for column, op, value in spec["when"]:
+            if op not in OPERATORS and op != "in":
+                raise ValueError(f"Rule {spec['name']!r}: unknown operator {op!r}")
+            conditions.append(Condition(column, op, value))
+        if not conditions:
+            raise ValueError(f"Rule {spec['name']!r} has no conditions")
+        rules.append(Rule(spec["name"], tuple(conditions), dict(spec.get("then", {}))))
+    return RuleEngine(rules)
+
+
+@dataclass
+class RuleResult:
+    # column -> (positions of changed rows, their new values)
+    changes: dict[str, tuple[np.ndarray, np.ndarray]]
+    # rule name -> positions of rows it matched
+    fired: dict[str, np.ndarray]
+
+    @property
+    def changed_rows(self) -> np.ndarray:
+        if not self.changes:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate([rows for rows, _ in self.changes.values()]))
+
+
+State = Mapping[str, np.ndarray] | pd.DataFrame
+
+
+class RuleEngine:
+    """Evaluates every rule as one boolean mask over whole state columns.
+
+    State is a mapping of column name to equal-length NumPy arrays (a
+    DataFrame works too, but fixed-width ``<U`` string arrays keep status
+    comparisons in C instead of per-object; size them for the longest
+    value a rule assigns). Rules apply in order, so a later rule overrides
+    an earlier one on the same column, like running the notebook's UPDATEs
+    one after another. Only rows whose value actually differs from the
+    current state are reported as changes.
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        self.input_columns = sorted({c.column for r in rules for c in r.when})
+        self.output_columns = sorted({col for r in rules for col in r.then})
+        # per output column, the values rules may assign to it, in rule order
+        self._assigned_values = {
+            name: np.array([r.then[name] for r in rules if name in r.then]) for name in self.output_columns
+        }
+
+    def evaluate(self, state: State) -> RuleResult:
+        columns = {name: np.asarray(state[name]) for name in {*self.input_columns, *self.output_columns}}
+        n = len(columns[self.input_columns[0]])
+        # Winning assignment per row as a small int index instead of copying
+        # (possibly wide string) output columns.
+        winners = {name: np.full(n, -1, dtype=np.int16) for name in self.output_columns}
+        slots = dict.fromkeys(self.output_columns, 0)
+        fired = {}
+        for rule in self.rules:
+            mask = rule.when[0].mask(columns)
+            for condition in rule.when[1:]:
+                mask &= condition.mask(columns)
+            fired[rule.name] = np.flatnonzero(mask)
+            for name in rule.then:
+                winners[name][mask] = slots[name]
+                slots[name] += 1
+        changes = {}
+        for name, winner in winners.items():
+            rows = np.flatnonzero(winner >= 0)
+            values = self._assigned_values[name][winner[rows]]
+            differs = values != columns[name][rows]
+            if differs.any():
+                changes[name] = (rows[differs], values[differs])
+        return RuleResult(changes, fired)
+
+    def apply(self, state: State) -> RuleResult:
+        """Evaluate and write the changed cells back into ``state`` in place."""
+        result = self.evaluate(state)
+        for name, (rows, values) in result.changes.items():
+            if isinstance(state, pd.DataFrame):
+                state.iloc[rows, state.columns.get_loc(name)] = values
+            else:
+                state[name][rows] = values
+        return result
+
+
+def _to_python(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def write_back(
+    conn: sqlite3.Connection,
+    state: State,
+    result: RuleResult,
+    table: str = "Room_Status",
+    key: str = "Room_ID",
+) -> int:
+    """UPDATE only the changed cells; returns the number of statements executed."""
+    keys = np.asarray(state[key])
+    n = 0
+    with conn:
+        for name, (rows, values) in result.changes.items():
+            params = [(_to_python(v), _to_python(keys[r])) for r, v in zip(rows, values)]
+            conn.executemany(
+                f"UPDATE {table} SET {name} = ?, Last_Updated = CURRENT_TIMESTAMP WHERE {key} = ?",
+                params,
+            )
+            n += len(params)
+    return n
@@ -0,0 +1,194 @@
+"""
+Content negotiation for prediction and dashboard payloads.
+
+  application/json                      orjson when installed, stdlib json otherwise
+  application/msgpack                   needs msgpack
+  application/vnd.apache.arrow.stream   Arrow IPC stream, columnar bulk telemetry; needs pyarrow
+
+Requests are decoded by their Content-Type, responses encoded by the first
+supported type in Accept (JSON when there is none). msgpack and Arrow are
+optional: a body in one that is not installed returns 415, and a response
+asked for in one falls back to JSON.
+"""
+import json
+from typing import Any, Mapping
+
+import numpy as np
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.apache.arrow.file": ARROW}
+
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def msgpack_available() -> bool:
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default, option=ORJSON_OPTIONS)
+    return json.dumps(content, separators=(",", ":"), default=_json_default).encode()
+
+
+def loads_json(body: bytes) -> Any:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (numpy scalars and arrays included)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def _media_type(header: str | None) -> str:
+    media = (header or "").split(";", 1)[0].strip().lower()
+    return ALIASES.get(media, media)
+
+
+def is_json(content_type: str | None) -> bool:
+    """True for JSON bodies, including ones sent without a Content-Type."""
+    media = _media_type(content_type)
+    return media in ("", JSON) or media.endswith("+json")
+
+
+def _supported(media: str) -> bool:
+    if media == MSGPACK:
+        return msgpack_available()
+    if media == ARROW:
+        return arrow_available()
+    return media == JSON
+
+
+def negotiate(accept: str | None, offers: tuple[str, ...] = (JSON, MSGPACK)) -> str:
+    """Best of ``offers`` for an Accept header (q-values honoured).
+
+    JSON when Accept is absent or names nothing we can encode, as for
+    clients sending ``text/plain`` or a browser's default header.
+    """
+    if not accept:
+        return JSON
+    ranked = []
+    for i, part in enumerate(accept.split(",")):
+        media, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        ranked.append((-q, i, ALIASES.get(media.lower(), media.lower())))
+    for neg_q, _, media in sorted(ranked):
+        if neg_q == 0:
+            break
+        if media in ("*/*", "application/*"):
+            return JSON
+        if media in offers and _supported(media):
+            return media
+    return JSON
+
+
+def decode_body(body: bytes, content_type: str | None) -> Any:
+    """JSON or msgpack request body as Python objects."""
+    media = _media_type(content_type)
+    try:
+        if media == MSGPACK:
+            if not msgpack_available():
+                raise HTTPException(status_code=415, detail="msgpack bodies require the msgpack package")
+            import msgpack
+            return msgpack.unpackb(body)
+        if is_json(media):
+            return loads_json(body)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Malformed {media or JSON} body: {e}")
+    raise HTTPException(status_code=415, detail=f"Unsupported Content-Type '{media}'")
+
+
+def columns_from_body(body: bytes, content_type: str | None, names: list[str]) -> dict[str, Any]:
+    """Bulk payload as ``{name: array}`` for the requested columns.
+
+    Accepts an Arrow IPC stream (one table), or JSON/msgpack as either a
+    list of records or a ``{column: [values]}`` mapping. Missing columns
+    are absent from the result.
+    """
+    media = _media_type(content_type)
+    if media == ARROW:
+        if not arrow_available():
+            raise HTTPException(status_code=415, detail="Arrow bodies require pyarrow")
+        import pyarrow as pa
+        try:
+            table = pa.ipc.open_stream(body).read_all()
+        except pa.ArrowInvalid as e:
+            raise HTTPException(status_code=400, detail=f"Malformed Arrow stream: {e}")
+        return {name: table.column(name).to_numpy() for name in names if name in table.column_names}
+
+    payload = decode_body(body, content_type)
+    if isinstance(payload, Mapping):
+        return {name: np.asarray(payload[name]) for name in names if name in payload}
+    if isinstance(payload, list):
+        if payload and not isinstance(payload[0], Mapping):
+            raise HTTPException(status_code=422, detail="Records must be objects of column values")
+        present = [name for name in names if payload and name in payload[0]]
+        try:
+            return {name: np.array([row[name] for row in payload]) for name in present}
+        except (KeyError, TypeError) as e:
+            raise HTTPException(status_code=422, detail=f"Every record needs the same columns: {e}")
+    raise HTTPException(status_code=422, detail="Expected a list of records or a mapping of columns")
+
+
+def arrow_stream(columns: Mapping[str, Any]) -> bytes:
+    import pyarrow as pa
+
+    table = pa.table({name: np.asarray(values) for name, values in columns.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode(content: Any, media: str) -> Response:
+    """Response for JSON/msgpack ``content`` (dicts, lists, numpy values)."""
+    if media == MSGPACK:
+        import msgpack
+        return Response(msgpack.packb(content, default=_json_default), media_type=MSGPACK)
+    return Response(dumps_json(content), media_type=JSON)
+
+
+def encode_columns(columns: Mapping[str, Any], media: str) -> Response:
+    """Response for columnar results: an Arrow table, or ``{column: [values]}`` for JSON/msgpack."""
+    if media == ARROW:
+        return Response(arrow_stream(columns), media_type=ARROW)
+    return encode({name: np.asarray(values) for name, values in columns.items()}, media)
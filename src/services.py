@@ -0,0 +1,103 @@
+"""
+Process-wide state shared by every router: one model registry, per-segment
+model cache, prediction cache, prediction log, temporal feature store, drift
+monitor and SQLite connection pool.
+"""
+import os
+
+try:
+    from .db_pool import SQLitePool
+    from .drift_monitor import DriftMonitor
+    from .model_registry import ModelRegistry
+    from .model_router import ModelRouter
+    from .prediction_cache import PredictionCache
+    from .prediction_log import PredictionLog
+    from .profiler import RequestProfiler
+    from .temporal_features import TemporalFeatureStore
+except ImportError:  # loaded top-level by src/main.py
+    from db_pool import SQLitePool
+    from drift_monitor import DriftMonitor
+    from model_registry import ModelRegistry
+    from model_router import ModelRouter
+    from prediction_cache import PredictionCache
+    from prediction_log import PredictionLog
+    from profiler import RequestProfiler
+    from temporal_features import TemporalFeatureStore
+
+# IsolationForest + scaler, RandomForests and K-Means + scaler are loaded as one
+# versioned bundle. The registry watches models/ and swaps validated retrains in
+# atomically; each request works on the bundle it grabbed at the start.
+# KMEANS_LOOKUP_GRID=1 also precomputes a quantized operating-mode table per bundle.
+REGISTRY = ModelRegistry(
+    poll_interval=float(os.environ.get("MODEL_RELOAD_INTERVAL", "5")),
+    kmeans_grid=os.environ.get("KMEANS_LOOKUP_GRID", "0") == "1",
+    train_if_missing=True,
+)
+
+# Readings with a site and/or asset type ("Type": L/M/H) are scored by that
+# segment's models from models/segments/ when it has any, loaded on first use
+# and evicted least-recently-used beyond SEGMENT_CACHE_MB of model files.
+MODEL_ROUTER = ModelRouter(
+    max_bytes=int(float(os.environ.get("SEGMENT_CACHE_MB", "512")) * 2**20),
+    kmeans_grid=os.environ.get("KMEANS_LOOKUP_GRID", "0") == "1",
+    fallback=lambda: REGISTRY.current,  # for segments without K-Means or a Random Forest
+)
+REGISTRY.on_swap(MODEL_ROUTER.rebase)
+
+# Response shape of a POST /predict with neither ?mode nor a body model_type:
+# "v2" (unsupervised, with the operating mode) or "aurora" (isolation_forest).
+# src/main.py defaults to "aurora", which is what that app used to return.
+PREDICT_DEFAULT_SHAPE = os.environ.get("PREDICT_DEFAULT_SHAPE", "v2")
+
+# Folding /predict traffic into each bundle's running scaler statistics is opt-in.
+ONLINE_SCALER_UPDATES = os.environ.get("ONLINE_SCALER_UPDATES", "0") == "1"
+
+# Near-identical readings from slow-polling gateways reuse the previous result.
+PREDICTION_CACHE = PredictionCache(
+    maxsize=int(os.environ.get("PREDICTION_CACHE_SIZE", "10000")),
+    ttl=float(os.environ.get("PREDICTION_CACHE_TTL", "60")),
+)
+REGISTRY.on_swap(PREDICTION_CACHE.clear)
+
+# Every scored reading is queued and written to SQLite in batches by a
+# background thread, so /predict never waits on disk.
+PREDICTION_LOG_PATH = os.environ.get("PREDICTION_LOG_PATH", "predictions.db")
+PREDICTION_LOG = PredictionLog(PREDICTION_LOG_PATH)
+
+# Readings that carry a machine_id feed that machine's rolling window. Scoring
+# supervised readings with the temporal RandomForest instead of the cached
+# point-in-time one is opt-in (TEMPORAL_SCORING=1): it scored a lower F1 on
+# the AI4I hold-out and its results cannot be cached.
+TEMPORAL_SCORING = os.environ.get("TEMPORAL_SCORING", "0") == "1"
+TEMPORAL_FEATURES = TemporalFeatureStore(
+    max_machines=int(os.environ.get("TEMPORAL_MAX_MACHINES", "10000")),
+)
+
+# Live /predict readings are histogrammed against the training data's
+# distribution; PSI/KS per feature show up on /drift/stats.
+DRIFT_MONITOR = DriftMonitor(
+    reference_path=os.environ.get("DRIFT_REFERENCE_PATH", os.path.join("data", "ai4i_training_phys.csv")),
+    bins=int(os.environ.get("DRIFT_BINS", "20")),
+    window_seconds=float(os.environ.get("DRIFT_WINDOW_SECONDS", "300")),
+    windows=int(os.environ.get("DRIFT_WINDOWS", "12")),
+)
+
+ACCESS_DB_PATH = "access_control.db"
+DB_POOL = SQLitePool(size=int(os.environ.get("DB_POOL_SIZE", "4")))
+
+# /admin endpoints exist only when ADMIN_TOKEN is set; callers send it as X-Admin-Token.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+PROFILER = RequestProfiler()
+
+
+def start() -> None:
+    REGISTRY.start()
+    PREDICTION_LOG.start()
+    DRIFT_MONITOR.load_reference()
+
+
+def stop() -> None:
+    PROFILER.stop()
+    REGISTRY.stop()
+    PREDICTION_LOG.stop()
+    DB_POOL.close()
@@ -1,9 +1,37 @@
+import asyncio
 import random
 import math
-from datetime import datetime, timedelta
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+try:
+    from .chart_buffer import ChartRingBuffer
+except ImportError:  # loaded top-level by src/main.py
+    from chart_buffer import ChartRingBuffer
+
+TICK_INTERVAL = 2.0  # seconds between simulation steps
+CHART_WINDOW_HOURS = 1.0  # live chart history kept in memory
+DEFAULT_CHART_SECONDS = 60  # what /api/dashboard/chart shows by default
+DEFAULT_CHART_POINTS = 30
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """State published after each tick. Readers never see a half-updated tick."""
+    tick: int
+    stats: dict[str, Any]
+    chart_point: dict[str, Any]  # newest live chart point
+    created_at: float
+
 
 class SimulationService:
-    def __init__(self):
+    def __init__(
+        self,
+        tick_interval: float = TICK_INTERVAL,
+        chart_window_hours: float = CHART_WINDOW_HOURS,
+    ):
         # Initial State
         self.health = 98.5
         self.energy_base = 400
@@ -17,20 +45,28 @@ class SimulationService:
         # Cache for charts
         self.energy_chart_data = self._generate_energy_profile()
         
-        # Live Chart History (persistent state)
-        self.live_chart_history = []
+        # Live Chart History (persistent state): at most one point per tick
+        self.tick_interval = tick_interval
+        self.live_chart = ChartRingBuffer(
+            capacity=math.ceil(chart_window_hours * 3600 / tick_interval)
+        )
         self._init_live_chart()
 
+        # Tick scheduling: state only advances in tick(), readers get _snapshot
+        self.tick_count = 0
+        self._listeners: list[Callable[[DashboardSnapshot], None]] = []
+        self._snapshot = self._publish(self._build_stats(0.0))
+
     def _init_live_chart(self):
         """Initialize chart with 30 points of history (last 60s)."""
-        now = datetime.now()
+        now = time.time()
         for i in range(30):
-            t = now - timedelta(seconds=(29-i)*2)
-            self.live_chart_history.append({
-                "name": t.strftime("%H:%M:%S"),
-                "uv": self.energy_base + random.randint(-50, 50),
-                "pv": self.energy_base + 400 + random.randint(-50, 50)
-            })
+            self.live_chart.append(
+                now - (29 - i) * 2,
+                self.energy_base + random.randint(-50, 50),
+                self.energy_base + 400 + random.randint(-50, 50),
+            )
+        self._chart_point = self.live_chart.last_point()
 
     def _generate_energy_profile(self):
         """Generates a 24h energy load profile."""
@@ -51,8 +87,8 @@ class SimulationService:
             })
         return data
 
-    def get_dashboard_stats(self):
-        """Returns real-time dashboard stats with slight random fluctuations."""
+    def tick(self) -> DashboardSnapshot:
+        """Advances the simulation one step with slight random fluctuations."""
         
         # Fluctuate Health
         change = random.uniform(-0.1, 0.1)
@@ -81,6 +117,11 @@ class SimulationService:
         # Update Chart History synchronously with stats
         self._update_live_chart()
 
+        self.tick_count += 1
+        self._snapshot = self._publish(self._build_stats(change))
+        return self._snapshot
+
+    def _build_stats(self, change):
         return {
             "health": {
                 "value": f"{self.health:.1f}%",
@@ -106,39 +147,70 @@ class SimulationService:
 
     def _update_live_chart(self):
         """Adds a new point to the rolling chart history."""
-        now = datetime.now()
+        now = time.time()
         
         # Only add if time has moved forward significantly (throttle to ~1s)
-        last_time_str = self.live_chart_history[-1]["name"]
-        if now.strftime("%H:%M:%S") == last_time_str:
+        if now - self.live_chart.last_ts < 1.0:
             return
 
         # Add distinct noise to chart point so it doesn't look like a perfect smoothed line
         chart_noise = random.randint(-30, 30)
         
-        new_point = {
-            "name": now.strftime("%H:%M:%S"),
-            "uv": self.current_energy + chart_noise, # Synced but with extra noise
-            "pv": int(self.current_energy * 1.2) + random.randint(-100, 100)
-        }
-        
-        self.live_chart_history.append(new_point)
-        if len(self.live_chart_history) > 30: # Keep last 30 points
-            self.live_chart_history.pop(0)
+        self.live_chart.append(
+            now,
+            self.current_energy + chart_noise, # Synced but with extra noise
+            int(self.current_energy * 1.2) + random.randint(-100, 100),
+        )
+        self._chart_point = self.live_chart.last_point()
+
+    def _publish(self, stats) -> DashboardSnapshot:
+        snapshot = DashboardSnapshot(
+            tick=self.tick_count,
+            stats=stats,
+            chart_point=self._chart_point,
+            created_at=time.time(),
+        )
+        for listener in self._listeners:
+            listener(snapshot)
+        return snapshot
+
+    def on_tick(self, listener: Callable[[DashboardSnapshot], None]) -> None:
+        """Register a callback run on the scheduler after every tick."""
+        self._listeners.append(listener)
 
-    def get_dashboard_chart(self):
-        """Returns the rolling window data."""
-        return self.live_chart_history
+    async def run(self):
+        """Fixed-rate tick loop; schedule against deadlines so slow ticks don't drift."""
+        next_tick = time.monotonic()
+        while True:
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Simulation tick failed: {e}")
+            next_tick += self.tick_interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Fell behind (e.g. event loop stalled): skip missed ticks
+                next_tick = time.monotonic()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    @property
+    def snapshot(self) -> DashboardSnapshot:
+        return self._snapshot
+
+    def get_dashboard_stats(self):
+        """Returns the stats of the latest tick (read-only, O(1))."""
+        return self._snapshot.stats
+
+    def get_dashboard_chart(self, seconds=DEFAULT_CHART_SECONDS, max_points=DEFAULT_CHART_POINTS):
+        """Returns the rolling window data, downsampled to at most max_points."""
+        return self.live_chart.points(seconds, max_points)
+
+    def get_dashboard_chart_json(self, seconds=DEFAULT_CHART_SECONDS, max_points=DEFAULT_CHART_POINTS):
+        """Same as get_dashboard_chart, pre-encoded and cached until the next point."""
+        return self.live_chart.encoded(seconds, max_points)
 
     def get_energy_chart(self):
         return self.energy_chart_data
 
-    # Reporting
-    def get_reports(self):
-        return [
-            { "id": 'REP-2024-001', "name": 'Monthly Energy Consumption', "date": 'Oct 24, 2024', "type": 'PDF', "status": 'Ready' },
-            { "id": 'REP-2024-002', "name": 'Security Breach Analysis', "date": 'Oct 23, 2024', "type": 'CSV', "status": 'Ready' },
-            { "id": 'REP-2024-003', "name": 'HVAC Performance Audit', "date": 'Oct 22, 2024', "type": 'PDF', "status": 'Ready' },
-        ]
-
 simulation = SimulationService()
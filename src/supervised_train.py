@@ -1,10 +1,18 @@
+import argparse
 import os
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report
+from sklearn.metrics import classification_report, precision_recall_fscore_support
 import joblib
 
+try:
+    from .model_service import FAILURE_LABELS
+    from .temporal_features import build_temporal_frame, WINDOW
+except ImportError:  # run as a script from src/
+    from model_service import FAILURE_LABELS
+    from temporal_features import build_temporal_frame, WINDOW
+
 FEATURE_COLUMNS = [
     "Rotational speed [rpm]",
     "Process temperature [K]",
@@ -15,32 +23,78 @@ FEATURE_COLUMNS = [
 DATA_PATH = os.path.join("data", "ai4i2020.csv")
 MODEL_DIR = "models"
 SUP_MODEL_PATH = os.path.join(MODEL_DIR, "rf_supervised.pkl")
+TEMPORAL_MODEL_PATH = os.path.join(MODEL_DIR, "rf_supervised_temporal.pkl")
+MODES_MODEL_PATH = os.path.join(MODEL_DIR, "rf_failure_modes.pkl")
 
-def main():
-    df = pd.read_csv(DATA_PATH)
-
-    X = df[FEATURE_COLUMNS].values
-    y = df["Machine failure"].values  # 0 normal, 1 failure
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
-
-    clf = RandomForestClassifier(
+def build_classifier(modes: bool = False) -> RandomForestClassifier:
+    """Unfitted RandomForest as trained for serving (also used by cross_validate.py)."""
+    return RandomForestClassifier(
         n_estimators=300,
         max_depth=None,
-        class_weight="balanced",  # handle imbalance
+        # handle imbalance; multi-output "balanced" multiplies the weights of
+        # every label column, which swamps the rare modes, so leave it off there
+        class_weight=None if modes else "balanced",
         random_state=42,
         n_jobs=-1,
     )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the supervised RandomForest on AI4I.")
+    kind = parser.add_mutually_exclusive_group()
+    kind.add_argument("--temporal", action="store_true",
+                      help="add rolling mean/std/slope/EWMA features (see temporal_features.py)")
+    kind.add_argument("--modes", action="store_true",
+                      help="one multi-output forest over Machine failure and TWF/HDF/PWF/OSF/RNF")
+    parser.add_argument("--group-by", default="Type",
+                        help="column whose values form one reading stream per machine (AI4I rows are in time order)")
+    parser.add_argument("--window", type=int, default=WINDOW)
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATA_PATH)
+
+    if args.temporal:
+        X = build_temporal_frame(df, args.group_by, window=args.window).values
+        model_path = TEMPORAL_MODEL_PATH
+    else:
+        X = df[FEATURE_COLUMNS].values
+        model_path = MODES_MODEL_PATH if args.modes else SUP_MODEL_PATH
+    if args.modes:
+        y = df[FAILURE_LABELS].values  # one 0/1 column per label
+    else:
+        y = df["Machine failure"].values  # 0 normal, 1 failure
+
+    if args.temporal:
+        # Neighbouring rows share most of their rolling window, so a random
+        # split scores rows whose history was trained on. Train on the first
+        # 80% in time and test on the rest, skipping one window so no test
+        # row's window reaches back into the training rows.
+        split = int(len(X) * 0.8)
+        X_train, y_train = X[:split], y[:split]
+        X_test, y_test = X[split + args.window:], y[split + args.window:]
+    else:
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=df["Machine failure"].values
+        )
+
+    clf = build_classifier(modes=args.modes)
     clf.fit(X_train, y_train)
 
     y_pred = clf.predict(X_test)
-    print(classification_report(y_test, y_pred))
+    if args.modes:
+        print(f"{'label':<16}{'precision':>10}{'recall':>10}{'f1':>10}{'support':>10}")
+        for i, label in enumerate(FAILURE_LABELS):
+            p, r, f, _ = precision_recall_fscore_support(
+                y_test[:, i], y_pred[:, i], average="binary", zero_division=0
+            )
+            print(f"{label:<16}{p:>10.2f}{r:>10.2f}{f:>10.2f}{int(y_test[:, i].sum()):>10}")
+    else:
+        print(classification_report(y_test, y_pred))
 
     os.makedirs(MODEL_DIR, exist_ok=True)
-    joblib.dump(clf, SUP_MODEL_PATH)
-    print("Saved supervised model to", SUP_MODEL_PATH)
+    joblib.dump(clf, model_path)
+    print("Saved supervised model to", model_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,163 @@
+from collections import OrderedDict
+import threading
+
+import numpy as np
+import pandas as pd
+
+BASE_FEATURES = [
+    "Rotational speed [rpm]",
+    "Process temperature [K]",
+    "Torque [Nm]",
+    "Tool wear [min]",
+]
+WINDOW = 32
+EWMA_ALPHA = 0.2
+STATS = ("mean", "std", "slope", "ewma")
+# Running sums are rebuilt from the buffer this often to cancel float drift.
+RESYNC_EVERY = 1024
+
+
+def feature_names(base: list[str] = BASE_FEATURES, window: int = WINDOW) -> list[str]:
+    """Raw readings followed by one column per (feature, statistic)."""
+    return [*base, *(f"{col} {stat}{window}" for col in base for stat in STATS)]
+
+
+class RollingWindow:
+    """Last ``window`` readings of one machine in a fixed ring buffer.
+
+    Keeps running sum, sum of squares and position-weighted sum so mean,
+    population std and least-squares slope (per reading) of the window,
+    plus an EWMA, update in O(1) per reading regardless of window length.
+    """
+
+    __slots__ = ("window", "alpha", "buffer", "head", "count", "n_updates",
+                 "total", "total_sq", "weighted", "ewma")
+
+    def __init__(self, n_features: int, window: int = WINDOW, alpha: float = EWMA_ALPHA):
+        self.window = window
+        self.alpha = alpha
+        self.buffer = np.zeros((window, n_features))
+        self.head = 0  # slot of the oldest reading once full
+        self.count = 0
+        self.n_updates = 0
+        self.total = np.zeros(n_features)
+        self.total_sq = np.zeros(n_features)
+        self.weighted = np.zeros(n_features)  # sum of position * value, oldest = position 0
+        self.ewma = np.zeros(n_features)
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        """Fold in one reading and return [mean, std, slope, ewma] per feature, feature-major."""
+        if self.count < self.window:
+            self.weighted += self.count * x
+            self.total += x
+            self.total_sq += x * x
+            self.buffer[(self.head + self.count) % self.window] = x
+            self.count += 1
+        else:
+            oldest = self.buffer[self.head].copy()
+            # every remaining reading moves one position closer to the front
+            self.weighted += (self.window - 1) * x - (self.total - oldest)
+            self.total += x - oldest
+            self.total_sq += x * x - oldest * oldest
+            self.buffer[self.head] = x
+            self.head = (self.head + 1) % self.window
+        self.ewma = x if self.n_updates == 0 else self.alpha * x + (1 - self.alpha) * self.ewma
+        self.n_updates += 1
+        if self.n_updates % RESYNC_EVERY == 0:
+            self._resync()
+        return self.stats()
+
+    def _resync(self) -> None:
+        ordered = np.roll(self.buffer, -self.head, axis=0)[:self.count]
+        self.total = ordered.sum(axis=0)
+        self.total_sq = (ordered * ordered).sum(axis=0)
+        self.weighted = np.arange(self.count) @ ordered
+
+    def stats(self) -> np.ndarray:
+        n = self.count
+        mean = self.total / n
+        var = np.maximum(self.total_sq / n - mean * mean, 0.0)
+        if n > 1:
+            # closed-form OLS slope against positions 0..n-1
+            sum_i = n * (n - 1) / 2
+            sum_ii = (n - 1) * n * (2 * n - 1) / 6
+            slope = (n * self.weighted - sum_i * self.total) / (n * sum_ii - sum_i * sum_i)
+        else:
+            slope = np.zeros_like(mean)
+        return np.column_stack((mean, np.sqrt(var), slope, self.ewma)).ravel()
+
+
+class TemporalFeatureStore:
+    """Per-machine RollingWindows, LRU-bounded to ``max_machines``.
+
+    Memory is at most ``max_machines * window * n_features`` floats plus a
+    few running-sum vectors per machine; the least recently seen machine is
+    evicted when a new one arrives at the limit.
+    """
+
+    def __init__(
+        self,
+        window: int = WINDOW,
+        alpha: float = EWMA_ALPHA,
+        max_machines: int = 10_000,
+        base: list[str] = BASE_FEATURES,
+    ):
+        self.window = window
+        self.alpha = alpha
+        self.max_machines = max_machines
+        self.base = base
+        self.names = feature_names(base, window)
+        self._machines: OrderedDict[str, RollingWindow] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._machines)
+
+    def update(self, machine_id: str, values) -> np.ndarray:
+        """Record one reading and return the full feature row (raw + rolling stats)."""
+        x = np.asarray(values, dtype=float)
+        with self._lock:
+            state = self._machines.get(machine_id)
+            if state is None:
+                state = RollingWindow(len(self.base), self.window, self.alpha)
+                self._machines[machine_id] = state
+                if len(self._machines) > self.max_machines:
+                    self._machines.popitem(last=False)
+            else:
+                self._machines.move_to_end(machine_id)
+            stats = state.update(x)
+        return np.concatenate((x, stats))
+
+    def reset(self, *_) -> None:
+        with self._lock:
+            self._machines.clear()
+
+    def stats(self) -> dict:
+        return {
+            "machines": len(self._machines),
+            "max_machines": self.max_machines,
+            "window": self.window,
+            "buffer_bytes": len(self._machines) * self.window * len(self.base) * 8,
+        }
+
+
+def build_temporal_frame(
+    df: pd.DataFrame,
+    group_col: str,
+    window: int = WINDOW,
+    alpha: float = EWMA_ALPHA,
+    base: list[str] = BASE_FEATURES,
+) -> pd.DataFrame:
+    """Training-time features for ``df`` in row order, computed by the same
+    RollingWindow code the API uses, one stream per ``group_col`` value."""
+    values = df[base].to_numpy(dtype=float)
+    groups = df[group_col].to_numpy()
+    out = np.empty((len(df), len(base) * (1 + len(STATS))))
+    out[:, :len(base)] = values
+    windows: dict = {}
+    for i, (group, x) in enumerate(zip(groups, values)):
+        state = windows.get(group)
+        if state is None:
+            state = windows[group] = RollingWindow(len(base), window, alpha)
+        out[i, len(base):] = state.update(x)
+    return pd.DataFrame(out, columns=feature_names(base, window), index=df.index)
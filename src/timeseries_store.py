@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+DB_PATH = "timeseries.db"
+ENERGY_CSV_PATH = os.path.join("data", "smart_building_energy.csv")
+
+# Rollup levels, finest first: (table suffix, bucket width in seconds)
+RESOLUTIONS = (
+    ("minute", 60),
+    ("hour", 3600),
+    ("day", 86400),
+)
+
+# Columns of generate_data_s2.py output mapped to series names
+CSV_SERIES = {
+    "Energy_Consumption_kWh": "energy",
+    "Occupancy_Count": "occupancy",
+    "Temperature_C": "temperature",
+}
+
+# Series behind each energy chart source, mapped to the chart row keys. The
+# historical series are hourly kWh from the CSV; the live ones are the
+# simulation's instantaneous load (kW) and headcount, sampled every tick.
+CHART_SOURCES = {
+    "history": {"energy": "load", "occupancy": "occupancy", "temperature": "temperature"},
+    "live": {"live_power": "load", "live_occupancy": "occupancy"},
+}
+
+UPSERT = """
+    INSERT INTO rollup_{name} (series, bucket, count, sum, min, max)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(series, bucket) DO UPDATE SET
+        count = count + excluded.count,
+        sum = sum + excluded.sum,
+        min = MIN(min, excluded.min),
+        max = MAX(max, excluded.max)
+"""
+
+
+class TimeSeriesStore:
+    """Embedded SQLite store that keeps only minute/hour/day rollups.
+
+    Every ingested point is folded into all three rollup tables as it
+    arrives (count/sum/min/max upserts), so a range query reads at most a
+    bounded number of pre-aggregated rows and never touches raw points.
+    Timestamps are UTC epoch seconds.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for name, _ in RESOLUTIONS:
+                self._conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS rollup_{name} (
+                        series TEXT NOT NULL,
+                        bucket INTEGER NOT NULL,
+                        count INTEGER NOT NULL,
+                        sum REAL NOT NULL,
+                        min REAL NOT NULL,
+                        max REAL NOT NULL,
+                        PRIMARY KEY (series, bucket)
+                    ) WITHOUT ROWID
+                """)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM rollup_day LIMIT 1").fetchone()
+        return row is None
+
+    def ingest(self, series: str, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Fold a batch of (epoch seconds, value) points into every rollup level."""
+        ts = np.asarray(timestamps, dtype=np.int64)
+        vals = np.asarray(values, dtype=float)
+        if len(ts) == 0:
+            return
+        frame = pd.DataFrame({"value": vals})
+        with self._lock, self._conn:
+            for name, width in RESOLUTIONS:
+                frame["bucket"] = ts // width * width
+                agg = frame.groupby("bucket")["value"].agg(["count", "sum", "min", "max"])
+                self._conn.executemany(
+                    UPSERT.format(name=name),
+                    [
+                        (series, int(b), int(r.count), float(r.sum), float(r.min), float(r.max))
+                        for b, r in zip(agg.index, agg.itertuples(index=False))
+                    ],
+                )
+
+    def ingest_csv(self, csv_path: str = ENERGY_CSV_PATH, chunksize: int = 100_000) -> int:
+        """Stream a generate_data_s2.py style CSV into the store; returns rows read."""
+        n_rows = 0
+        columns = ["Timestamp", *CSV_SERIES]
+        for chunk in pd.read_csv(csv_path, usecols=columns, chunksize=chunksize):
+            ts = pd.to_datetime(chunk["Timestamp"]).astype("datetime64[s]").astype(np.int64).values
+            for column, series in CSV_SERIES.items():
+                self.ingest(series, ts, chunk[column].values)
+            n_rows += len(chunk)
+        return n_rows
+
+    def bounds(self, series: str) -> tuple[int, int] | None:
+        """(first, last) hour bucket stored for a series."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(bucket), MAX(bucket) FROM rollup_hour WHERE series = ?", (series,)
+            ).fetchone()
+        return None if row[0] is None else (row[0], row[1])
+
+    @staticmethod
+    def pick_resolution(start: int, end: int, max_points: int) -> tuple[str, int]:
+        """Coarsest-needed rollup table and bucket width giving at most max_points buckets."""
+        span = max(end - start, 1)
+        for name, width in RESOLUTIONS:
+            if span / width <= max_points:
+                return name, width
+        # Longer than max_points days: regroup daily rows into wider buckets.
+        name, width = RESOLUTIONS[-1]
+        return name, int(np.ceil(span / max_points / width)) * width
+
+    def query(
+        self,
+        series: list[str],
+        start: int,
+        end: int,
+        max_points: int = 200,
+    ) -> tuple[int, dict[str, list[dict]]]:
+        """Sum/mean/min/max per bucket over [start, end). Returns (bucket width, rows per series)."""
+        name, width = self.pick_resolution(start, end, max_points)
+        placeholders = ",".join("?" for _ in series)
+        sql = f"""
+            SELECT series, (bucket / ?) * ? AS b, SUM(sum), SUM(sum) / SUM(count), MIN(min), MAX(max)
+            FROM rollup_{name}
+            WHERE series IN ({placeholders}) AND bucket >= ? AND bucket < ?
+            GROUP BY series, b
+            ORDER BY b
+        """
+        with self._lock:
+            rows = self._conn.execute(sql, (width, width, *series, start, end)).fetchall()
+        out: dict[str, list[dict]] = {s: [] for s in series}
+        for s, b, total, mean, lo, hi in rows:
+            out[s].append({"bucket": b, "sum": total, "mean": mean, "min": lo, "max": hi})
+        return width, out
+
+    def energy_chart(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        max_points: int = 48,
+        source: str = "history",
+    ) -> list[dict]:
+        """Energy monitor rows ({time, load, occupancy[, temperature]}) for one source.
+
+        Defaults to the last 24h stored for that source.
+        """
+        keys = CHART_SOURCES[source]
+        if end is None:
+            last = self.bounds(next(iter(keys)))
+            end = (last[1] + 3600) if last else int(time.time())
+        if start is None:
+            start = end - 86400
+        width, data = self.query(list(keys), start, end, max_points)
+
+        if width >= 86400:
+            label_format = "%b %d"
+        elif end - start > 86400:
+            label_format = "%b %d %H:%M"
+        else:
+            label_format = "%H:%M"
+        merged: dict[int, dict] = {}
+        for series, key in keys.items():
+            for row in data[series]:
+                point = merged.setdefault(row["bucket"], {
+                    "time": datetime.fromtimestamp(row["bucket"], tz=timezone.utc).strftime(label_format),
+                })
+                point[key] = round(row["mean"], 1)
+        return [merged[b] for b in sorted(merged)]
+
+
+if __name__ == "__main__":
+    store = TimeSeriesStore()
+    t0 = time.perf_counter()
+    n = store.ingest_csv()
+    print(f"Ingested {n} rows from {ENERGY_CSV_PATH} in {time.perf_counter() - t0:.2f}s into {DB_PATH}")
+    print(store.energy_chart()[:3])
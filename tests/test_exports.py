@@ -0,0 +1,90 @@
+import io
+import sqlite3
+
+import pytest
+
+from src.exports import iter_query_chunks, stream_csv, stream_parquet
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "export.db")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, note TEXT, value REAL, count INTEGER)")
+        # first chunk (3 rows) has only NULLs in note/value/count, later chunks have values
+        conn.executemany(
+            "INSERT INTO readings (note, value, count) VALUES (?, ?, ?)",
+            [(None, None, None)] * 3 + [("late", 1.5, 7), (None, None, None), ("last", 2.0, 9)],
+        )
+    conn.close()
+    return path
+
+
+def read_parquet(chunks) -> "pa.Table":
+    return pq.read_table(io.BytesIO(b"".join(chunks)))
+
+
+def test_parquet_null_first_chunk_without_declared_types(db_path):
+    chunks = iter_query_chunks(db_path, "SELECT * FROM readings ORDER BY id", chunk_rows=3)
+    table = read_parquet(stream_parquet(chunks))
+    assert table.num_rows == 6
+    assert table.column("note").to_pylist() == [None, None, None, "late", None, "last"]
+    # no declared type and no value to infer from: the column falls back to text
+    assert table.schema.field("value").type == pa.string()
+    assert table.column("value").to_pylist()[3] == "1.5"
+
+
+def test_parquet_null_first_chunk_with_declared_types(db_path):
+    types = {"id": "INTEGER", "note": "TEXT", "value": "REAL", "count": "INTEGER"}
+    chunks = iter_query_chunks(db_path, "SELECT * FROM readings ORDER BY id", chunk_rows=3)
+    table = read_parquet(stream_parquet(chunks, types))
+    assert table.schema.field("value").type == pa.float64()
+    assert table.schema.field("count").type == pa.int64()
+    assert table.column("value").to_pylist() == [None, None, None, 1.5, None, 2.0]
+    assert table.column("count").to_pylist() == [None, None, None, 7, None, 9]
+    assert table.column("id").to_pylist() == [1, 2, 3, 4, 5, 6]
+
+
+def test_parquet_empty_result_keeps_declared_schema(db_path):
+    types = {"id": "INTEGER", "note": "TEXT", "value": "REAL", "count": "INTEGER"}
+    chunks = iter_query_chunks(db_path, "SELECT * FROM readings WHERE id < 0")
+    table = read_parquet(stream_parquet(chunks, types))
+    assert table.num_rows == 0
+    assert table.schema.names == ["id", "note", "value", "count"]
+    assert table.schema.field("note").type == pa.string()
+
+
+def test_csv_round_trip_writes_header_once(db_path):
+    chunks = iter_query_chunks(db_path, "SELECT id, note FROM readings ORDER BY id", chunk_rows=2)
+    lines = b"".join(stream_csv(chunks)).decode().splitlines()
+    assert lines[0] == "id,note"
+    assert lines[1:] == ["1,", "2,", "3,", "4,late", "5,", "6,last"]
+
+
+def test_prediction_log_export_with_mixed_nulls(tmp_path):
+    from src.exports import table_column_types
+    from src.prediction_log import PredictionLog
+
+    log = PredictionLog(str(tmp_path / "predictions.db"), flush_interval=0.05)
+    log.start()
+    # unsupervised readings without a machine id, cluster or segment come first
+    for i in range(4):
+        log.record(source="api", mode="unsupervised", features=(1500.0, 310.0, 40.0, float(i)),
+                   is_anomaly=0, score=0.1)
+    log.record(source="api", mode="supervised", features=(2900.0, 340.0, 80.0, 250.0), is_anomaly=1,
+               score=0.9, machine_id="M-7", model_version=2, cluster=3, segment="type=L")
+    log.stop()
+
+    sql = "SELECT * FROM predictions ORDER BY id"
+    chunks = iter_query_chunks(log.db_path, sql, chunk_rows=2)
+    table = read_parquet(stream_parquet(chunks, table_column_types(log.db_path, "predictions")))
+    assert table.num_rows == 5
+    assert table.schema.field("cluster").type == pa.int64()
+    assert table.column("machine_id").to_pylist() == [None] * 4 + ["M-7"]
+    assert table.column("cluster").to_pylist() == [None] * 4 + [3]
+    assert table.column("segment").to_pylist() == [None] * 4 + ["type=L"]
+    assert table.column("tool_wear_min").to_pylist() == [0.0, 1.0, 2.0, 3.0, 250.0]
@@ -0,0 +1,97 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import StandardScaler
+
+from src.model_registry import ARTIFACTS, CANARY_READINGS, ModelRegistry
+
+
+def fit_models(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(loc=[1500, 310, 40, 100], scale=[200, 2, 10, 60], size=(300, 4))
+    scaler = StandardScaler().fit(X)
+    iforest = IsolationForest(n_estimators=10, random_state=seed).fit(scaler.transform(X))
+    return iforest, scaler
+
+
+def write(model_dir, name: str, obj, bump: int = 0) -> None:
+    path = os.path.join(model_dir, ARTIFACTS[name])
+    joblib.dump(obj, path)
+    if bump:  # make the rewrite visible to the mtime-based fingerprint
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    iforest, scaler = fit_models()
+    write(tmp_path, "iforest", iforest)
+    write(tmp_path, "scaler", scaler)
+    return str(tmp_path)
+
+
+def test_loads_a_valid_bundle_and_notifies_listeners(model_dir):
+    registry = ModelRegistry(model_dir)
+    swapped = []
+    registry.on_swap(swapped.append)
+    bundle = registry.current
+    assert bundle.version == 1
+    assert swapped == [bundle]
+    assert bundle.rf_model is None and bundle.kmeans_index is None  # optional artifacts absent
+    assert registry.reload() is False  # same files: nothing to do
+
+
+def test_canary_failure_keeps_serving_the_previous_bundle(model_dir):
+    registry = ModelRegistry(model_dir)
+    good = registry.current
+    _, broken = fit_models(seed=1)
+    broken.mean_ = np.full(4, np.nan)  # loads fine, scores NaN
+    write(model_dir, "scaler", broken, bump=10**9)
+
+    assert registry.reload() is False
+    assert registry.current is good
+    assert "canary" in registry.last_error
+    # the rejected files are not retried until they change again
+    assert registry.reload() is False
+
+    _, fixed = fit_models(seed=2)
+    write(model_dir, "scaler", fixed, bump=2 * 10**9)
+    assert registry.reload() is True
+    assert registry.current.version == 2
+    assert registry.last_error is None
+
+
+def test_reload_waits_for_a_settled_fingerprint(model_dir):
+    registry = ModelRegistry(model_dir)
+    registry.current
+    seen = registry.fingerprint()
+    iforest, scaler = fit_models(seed=3)
+    write(model_dir, "iforest", iforest, bump=10**9)
+
+    # the watcher saw `seen` one poll ago; the files have moved on since
+    assert registry.reload(settled=seen) is False
+    assert registry.current.version == 1
+
+    settled = registry.fingerprint()
+    assert registry.reload(settled=settled) is True
+    assert registry.current.version == 2
+    assert registry.current.fingerprint == settled
+
+
+def test_missing_required_artifact_raises_without_training(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    with pytest.raises(RuntimeError, match="No valid models"):
+        registry.current
+    assert "FileNotFoundError" in registry.last_error
+
+
+def test_canary_set_scores_with_the_loaded_models(model_dir):
+    bundle = ModelRegistry(model_dir).current
+    columns = bundle.score_batch(CANARY_READINGS, "unsupervised")
+    assert set(columns) == {"is_anomaly", "anomaly_score"}
+    assert len(columns["anomaly_score"]) == len(CANARY_READINGS)
+    with pytest.raises(LookupError):
+        bundle.score_batch(CANARY_READINGS, "supervised")  # no RandomForest in this bundle
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from src.online_scaler import OnlineScaler
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return rng.normal(loc=[1500, 310, 40, 100], scale=[200, 2, 10, 60], size=(1000, 4))
+
+
+def test_batches_merge_to_the_full_data_statistics(data):
+    online = OnlineScaler(n_features=4)
+    for batch in np.array_split(data, [1, 7, 300, 301, 999]):  # uneven sizes, incl. single rows
+        online.partial_fit(batch)
+    snapshot = online.publish()
+    full = StandardScaler().fit(data)
+    np.testing.assert_allclose(snapshot.scaler.mean_, full.mean_, rtol=1e-12)
+    np.testing.assert_allclose(snapshot.scaler.var_, full.var_, rtol=1e-10)
+    assert snapshot.n_samples_seen == len(data)
+
+
+def test_seeding_from_a_fitted_scaler_then_merging(data):
+    seeded = OnlineScaler.from_scaler(StandardScaler().fit(data[:600]))
+    seeded.partial_fit(data[600:])
+    snapshot = seeded.publish()
+    full = StandardScaler().fit(data)
+    np.testing.assert_allclose(snapshot.scaler.mean_, full.mean_, rtol=1e-12)
+    np.testing.assert_allclose(snapshot.scaler.var_, full.var_, rtol=1e-10)
+    np.testing.assert_allclose(snapshot.transform(data[:5]), full.transform(data[:5]), rtol=1e-9)
+
+
+def test_empty_batch_is_a_no_op(data):
+    online = OnlineScaler(n_features=4).partial_fit(data)
+    before = (online.count, online.mean.copy(), online.m2.copy())
+    online.partial_fit(np.empty((0, 4)))
+    assert online.count == before[0]
+    np.testing.assert_array_equal(online.mean, before[1])
+    np.testing.assert_array_equal(online.m2, before[2])
+
+
+def test_max_count_caps_the_weight_of_history():
+    online = OnlineScaler(n_features=1, max_count=100)
+    online.partial_fit(np.zeros((1000, 1)))
+    online.partial_fit(np.full((100, 1), 10.0))
+    # the 1000 old rows count as 100, so the new rows pull the mean halfway
+    assert online.mean[0] == pytest.approx(5.0)
+    assert online.count == 200
+
+
+def test_publish_every_swaps_versioned_snapshots(data):
+    online = OnlineScaler(n_features=4, publish_every=100)
+    assert online.current is None
+    online.partial_fit(data[:99])
+    assert online.current is None
+    online.partial_fit(data[99:100])
+    first = online.current
+    assert first.version == 1 and first.n_samples_seen == 100
+    online.partial_fit(data[100:250])
+    assert online.current.version == 2
+    # a published snapshot is never mutated by later updates
+    assert first.n_samples_seen == 100
+
+
+def test_constant_feature_gets_unit_scale():
+    online = OnlineScaler(n_features=2).partial_fit(np.column_stack([np.arange(10.0), np.full(10, 3.0)]))
+    scaler = online.publish().scaler
+    assert scaler.scale_[1] == 1.0
+    np.testing.assert_allclose(scaler.transform([[0.0, 3.0]])[0, 1], 0.0)
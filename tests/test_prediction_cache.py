@@ -0,0 +1,80 @@
+import pytest
+
+from src import prediction_cache
+from src.prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(prediction_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_key_quantizes_to_sensor_resolution():
+    cache = PredictionCache()
+    a = cache.key([1500.2, 310.04, 40.01, 10.3], "unsupervised", 1)
+    b = cache.key([1499.9, 309.96, 39.98, 9.8], "unsupervised", 1)
+    assert a == b
+    assert a != cache.key([1500.2, 310.04, 40.01, 10.3], "supervised", 1)
+    assert a != cache.key([1500.2, 310.04, 40.01, 10.3], "unsupervised", 2)
+    assert a != cache.key([1500.2, 310.2, 40.01, 10.3], "unsupervised", 1)
+
+
+def test_lru_evicts_the_least_recently_used(clock):
+    cache = PredictionCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_put_refreshes_an_existing_key(clock):
+    cache = PredictionCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(ttl=5)
+    cache.put("a", 1)
+    clock.now += 4.9
+    assert cache.get("a") == 1
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0  # expired entries are dropped on read
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_hit_does_not_extend_ttl(clock):
+    cache = PredictionCache(ttl=5)
+    cache.put("a", 1)
+    clock.now += 3
+    assert cache.get("a") == 1
+    clock.now += 3
+    assert cache.get("a") is None
+
+
+def test_zero_maxsize_disables_caching_and_clear_ignores_args(clock):
+    disabled = PredictionCache(maxsize=0)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None
+    cache = PredictionCache()
+    cache.put("a", 1)
+    cache.clear(object())  # hooked to registry swaps, which pass the new bundle
+    assert cache.get("a") is None
@@ -0,0 +1,84 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rule_engine import DEFAULT_RULES, compile_rules, write_back
+
+
+def room_state(occupancy, lights, ac):
+    return {
+        "Room_ID": np.arange(1, len(occupancy) + 1),
+        "Occupancy_Count": np.array(occupancy),
+        "Lights_Status": np.array(lights, dtype="<U9"),
+        "AC_Status": np.array(ac, dtype="<U9"),
+    }
+
+
+def test_default_rules_fire_and_report_only_real_changes():
+    engine = compile_rules(DEFAULT_RULES)
+    state = room_state([0, 0, 3, 25], ["ON", "OFF", "ON", "ON"], ["ON", "ON", "LOW POWER", "ON"])
+    result = engine.evaluate(state)
+    # room 2 is already OFF and room 3 already LOW POWER: matched, but not changed
+    rows, values = result.changes["Lights_Status"]
+    assert rows.tolist() == [0] and values.tolist() == ["OFF"]
+    assert "AC_Status" not in result.changes
+    assert result.fired["energy_saver"].tolist() == [0, 1]
+    assert result.fired["eco_mode"].tolist() == [2]
+    assert result.fired["overcrowded"].tolist() == [3]  # flag-only rule
+    assert result.changed_rows.tolist() == [0]
+
+
+def test_later_rule_overrides_earlier_on_the_same_column():
+    engine = compile_rules([
+        {"name": "empty", "when": [["Occupancy_Count", "==", 0]], "then": {"Lights_Status": "OFF"}},
+        {"name": "low", "when": [["Occupancy_Count", "<", 5]], "then": {"Lights_Status": "DIM"}},
+    ])
+    state = room_state([0, 3, 10], ["ON", "ON", "ON"], ["ON"] * 3)
+    rows, values = engine.evaluate(state).changes["Lights_Status"]
+    assert rows.tolist() == [0, 1]
+    assert values.tolist() == ["DIM", "DIM"]
+
+
+def test_override_back_to_the_current_value_is_no_change():
+    engine = compile_rules([
+        {"name": "off", "when": [["Occupancy_Count", "==", 0]], "then": {"Lights_Status": "OFF"}},
+        {"name": "keep_on", "when": [["Room_ID", "in", [1]]], "then": {"Lights_Status": "ON"}},
+    ])
+    result = engine.evaluate(room_state([0, 0], ["ON", "ON"], ["ON", "ON"]))
+    rows, values = result.changes["Lights_Status"]
+    assert rows.tolist() == [1] and values.tolist() == ["OFF"]
+
+
+def test_apply_is_idempotent_on_arrays_and_dataframes():
+    engine = compile_rules(DEFAULT_RULES)
+    for state in (
+        room_state([0, 2], ["ON", "ON"], ["ON", "ON"]),
+        pd.DataFrame(room_state([0, 2], ["ON", "ON"], ["ON", "ON"])),
+    ):
+        first = engine.apply(state)
+        assert first.changed_rows.tolist() == [0, 1]
+        assert list(state["Lights_Status"]) == ["OFF", "ON"]
+        assert list(state["AC_Status"]) == ["ON", "LOW POWER"]
+        assert engine.apply(state).changes == {}
+
+
+def test_compile_rejects_unknown_operators_and_empty_conditions():
+    with pytest.raises(ValueError, match="unknown operator"):
+        compile_rules([{"name": "bad", "when": [["Occupancy_Count", "=~", 0]]}])
+    with pytest.raises(ValueError, match="no conditions"):
+        compile_rules([{"name": "bad", "when": []}])
+
+
+def test_write_back_updates_only_changed_cells():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE Room_Status (Room_ID INTEGER PRIMARY KEY, Occupancy_Count INTEGER, "
+                 "Lights_Status TEXT, AC_Status TEXT, Last_Updated TEXT)")
+    conn.executemany("INSERT INTO Room_Status VALUES (?, ?, ?, ?, NULL)",
+                     [(1, 0, "ON", "ON"), (2, 10, "ON", "ON")])
+    state = room_state([0, 10], ["ON", "ON"], ["ON", "ON"])
+    result = compile_rules(DEFAULT_RULES).evaluate(state)
+    assert write_back(conn, state, result) == 1
+    rows = conn.execute("SELECT Room_ID, Lights_Status, Last_Updated IS NOT NULL FROM Room_Status").fetchall()
+    assert rows == [(1, "OFF", 1), (2, "ON", 0)]
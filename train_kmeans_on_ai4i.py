@@ -1,15 +1,18 @@
 # train_kmeans_on_ai4i.py
+import argparse
 import os
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 import joblib
 
-os.makedirs("models", exist_ok=True)
+from src.online_scaler import OnlineScaler
+from src.operating_mode import CentroidIndex
 
-# 1. LOAD YOUR EXISTING DATA
-df = pd.read_csv("data/ai4i_training_phys.csv")
+DATA_PATH = "data/ai4i_training_phys.csv"
+KMEANS_PATH = "models/kmeans_clustering.pkl"
+SCALER_PATH = "models/scaler_kmeans.pkl"
 
 # adjust these names if your columns differ
 FEATURE_COLUMNS = [
@@ -19,42 +22,157 @@ FEATURE_COLUMNS = [
     "Tool wear [min]",
 ]
 
-X = df[FEATURE_COLUMNS].copy()
-
-print("✅ Loaded ai4i_training_phys.csv")
-print(X.describe().round(2))
-
-# 2. SCALE FEATURES
-scaler_kmeans = StandardScaler()
-X_scaled = scaler_kmeans.fit_transform(X)
-
-print("\n✅ Standardized features for K-Means")
-
-# 3. TRAIN K-MEANS (K = 4 OPERATING MODES)
-kmeans = KMeans(
-    n_clusters=4,
-    init="k-means++",
-    max_iter=300,
-    random_state=42,
-    n_init=10,
-)
-kmeans.fit(X_scaled)
-
-print("\n✅ Trained K-Means on AI4I data")
-print(f"   Inertia: {kmeans.inertia_:.2f}")
-print(f"   Iterations: {kmeans.n_iter_}")
-
-# 4. OPTIONALLY INSPECT CLUSTER COUNTS
-labels = kmeans.labels_
-(unique, counts) = np.unique(labels, return_counts=True)
-print("\nCluster sizes:")
-for cid, cnt in zip(unique, counts):
-    print(f"  Cluster {cid}: {cnt} samples")
-
-# 5. SAVE MODEL + SCALER
-joblib.dump(kmeans, "models/kmeans_clustering.pkl")
-joblib.dump(scaler_kmeans, "models/scaler_kmeans.pkl")
-
-print("\n✅ Saved:")
-print("  models/kmeans_clustering.pkl")
-print("  models/scaler_kmeans.pkl")
+N_CLUSTERS = 4  # K = 4 OPERATING MODES
+PRIOR_PSEUDO_COUNT = 10_000.0  # rows per cluster assumed for a prior fit without labels_
+
+
+def iter_chunks(csv_path: str, chunksize: int):
+    """Yield feature chunks as DataFrames without loading the whole CSV."""
+    for chunk in pd.read_csv(csv_path, usecols=FEATURE_COLUMNS, chunksize=chunksize):
+        yield chunk[FEATURE_COLUMNS]
+
+
+def train_full(csv_path: str):
+    """Original in-memory KMeans(n_init=10) training."""
+    # 1. LOAD YOUR EXISTING DATA
+    df = pd.read_csv(csv_path)
+    X = df[FEATURE_COLUMNS].copy()
+
+    print(f"✅ Loaded {os.path.basename(csv_path)}")
+    print(X.describe().round(2))
+
+    # 2. SCALE FEATURES
+    scaler_kmeans = StandardScaler()
+    X_scaled = scaler_kmeans.fit_transform(X)
+
+    print("\n✅ Standardized features for K-Means")
+
+    # 3. TRAIN K-MEANS (K = 4 OPERATING MODES)
+    kmeans = KMeans(
+        n_clusters=N_CLUSTERS,
+        init="k-means++",
+        max_iter=300,
+        random_state=42,
+        n_init=10,
+    )
+    kmeans.fit(X_scaled)
+
+    print("\n✅ Trained K-Means on AI4I data")
+    print(f"   Inertia: {kmeans.inertia_:.2f}")
+    print(f"   Iterations: {kmeans.n_iter_}")
+    return kmeans, scaler_kmeans
+
+
+def train_minibatch(csv_path: str, chunksize: int, epochs: int, batch_size: int):
+    """Two streaming passes: running scaler statistics, then MiniBatchKMeans.partial_fit."""
+    online = OnlineScaler(n_features=len(FEATURE_COLUMNS))
+    online.partial_fit_csv(csv_path, FEATURE_COLUMNS, chunksize=chunksize)
+    scaler_kmeans = online.publish().scaler
+    # fitted from raw arrays, so keep the column names the API scaler was saved with
+    scaler_kmeans.feature_names_in_ = np.array(FEATURE_COLUMNS, dtype=object)
+    print(f"✅ Streamed scaler statistics over {online.count} rows")
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=N_CLUSTERS,
+        init="k-means++",
+        batch_size=batch_size,
+        random_state=42,
+        n_init=3,
+    )
+    for epoch in range(epochs):
+        for chunk in iter_chunks(csv_path, chunksize):
+            X_scaled = scaler_kmeans.transform(chunk)
+            # partial_fit consumes one mini-batch at a time
+            for start in range(0, len(X_scaled), batch_size):
+                batch = X_scaled[start:start + batch_size]
+                if len(batch) >= N_CLUSTERS:
+                    kmeans.partial_fit(batch)
+        print(f"   Epoch {epoch + 1}/{epochs} done")
+
+    print("\n✅ Trained MiniBatchKMeans on AI4I data")
+    return kmeans, scaler_kmeans
+
+
+def update_minibatch(csv_path: str, chunksize: int, batch_size: int):
+    """Fold new data into the saved model; scaler stays fixed so centroids stay comparable."""
+    existing = joblib.load(KMEANS_PATH)
+    scaler_kmeans = joblib.load(SCALER_PATH)
+    if isinstance(existing, MiniBatchKMeans):
+        kmeans = existing  # keeps its per-cluster counts from earlier fits
+    else:
+        # Warm-start from a full KMeans model's centroids.
+        kmeans = MiniBatchKMeans(
+            n_clusters=existing.n_clusters,
+            init=existing.cluster_centers_,
+            batch_size=batch_size,
+            random_state=42,
+            n_init=1,
+        )
+        # A fresh model starts with zero counts, so its first batch would
+        # replace the centroids outright. Fitting the centroids themselves,
+        # weighted by the prior fit's cluster sizes, leaves them in place and
+        # seeds the counts, so new rows move them in proportion.
+        n_clusters = existing.n_clusters
+        if hasattr(existing, "labels_"):
+            prior = np.bincount(existing.labels_, minlength=n_clusters).astype(float)
+        else:
+            prior = np.full(n_clusters, PRIOR_PSEUDO_COUNT)
+        kmeans.partial_fit(existing.cluster_centers_, sample_weight=np.maximum(prior, 1.0))
+
+    n_rows = 0
+    for chunk in iter_chunks(csv_path, chunksize):
+        X_scaled = scaler_kmeans.transform(chunk)
+        for start in range(0, len(X_scaled), batch_size):
+            batch = X_scaled[start:start + batch_size]
+            if len(batch) >= kmeans.n_clusters:
+                kmeans.partial_fit(batch)
+        n_rows += len(chunk)
+
+    print(f"✅ Updated K-Means with {n_rows} new rows")
+    return kmeans, scaler_kmeans
+
+
+def cluster_sizes(kmeans, scaler_kmeans, csv_path: str, chunksize: int) -> np.ndarray:
+    """Count cluster membership chunk by chunk, one matrix op per chunk."""
+    index = CentroidIndex.from_model(kmeans)
+    counts = np.zeros(index.centers.shape[0], dtype=int)
+    for chunk in iter_chunks(csv_path, chunksize):
+        labels, _ = index.assign(scaler_kmeans.transform(chunk))
+        counts += np.bincount(labels, minlength=len(counts))
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the K-Means operating-mode model.")
+    parser.add_argument("--mode", choices=["full", "minibatch", "update"], default="full")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--epochs", type=int, default=3)
+    args = parser.parse_args()
+
+    os.makedirs("models", exist_ok=True)
+
+    if args.mode == "full":
+        kmeans, scaler_kmeans = train_full(args.data)
+    elif args.mode == "minibatch":
+        kmeans, scaler_kmeans = train_minibatch(args.data, args.chunksize, args.epochs, args.batch_size)
+    else:
+        kmeans, scaler_kmeans = update_minibatch(args.data, args.chunksize, args.batch_size)
+
+    # 4. OPTIONALLY INSPECT CLUSTER COUNTS
+    print("\nCluster sizes:")
+    for cid, cnt in enumerate(cluster_sizes(kmeans, scaler_kmeans, args.data, args.chunksize)):
+        print(f"  Cluster {cid}: {cnt} samples")
+
+    # 5. SAVE MODEL + SCALER
+    joblib.dump(kmeans, KMEANS_PATH)
+    joblib.dump(scaler_kmeans, SCALER_PATH)
+
+    print("\n✅ Saved:")
+    print(f"  {KMEANS_PATH}")
+    print(f"  {SCALER_PATH}")
+
+
+if __name__ == "__main__":
+    main()